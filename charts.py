@@ -0,0 +1,137 @@
+"""
+Diagramme rendern: inhaltsbasiert und parallel
+==============================================
+Jedes Diagramm ist eine ChartSpec (Dateiname, Renderer, Eingabedaten).
+Ueber Renderer, Daten, Format und DPI wird ein SHA-256 gebildet und in
+`<output_dir>/.chart_hashes.json` abgelegt. Beim naechsten Lauf werden nur
+Diagramme neu gezeichnet, deren Hash sich geaendert hat oder deren Datei
+fehlt - der Rest landet in einem Prozess-Pool (matplotlib ist nicht
+thread-sicher, Prozesse rendern echt parallel).
+
+    specs = [ChartSpec("duration_by_model", "bar", {...}), ...]
+    render_charts(specs, "charts", fmt="svg")
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from pareto import render_pareto_chart
+
+
+# Erhoehen, wenn sich das Aussehen eines Renderers aendert (erzwingt Neuzeichnen)
+CHART_VERSION = 1
+
+MANIFEST_FILENAME = ".chart_hashes.json"
+
+FORMATS = ("png", "svg")
+
+
+@dataclass
+class ChartSpec:
+    """Ein Diagramm: Dateiname ohne Endung, Renderer-Name und JSON-faehige Daten."""
+    name: str
+    renderer: str
+    data: Dict[str, Any]
+
+
+def _render_bar(data: Dict[str, Any], output_file: str, dpi: int):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(10, 6))
+    plt.bar(data["labels"], data["values"], color=data.get("color", "steelblue"))
+    plt.xlabel(data["xlabel"])
+    plt.ylabel(data["ylabel"])
+    plt.title(data["title"])
+    plt.xticks(rotation=45, ha='right')
+    plt.tight_layout()
+    plt.savefig(output_file, dpi=dpi)
+    plt.close()
+
+
+def _render_pareto(data: Dict[str, Any], output_file: str, dpi: int):
+    render_pareto_chart(data["task"], data["rows"], output_file, dpi=dpi)
+
+
+RENDERERS = {
+    "bar": _render_bar,
+    "pareto": _render_pareto,
+}
+
+
+def chart_hash(spec: ChartSpec, fmt: str, dpi: int) -> str:
+    """Inhalts-Hash eines Diagramms (Daten + alles, was das Bild beeinflusst)."""
+    payload = json.dumps(
+        {"version": CHART_VERSION, "renderer": spec.renderer, "data": spec.data, "format": fmt, "dpi": dpi},
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _render_one(job: Tuple[str, Dict[str, Any], str, int]) -> str:
+    """Worker: ein Diagramm zeichnen (muss top-level sein, damit es pickelbar ist)."""
+    renderer, data, output_file, dpi = job
+    RENDERERS[renderer](data, output_file, dpi)
+    return output_file
+
+
+def _load_manifest(path: Path) -> Dict[str, str]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def render_charts(
+    specs: Sequence[ChartSpec],
+    output_dir: str = "charts",
+    fmt: str = "png",
+    dpi: int = 150,
+    workers: Optional[int] = None
+) -> Dict[str, List[str]]:
+    """
+    Zeichnet alle geaenderten Diagramme.
+
+    Args:
+        fmt: "png" oder "svg"
+        workers: Prozesse fuer das Rendern (None = CPU-Kerne, 1 = im aktuellen Prozess)
+
+    Returns:
+        {"rendered": [Dateien], "skipped": [Dateien]}
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unbekanntes Format: {fmt} (erlaubt: {', '.join(FORMATS)})")
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = Path(output_dir) / MANIFEST_FILENAME
+    manifest = _load_manifest(manifest_path)
+
+    jobs, hashes, skipped = [], {}, []
+    for spec in specs:
+        filename = f"{spec.name}.{fmt}"
+        output_file = str(Path(output_dir) / filename)
+        digest = chart_hash(spec, fmt, dpi)
+        hashes[filename] = digest
+        if manifest.get(filename) == digest and os.path.exists(output_file):
+            skipped.append(output_file)
+        else:
+            jobs.append((spec.renderer, spec.data, output_file, dpi))
+
+    workers = workers or os.cpu_count() or 1
+    if len(jobs) <= 1 or workers == 1:
+        rendered = [_render_one(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            rendered = list(pool.map(_render_one, jobs))
+
+    # Schlaegt ein Diagramm fehl, wird das Manifest nicht aktualisiert
+    manifest.update(hashes)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return {"rendered": rendered, "skipped": skipped}
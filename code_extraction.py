@@ -0,0 +1,206 @@
+"""
+Code-Extraktion aus LLM-Ausgaben (AST-geprueft)
+===============================================
+LLM-Antworten enthalten oft mehrere ```-Bloecke: den eigentlichen Code,
+Beispiel-Aufrufe, wiederholte oder halb korrigierte Fassungen derselben
+Klasse. Einfach alle Bloecke aneinanderzuhaengen erzeugt doppelte
+Definitionen oder Syntaxfehler - und kostet eine ganze Fix-Iteration.
+
+Stattdessen werden Kandidaten gebildet und bewertet:
+
+- jeder Python- bzw. unmarkierte ```-Block einzeln
+- die Zusammenfuehrung aller parsebaren Bloecke, die neue Definitionen
+  beitragen (Code ueber mehrere Bloecke verteilt), plus Bloecke nur aus
+  Imports/Zuweisungen (`import random`, Modul-Konstanten)
+- ohne Bloecke: der Text ab der ersten Code-Zeile, derselbe Text ohne
+  nachfolgende Erklaerung (bis vor die erste nicht parsebare Zeile) bzw.
+  der ganze Text
+
+Bewertung (in dieser Reihenfolge): parst mit `ast`, Anzahl abgedeckter
+angeforderter Klassennamen, keine doppelten Top-Level-Definitionen,
+Anzahl Definitionen, Laenge. Die Bloecke werden in einem Durchgang ueber
+die Zeilen gefunden, jeder Kandidat wird einmal geparst - die Laufzeit
+bleibt linear in der Laenge der Ausgabe.
+
+    code = extract_python_code(llm_output, required_names=["Pokemon", "Attack"])
+"""
+
+import ast
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+# Sprach-Markierungen, die als Python gelten ("" = unmarkierter Block)
+PYTHON_LANGUAGES = ("python", "python3", "py", "")
+
+_FENCE = re.compile(r"^\s*(```+|~~~+)\s*([\w+-]*)")
+_CODE_START = re.compile(r"^(import |from \S+ import |class |def |async def |@|#!)")
+_CLASS_NAME = re.compile(r"\bclass\s+([A-Za-z_]\w*)")
+
+# Top-Level-Anweisungen, die ein Block ohne Definitionen beitragen darf
+_SETUP_NODES = (ast.Import, ast.ImportFrom, ast.Assign, ast.AnnAssign)
+
+# Hoechstens so viele Kuerzungen fuer den Kandidaten ohne nachfolgende Erklaerung
+_MAX_TRIMS = 8
+
+
+@dataclass
+class CodeCandidate:
+    """Ein moeglicher Code-Ausschnitt mit Bewertung."""
+    code: str
+    source: str                                         # "block", "merged", "text"
+    parses: bool = False
+    error: str = ""
+    definitions: List[str] = field(default_factory=list)   # Top-Level class/def in Reihenfolge
+    duplicates: List[str] = field(default_factory=list)
+    covered: List[str] = field(default_factory=list)       # abgedeckte angeforderte Namen
+    setup_only: bool = False                            # nur Imports/Zuweisungen
+
+    def score(self) -> Tuple[int, int, int, int, int]:
+        return (int(self.parses), len(self.covered), -len(self.duplicates),
+                len(self.definitions), len(self.code))
+
+
+def requested_class_names(text: str) -> List[str]:
+    """Klassennamen aus einer Aufgabenbeschreibung (z.B. "Beginne mit: class Pokemon:")."""
+    return list(dict.fromkeys(_CLASS_NAME.findall(text or "")))
+
+
+def iter_fenced_blocks(text: str) -> Iterator[Tuple[str, str]]:
+    """
+    (Sprache, Inhalt) aller ```- bzw. ~~~-Bloecke, in einem Durchgang.
+    Ein nicht geschlossener letzter Block reicht bis zum Textende.
+    """
+    fence: Optional[str] = None
+    language = ""
+    lines: List[str] = []
+    for line in text.splitlines():
+        if fence is None:
+            match = _FENCE.match(line)
+            if match:
+                fence, language, lines = match.group(1), match.group(2).lower(), []
+        elif line.strip().startswith(fence) and not line.strip()[len(fence):].strip():
+            yield language, "\n".join(lines)
+            fence = None
+        else:
+            lines.append(line)
+    if fence is not None and lines:
+        yield language, "\n".join(lines)
+
+
+def analyze(code: str, source: str, required_names: Sequence[str] = ()) -> CodeCandidate:
+    """Parst einen Kandidaten und fuellt Definitionen, Duplikate und Abdeckung."""
+    candidate = CodeCandidate(code=code, source=source)
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError) as e:
+        candidate.error = f"{type(e).__name__}: {e}"
+        # Ohne AST zumindest die Klassennamen fuer die Abdeckung
+        names = set(_CLASS_NAME.findall(code))
+        candidate.covered = [name for name in required_names if name in names]
+        return candidate
+
+    candidate.parses = True
+    candidate.setup_only = bool(tree.body) and all(isinstance(node, _SETUP_NODES) for node in tree.body)
+    seen = set()
+    for node in tree.body:
+        if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            if node.name in seen and node.name not in candidate.duplicates:
+                candidate.duplicates.append(node.name)
+            seen.add(node.name)
+            candidate.definitions.append(node.name)
+    candidate.covered = [name for name in required_names if name in seen]
+    return candidate
+
+
+def _merge(blocks: List[CodeCandidate]) -> Optional[str]:
+    """
+    Parsebare Bloecke, die neue Top-Level-Definitionen beitragen, zusammenfuehren.
+    Von hinten nach vorn: eine spaetere ("korrigierte") Fassung einer Klasse
+    verdraengt einen frueheren Block, der nichts anderes mehr beitraegt.
+    Bloecke nur aus Imports/Zuweisungen bleiben erhalten (einmal pro Inhalt),
+    sonst fehlt z.B. `import random` und der Code scheitert mit NameError.
+    """
+    defined = set()
+    setup = set()
+    parts = []
+    for block in reversed(blocks):
+        if not block.parses:
+            continue
+        new = [name for name in block.definitions if name not in defined]
+        if new:
+            parts.append(block.code)
+            defined.update(new)
+        elif block.setup_only and block.code.strip() not in setup:
+            parts.append(block.code)
+            setup.add(block.code.strip())
+    return "\n\n".join(reversed(parts)) if len(parts) > 1 else None
+
+
+def _parseable_prefix(lines: List[str]) -> Optional[str]:
+    """
+    Code ohne nachfolgende Erklaerung: schneidet vor der Top-Level-Zeile ab,
+    in der der Syntaxfehler liegt, bis der Rest parst. None, wenn schon alles
+    parst oder nichts uebrig bleibt.
+    """
+    end = len(lines)
+    for _ in range(_MAX_TRIMS):
+        code = "\n".join(lines[:end])
+        try:
+            ast.parse(code)
+            return code if end < len(lines) else None
+        except (SyntaxError, ValueError) as e:
+            error_line = min(getattr(e, "lineno", None) or end, end)
+        # Anfang der Anweisung: letzte nicht eingerueckte Zeile bis zum Fehler
+        cut = error_line - 1
+        while cut > 0 and (not lines[cut].strip() or lines[cut][0] in " \t"):
+            cut -= 1
+        if cut <= 0:
+            return None
+        end = cut
+    return None
+
+
+def extraction_candidates(text: str, required_names: Sequence[str] = ()) -> List[CodeCandidate]:
+    """Alle Kandidaten einer LLM-Ausgabe (bewertet, unsortiert)."""
+    blocks = [
+        analyze(body, "block", required_names)
+        for language, body in iter_fenced_blocks(text)
+        if language in PYTHON_LANGUAGES and body.strip()
+    ]
+    candidates = list(blocks)
+    merged = _merge(blocks)
+    if merged is not None:
+        candidates.append(analyze(merged, "merged", required_names))
+
+    if not blocks:
+        lines = text.splitlines()
+        start = next((i for i, line in enumerate(lines) if _CODE_START.match(line)), None)
+        if start is not None:
+            if start:
+                candidates.append(analyze("\n".join(lines[start:]), "text", required_names))
+            prefix = _parseable_prefix(lines[start:])
+            if prefix is not None:
+                candidates.append(analyze(prefix, "text", required_names))
+        candidates.append(analyze(text, "text", required_names))
+    return candidates
+
+
+def best_candidate(text: str, required_names: Sequence[str] = ()) -> CodeCandidate:
+    """Bester Kandidat nach CodeCandidate.score()."""
+    candidates = extraction_candidates(text, required_names)
+    if not candidates:
+        return CodeCandidate(code=text, source="text")
+    return max(candidates, key=CodeCandidate.score)
+
+
+def extract_python_code(text: str, required_names: Iterable[str] = ()) -> str:
+    """
+    Extrahiert Python-Code aus LLM-Output.
+
+    Args:
+        required_names: Klassennamen, die der Code enthalten soll
+                        (siehe requested_class_names)
+    """
+    return best_candidate(text, list(required_names)).code.strip("\n") + "\n"
@@ -0,0 +1,172 @@
+"""
+Compile-Cache fuer generierten Code
+===================================
+Syntax-Check und Sandbox-Ausfuehrung kompilieren denselben Code-Text
+nur noch einmal. Generierter Code und Test-Modul sind getrennte
+Einheiten: der Code-Check trifft den Testlauf, unveraenderte Tests
+treffen in jeder weiteren Iteration.
+
+- Schluessel ist der SHA-256 des Quelltexts (plus Python-Version)
+- Gespeichert werden Code-Objekt und Syntax-Diagnose
+- Fuer die Sandbox wird das Code-Objekt per `marshal` in eine .bin-Datei
+  geschrieben; sandbox_worker.py fuehrt es aus, ohne neu zu kompilieren
+- Die Quelldatei liegt daneben, damit Tracebacks Zeilen anzeigen koennen
+- Dateien liegen pro Prozess in `<CACHE_DIR>/p<pid>`; fehlen sie, werden
+  sie neu geschrieben
+
+Trefferquoten liefert `stats()`, die Runner schreiben sie in den Trace.
+"""
+
+import os
+import atexit
+import marshal
+import hashlib
+import tempfile
+import importlib.util
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from types import CodeType
+from typing import Any, Dict, Optional
+
+
+MAGIC = importlib.util.MAGIC_NUMBER
+CACHE_DIR = Path(tempfile.gettempdir()) / "agent_sandbox_cache"
+
+
+@dataclass
+class CompileEntry:
+    """Ergebnis einer Kompilierung."""
+    key: str
+    code: Optional[CodeType]
+    syntax_ok: bool
+    message: str
+    filename: str
+    source_path: Optional[str] = None
+    bytecode_path: Optional[str] = None
+
+
+class CompileCache:
+    """LRU-Cache von Code-Objekten und Syntax-Diagnosen, adressiert ueber den Inhalt."""
+
+    def __init__(self, max_entries: int = 128, cache_dir: Path = CACHE_DIR):
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir)
+        self._entries: "OrderedDict[str, CompileEntry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.materialized = 0
+
+    @staticmethod
+    def key_for(source: str) -> str:
+        digest = hashlib.sha256(MAGIC + source.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()[:24]
+
+    def compile(self, source: str) -> CompileEntry:
+        """Kompiliert einmal pro Inhalt; weitere Aufrufe sind Cache-Treffer."""
+        key = self.key_for(source)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        filename = str(self.process_dir() / f"generated_{key}.py")
+        try:
+            code = compile(source, filename, "exec", dont_inherit=True)
+            entry = CompileEntry(key, code, True, "Syntax OK", filename)
+        except SyntaxError as e:
+            entry = CompileEntry(key, None, False, f"Syntaxfehler Zeile {e.lineno}: {e.msg}", filename)
+        except ValueError as e:  # z.B. Null-Bytes im Quelltext
+            entry = CompileEntry(key, None, False, f"Ungueltiger Quelltext: {e}", filename)
+
+        self._entries[key] = entry
+        if len(self._entries) > self.max_entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._remove_files(evicted)
+        return entry
+
+    def process_dir(self) -> Path:
+        """
+        Eigenes Unterverzeichnis pro Prozess: ein anderer Runner-Prozess, der
+        denselben Inhalt aus seinem LRU verdraengt, loescht nicht unsere Dateien.
+        """
+        return self.cache_dir / f"p{os.getpid()}"
+
+    def materialize(self, source: str) -> CompileEntry:
+        """
+        Stellt Quelldatei und marshalled Bytecode fuer Sandbox-Worker bereit.
+        Die Dateien werden pro Inhalt nur einmal geschrieben - und neu, falls
+        sie inzwischen fehlen (z.B. tmp-Aufraeumen).
+        """
+        entry = self.compile(source)
+        if not entry.syntax_ok:
+            return entry
+        if entry.bytecode_path and os.path.exists(entry.bytecode_path) and os.path.exists(entry.source_path):
+            return entry
+
+        os.makedirs(os.path.dirname(entry.filename), exist_ok=True)
+        source_path = entry.filename
+        bytecode_path = source_path[:-3] + ".bin"
+        _atomic_write(source_path, source.encode("utf-8", "surrogatepass"))
+        _atomic_write(bytecode_path, MAGIC + marshal.dumps(entry.code))
+        entry.source_path = source_path
+        entry.bytecode_path = bytecode_path
+        self.materialized += 1
+        return entry
+
+    def _remove_files(self, entry: CompileEntry):
+        for path in (entry.source_path, entry.bytecode_path):
+            if path:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+
+    def clear(self):
+        """Entfernt alle Eintraege und ihre Dateien (beim Prozessende)."""
+        for entry in self._entries.values():
+            self._remove_files(entry)
+        self._entries.clear()
+        try:
+            self.process_dir().rmdir()
+        except OSError:
+            pass
+
+    def stats(self, since: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Zaehler des Caches. Mit since (ein frueheres stats()) nur die Differenz,
+        z.B. pro Experiment im prozessweiten Cache.
+        """
+        since = since or {}
+        hits = self.hits - since.get("hits", 0)
+        misses = self.misses - since.get("misses", 0)
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self._entries),
+            "materialized": self.materialized - since.get("materialized", 0),
+        }
+
+
+def _atomic_write(path: str, data: bytes):
+    """Schreibt ueber eine Temp-Datei, damit parallele Worker nie halbe Dateien lesen."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# Prozessweiter Cache, geteilt von check_syntax und der Sandbox
+COMPILE_CACHE = CompileCache()
+atexit.register(COMPILE_CACHE.clear)
@@ -9,13 +9,27 @@ Analysiert die Ergebnisse mehrerer Experimente und erstellt:
 """
 
 import os
-import json
+import sys
 import csv
+import argparse
+import json
+import time
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any
-from dataclasses import dataclass
-import statistics
+from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass, asdict, field, fields
+
+from experiment_store import load_experiment_data, loads, ORJSON_AVAILABLE, STORE_SUFFIX
+from experiment_catalog import ExperimentCatalog, rebuild_catalog, sync_catalog, infer_runner_type
+from experiment_table import ExperimentTable, TaskTable, describe, grouped_stats, group_rates
+from experiment_stats import DEFAULT_RESAMPLES, bootstrap_ci, permutation_tests, format_ci
+from throughput import hardware_fingerprint, count_generated_loc, throughput_by_model_and_hardware, format_throughput_table
+from pareto import pareto_by_task, format_pareto_table
+from iteration_costs import iteration_costs, iteration_series, is_iterative, format_iteration_tables
+from charts import ChartSpec, render_charts
+from regression import detect_regressions, format_regressions
 
 
 @dataclass
@@ -28,26 +42,44 @@ class ExperimentSummary:
     total_duration: float
     total_tokens: int
     success: bool
-    agent_durations: Dict[str, float]
-    agent_tokens: Dict[str, int]
+    agent_durations: Dict[str, float]   # Summe ueber alle Tasks der Rolle
+    agent_tokens: Dict[str, int]        # Summe ueber alle Tasks der Rolle
+    runner_type: str = ""
+    task_metrics: List[Dict[str, Any]] = field(default_factory=list)   # ein Eintrag pro Task
+    agent_counts: Dict[str, int] = field(default_factory=dict)         # Tasks pro Rolle
+    executions: List[Dict[str, Any]] = field(default_factory=list)     # Sandbox-Laeufe
+    hardware: str = ""        # siehe throughput.hardware_fingerprint
+    generated_loc: int = 0    # siehe throughput.count_generated_loc
 
 
-def load_experiment(experiment_dir: Path) -> ExperimentSummary:
-    """Laedt ein Experiment aus dem Ordner."""
-    json_files = list(experiment_dir.glob("*_full.json"))
-    if not json_files:
-        raise FileNotFoundError(f"Keine Experiment-Daten in {experiment_dir}")
-    
-    with open(json_files[0], "r", encoding="utf-8") as f:
-        data = json.load(f)
-    
-    agent_durations = {}
-    agent_tokens = {}
-    
-    for metric in data.get("agent_metrics", []):
+TASK_METRIC_KEYS = (
+    "agent_role", "model", "task_name", "duration_seconds",
+    "estimated_input_tokens", "estimated_output_tokens", "success"
+)
+
+EXECUTION_KEYS = ("label", "iteration", "wall_seconds")
+
+
+def aggregate_roles(records: List[Dict[str, Any]]) -> Tuple[Dict[str, float], Dict[str, int], Dict[str, int]]:
+    """
+    Dauer, Tokens und Anzahl pro Rolle, summiert ueber alle Task-Datensaetze
+    (z.B. mehrere "Developer-Fix"-Iterationen).
+    """
+    durations: Dict[str, float] = {}
+    tokens: Dict[str, int] = {}
+    counts: Dict[str, int] = {}
+    for metric in records:
         role = metric["agent_role"]
-        agent_durations[role] = metric["duration_seconds"]
-        agent_tokens[role] = metric["estimated_output_tokens"]
+        durations[role] = durations.get(role, 0.0) + (metric.get("duration_seconds") or 0.0)
+        tokens[role] = tokens.get(role, 0) + (metric.get("estimated_output_tokens") or 0)
+        counts[role] = counts.get(role, 0) + 1
+    return durations, tokens, counts
+
+
+def load_experiment(experiment_dir: Path) -> ExperimentSummary:
+    """Laedt ein Experiment aus dem Ordner (Experiment-Store oder *_full.json)."""
+    data = load_experiment_data(experiment_dir)
+    agent_durations, agent_tokens, agent_counts = aggregate_roles(data.get("agent_metrics", []))
     
     return ExperimentSummary(
         experiment_id=data["config"]["experiment_id"],
@@ -58,50 +90,288 @@ def load_experiment(experiment_dir: Path) -> ExperimentSummary:
         total_tokens=data["total_estimated_tokens"],
         success=data["success"],
         agent_durations=agent_durations,
-        agent_tokens=agent_tokens
+        agent_tokens=agent_tokens,
+        runner_type=infer_runner_type(data),
+        task_metrics=[{key: m.get(key) for key in TASK_METRIC_KEYS} for m in data.get("agent_metrics", [])],
+        hardware=hardware_fingerprint(data.get("system_info")),
+        generated_loc=count_generated_loc(experiment_dir),
+        agent_counts=agent_counts,
+        executions=[{key: run.get(key) for key in EXECUTION_KEYS} for run in data.get("execution_metrics") or []]
     )
 
 
-def load_all_experiments(base_dir: str = "experiments") -> List[ExperimentSummary]:
-    """Laedt alle Experimente aus dem Basis-Ordner."""
+# ============================================================
+# CACHE (nur neue/geaenderte Experimente parsen)
+# ============================================================
+
+CACHE_FILENAME = "analyzer_cache.sqlite"
+
+# Erhoehen, wenn sich ExperimentSummary oder load_experiment aendern
+CACHE_VERSION = 4
+
+
+def experiment_fingerprint(experiment_dir: Path) -> str:
+    """
+    Name, Groesse und mtime der Datendateien (Store inkl. WAL, *_full.json)
+    und der .py-Dateien - generated_loc (count_generated_loc) liest sie mit.
+    """
+    entries = []
+    with os.scandir(experiment_dir) as it:
+        for entry in it:
+            if STORE_SUFFIX in entry.name or entry.name.endswith(("_full.json", ".py")):
+                stat = entry.stat()
+                entries.append(f"{entry.name}:{stat.st_size}:{stat.st_mtime_ns}")
+    return "|".join(sorted(entries))
+
+
+class SummaryCache:
+    """Persistente ExperimentSummary pro Ordner (`<base_dir>/analyzer_cache.sqlite`)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._conn = sqlite3.connect(str(self.path), timeout=30)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS summaries ("
+            " directory TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, version INTEGER NOT NULL, summary TEXT NOT NULL)"
+        )
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def lookup(self, fingerprints: Dict[str, str]) -> Dict[str, ExperimentSummary]:
+        """Gueltige Eintraege (gleicher Fingerprint und gleiche Cache-Version)."""
+        names = {f.name for f in fields(ExperimentSummary)}
+        hits = {}
+        for directory, fingerprint, version, summary in self._conn.execute(
+            "SELECT directory, fingerprint, version, summary FROM summaries"
+        ):
+            if version == CACHE_VERSION and fingerprints.get(directory) == fingerprint:
+                data = loads(summary)
+                if set(data) == names:
+                    hits[directory] = ExperimentSummary(**data)
+        return hits
+
+    def store(self, entries: List[Tuple[str, str, ExperimentSummary]]):
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO summaries (directory, fingerprint, version, summary) VALUES (?, ?, ?, ?)",
+                [
+                    (directory, fingerprint, CACHE_VERSION, json.dumps(asdict(summary), ensure_ascii=False))
+                    for directory, fingerprint, summary in entries
+                ]
+            )
+
+    def prune(self, directories: List[str]):
+        """Entfernt Eintraege fuer geloeschte Ordner."""
+        keep = set(directories)
+        stale = [(d,) for (d,) in self._conn.execute("SELECT directory FROM summaries") if d not in keep]
+        with self._conn:
+            self._conn.executemany("DELETE FROM summaries WHERE directory = ?", stale)
+
+
+def _load_or_error(experiment_dir: Path) -> Tuple[Optional[ExperimentSummary], Optional[str]]:
+    """Fuer den Worker-Pool: Fehler als Text zurueckgeben statt den Lauf abzubrechen."""
+    try:
+        return load_experiment(experiment_dir), None
+    except Exception as e:
+        return None, str(e)
+
+
+def load_all_experiments(
+    base_dir: str = "experiments",
+    workers: Optional[int] = None,
+    processes: bool = False,
+    use_cache: bool = True
+) -> List[ExperimentSummary]:
+    """
+    Laedt alle Experimente aus dem Basis-Ordner, parallel und in fester
+    Reihenfolge (sortiert nach Ordnername).
+    
+    Mit use_cache werden nur Ordner geparst, deren Datendateien neu sind oder
+    sich (Groesse/mtime) geaendert haben; der Rest kommt aus analyzer_cache.sqlite.
+    
+    Args:
+        workers: Anzahl Threads/Prozesse (default: os.cpu_count() + 4, max. 32);
+                 1 laedt sequentiell
+        processes: Prozess- statt Thread-Pool (lohnt bei sehr grossen
+                   *_full.json ohne orjson, weil dann das Parsen die CPU bindet)
+    """
     base_path = Path(base_dir)
     if not base_path.exists():
         print(f"⚠️ Ordner {base_dir} existiert nicht.")
         return []
     
-    experiments = []
-    for exp_dir in sorted(base_path.iterdir()):
-        if exp_dir.is_dir():
-            try:
-                exp = load_experiment(exp_dir)
-                experiments.append(exp)
-            except Exception as e:
-                print(f"⚠️ Konnte {exp_dir.name} nicht laden: {e}")
+    exp_dirs = [p for p in sorted(base_path.iterdir()) if p.is_dir()]
     
-    return experiments
+    cache = SummaryCache(base_path / CACHE_FILENAME) if use_cache else None
+    fingerprints: Dict[str, str] = {}
+    cached: Dict[str, ExperimentSummary] = {}
+    if cache is not None:
+        fingerprints = {str(p): experiment_fingerprint(p) for p in exp_dirs}
+        cached = cache.lookup(fingerprints)
+    to_load = [p for p in exp_dirs if str(p) not in cached]
+    
+    if workers is None:
+        workers = min(32, (os.cpu_count() or 1) + 4)
+    workers = max(1, min(workers, len(to_load)))
+    
+    started = time.perf_counter()
+    if workers == 1:
+        results = [_load_or_error(exp_dir) for exp_dir in to_load]
+    else:
+        pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        with pool(max_workers=workers) as executor:
+            # map() liefert in Eingabe-Reihenfolge -> deterministisch
+            results = list(executor.map(_load_or_error, to_load, chunksize=8 if processes else 1))
+    elapsed = time.perf_counter() - started
+    
+    loaded: Dict[str, ExperimentSummary] = {}
+    for exp_dir, (exp, error) in zip(to_load, results):
+        if exp is not None:
+            loaded[str(exp_dir)] = exp
+        else:
+            print(f"⚠️ Konnte {exp_dir.name} nicht laden: {error}")
+    
+    if cache is not None:
+        # Fehlerhafte Ordner nicht cachen - beim naechsten Lauf erneut versuchen
+        cache.store([(d, fingerprints[d], exp) for d, exp in loaded.items()])
+        cache.prune(list(fingerprints))
+        cache.close()
+    
+    if loaded:
+        rate = len(loaded) / elapsed if elapsed > 0 else float("inf")
+        print(f"📂 {len(loaded)} Experimente in {elapsed:.2f}s geladen "
+              f"({rate:.1f} Experimente/s, {workers} {'Prozesse' if processes else 'Threads'}, "
+              f"JSON: {'orjson' if ORJSON_AVAILABLE else 'json'})")
+    if cached:
+        print(f"♻️ {len(cached)} Experimente unveraendert (aus {CACHE_FILENAME})")
+    
+    return [
+        cached.get(str(p)) or loaded[str(p)]
+        for p in exp_dirs if str(p) in cached or str(p) in loaded
+    ]
 
 
-def calculate_statistics(values: List[float]) -> Dict[str, float]:
-    """Berechnet statistische Kennzahlen."""
-    if not values:
-        return {"count": 0}
-    
-    stats = {
-        "count": len(values),
-        "mean": round(statistics.mean(values), 2),
-        "min": round(min(values), 2),
-        "max": round(max(values), 2),
-    }
+def query_experiments(
+    base_dir: str = "projekte",
+    model: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    success: Optional[bool] = None,
+    runner_type: Optional[str] = None
+) -> List[ExperimentSummary]:
+    """
+    Laedt Experimente ueber den Katalog (catalog.sqlite) mit Filtern, ohne
+    die Ordner zu oeffnen. Ordner, die noch nicht im Katalog stehen (z.B.
+    aeltere Experimente, wenn erst ein neuer Lauf den Katalog angelegt hat),
+    werden vorher nachgetragen.
+    """
+    base_path = Path(base_dir)
+    if not base_path.exists():
+        print(f"⚠️ Ordner {base_dir} existiert nicht.")
+        return []
+    added, skipped = sync_catalog(base_dir)
+    if added:
+        print(f"📚 Katalog ergaenzt: {added} Experimente")
+    for directory, reason in skipped:
+        print(f"   ⚠️ {directory}: {reason}")
     
-    if len(values) > 1:
-        stats["std_dev"] = round(statistics.stdev(values), 2)
-        stats["median"] = round(statistics.median(values), 2)
+    with ExperimentCatalog.for_base_dir(base_dir) as catalog:
+        rows = catalog.query(model=model, since=since, until=until, success=success, runner_type=runner_type)
+        metrics = catalog.agent_metrics([row["experiment_id"] for row in rows])
+        executions = catalog.executions([row["experiment_id"] for row in rows])
     
-    return stats
+    experiments = []
+    for row in rows:
+        agent_durations, agent_tokens, agent_counts = aggregate_roles(metrics[row["experiment_id"]])
+        experiments.append(ExperimentSummary(
+            experiment_id=row["experiment_id"],
+            experiment_name=row["experiment_name"],
+            timestamp=row["timestamp"],
+            models=row["models"],
+            total_duration=row["total_duration"],
+            total_tokens=row["total_tokens"],
+            success=row["success"],
+            agent_durations=agent_durations,
+            agent_tokens=agent_tokens,
+            runner_type=row["runner_type"],
+            task_metrics=[{key: m.get(key) for key in TASK_METRIC_KEYS} for m in metrics[row["experiment_id"]]],
+            hardware=row["hardware"] or "",
+            generated_loc=row["generated_loc"] or 0,
+            agent_counts=agent_counts,
+            executions=[{key: run.get(key) for key in EXECUTION_KEYS} for run in executions[row["experiment_id"]]]
+        ))
+    return experiments
+
+
+def parse_filters(text: str) -> Dict[str, Any]:
+    """
+    Filter aus einer Eingabe wie "model=qwen2.5-coder:3b success=1 runner=iterative
+    since=2025-12-01 until=2025-12-31".
+    """
+    filters: Dict[str, Any] = {}
+    for part in text.split():
+        key, _, value = part.partition("=")
+        if not value:
+            raise ValueError(f"Filter '{part}' hat keinen Wert (erwartet key=value)")
+        if key == "runner":
+            key = "runner_type"
+        if key == "success":
+            filters[key] = value.lower() in ("1", "true", "ja", "yes")
+        elif key in ("model", "since", "until", "runner_type"):
+            filters[key] = value
+        else:
+            raise ValueError(f"Unbekannter Filter '{key}' (model, since, until, success, runner)")
+    return filters
 
 
-def generate_comparison_report(experiments: List[ExperimentSummary], output_file: str = "analysis_report.md"):
-    """Erstellt einen detaillierten Vergleichsreport."""
+def calculate_statistics(values: List[float]) -> Dict[str, float]:
+    """
+    Berechnet statistische Kennzahlen: count, mean, min, max, median,
+    p90/p95/p99, iqr und (ab zwei Werten) std_dev. Gruppiert siehe
+    experiment_table.grouped_stats.
+    """
+    return describe(values)
+
+
+def _write_distribution_table(f, title: str, stats: Dict[Any, Dict[str, float]]):
+    f.write(f"### {title}\n\n")
+    f.write("| Gruppe | n | Mittel | Std | Median | p90 | p95 | p99 | IQR |\n")
+    f.write("|--------|---|--------|-----|--------|-----|-----|-----|-----|\n")
+    for group, row in stats.items():
+        label = " / ".join(group) if isinstance(group, tuple) else group
+        f.write(
+            f"| {label} | {row['count']} | {row['mean']} | {row.get('std_dev', '-')} | {row['median']} "
+            f"| {row['p90']} | {row['p95']} | {row['p99']} | {row['iqr']} |\n"
+        )
+    f.write("\n")
+
+
+def generate_comparison_report(
+    experiments: List[ExperimentSummary],
+    output_file: str = "analysis_report.md",
+    n_resamples: int = DEFAULT_RESAMPLES,
+    normalize_hardware: Optional[bool] = None
+):
+    """
+    Erstellt einen detaillierten Vergleichsreport.
+    
+    Modell-Vergleiche enthalten 95%-Bootstrap-Konfidenzintervalle und
+    paarweise Permutationstests (n_resamples Ziehungen). Der Durchsatz wird
+    nach Modell und Hardware gruppiert; normalize_hardware rechnet ihn auf
+    die Referenz-Hardware um (None: automatisch bei mehr als einer Hardware).
+    """
+    
+    table = ExperimentTable(experiments)
+    successful = table.where(table.success)
+    tasks = TaskTable(experiments)
+    successful_tasks = tasks.where(tasks.success)
     
     with open(output_file, "w", encoding="utf-8") as f:
         f.write("# Experiment-Analyse Report\n\n")
@@ -121,21 +391,20 @@ def generate_comparison_report(experiments: List[ExperimentSummary], output_file
         # Statistische Auswertung
         f.write("\n## Statistische Auswertung\n\n")
         
-        durations = [e.total_duration for e in experiments if e.success]
-        tokens = [e.total_tokens for e in experiments if e.success]
-        
-        if durations:
-            duration_stats = calculate_statistics(durations)
+        if len(successful):
+            duration_stats = calculate_statistics(successful.duration)
             f.write("### Ausfuehrungszeit (Sekunden)\n\n")
             f.write(f"- **Mittelwert:** {duration_stats['mean']}\n")
+            f.write(f"- **Median:** {duration_stats['median']} (IQR {duration_stats['iqr']})\n")
+            f.write(f"- **p90 / p95 / p99:** {duration_stats['p90']} / {duration_stats['p95']} / {duration_stats['p99']}\n")
             f.write(f"- **Minimum:** {duration_stats['min']}\n")
             f.write(f"- **Maximum:** {duration_stats['max']}\n")
             if 'std_dev' in duration_stats:
                 f.write(f"- **Standardabweichung:** {duration_stats['std_dev']}\n")
             f.write("\n")
         
-        if tokens:
-            token_stats = calculate_statistics([float(t) for t in tokens])
+        if len(successful):
+            token_stats = calculate_statistics(successful.tokens)
             f.write("### Token-Nutzung (geschaetzt)\n\n")
             f.write(f"- **Mittelwert:** {token_stats['mean']}\n")
             f.write(f"- **Minimum:** {token_stats['min']}\n")
@@ -145,42 +414,94 @@ def generate_comparison_report(experiments: List[ExperimentSummary], output_file
         # Modell-Vergleich
         f.write("## Modell-Vergleich\n\n")
         
-        # Gruppiere nach Developer-Modell
-        by_model: Dict[str, List[ExperimentSummary]] = {}
-        for exp in experiments:
-            model = exp.models.get("developer", "unknown")
-            if model not in by_model:
-                by_model[model] = []
-            by_model[model].append(exp)
+        # Gruppiert nach Developer-Modell (Dauer/Tokens nur erfolgreiche Experimente)
+        # Werte mit 95%-Bootstrap-KI: [untere, obere Grenze]
+        rates = group_rates(table, "model")
+        duration_ci = bootstrap_ci(successful, "model", successful.duration, n_resamples)
+        tokens_ci = bootstrap_ci(successful, "model", successful.tokens, n_resamples)
+        success_ci = bootstrap_ci(table, "model", table.success, n_resamples)
         
-        f.write("| Developer Model | Anzahl | Avg Dauer (s) | Avg Tokens | Erfolgsrate |\n")
-        f.write("|-----------------|--------|---------------|------------|-------------|\n")
+        f.write("| Developer Model | Anzahl | Avg Dauer (s) [95%-KI] | Avg Tokens [95%-KI] | Erfolgsrate [95%-KI] |\n")
+        f.write("|-----------------|--------|------------------------|---------------------|----------------------|\n")
         
-        for model, exps in sorted(by_model.items()):
-            successful = [e for e in exps if e.success]
-            avg_duration = statistics.mean([e.total_duration for e in successful]) if successful else 0
-            avg_tokens = statistics.mean([e.total_tokens for e in successful]) if successful else 0
-            success_rate = len(successful) / len(exps) * 100
+        for model, rate in rates.items():
+            duration_text = format_ci(duration_ci[model]) if model in duration_ci else "-"
+            tokens_text = format_ci(tokens_ci[model], digits=0) if model in tokens_ci else "-"
+            success_text = format_ci(success_ci[model], digits=0, scale=100)
             
-            f.write(f"| {model} | {len(exps)} | {avg_duration:.1f} | {int(avg_tokens)} | {success_rate:.0f}% |\n")
+            f.write(f"| {model} | {rate['count']} | {duration_text} | {tokens_text} | {success_text} % |\n")
+        
+        # Paarweise Permutationstests (nur bei mehreren Modellen)
+        if len(rates) > 1:
+            f.write("\n### Signifikanz (Permutationstest, Holm-korrigiert)\n\n")
+            f.write("| Modell A | Modell B | Metrik | Differenz (A-B) | p | p (Holm) |\n")
+            f.write("|----------|----------|--------|-----------------|---|----------|\n")
+            for metric, source, values in (("Dauer (s)", successful, successful.duration),
+                                           ("Tokens", successful, successful.tokens),
+                                           ("Erfolgsrate", table, table.success)):
+                for test in permutation_tests(source, "model", values, n_resamples):
+                    marker = " *" if test["p_holm"] < 0.05 else ""
+                    f.write(f"| {test['a']} | {test['b']} | {metric} | {test['difference']:.2f} "
+                            f"| {test['p_value']:.4f} | {test['p_holm']:.4f}{marker} |\n")
+            f.write("\n\\* signifikant bei alpha = 0.05 nach Holm-Korrektur\n")
         
         # Agent-Analyse
         f.write("\n## Agent-Analyse\n\n")
         f.write("Durchschnittliche Dauer und Token-Nutzung pro Agent:\n\n")
         
-        agent_roles = ["Product Owner", "Python Developer", "QA Engineer", "Technical Writer"]
+        agent_durations = grouped_stats(successful_tasks, "agent", successful_tasks.duration)
+        agent_tokens = grouped_stats(successful_tasks, "agent", successful_tasks.tokens)
         
-        f.write("| Agent | Avg Dauer (s) | Avg Tokens |\n")
-        f.write("|-------|---------------|------------|\n")
+        f.write("| Agent | Aufrufe | Avg Dauer pro Aufruf (s) | Avg Tokens pro Aufruf |\n")
+        f.write("|-------|---------|--------------------------|-----------------------|\n")
         
-        for role in agent_roles:
-            role_durations = [e.agent_durations.get(role, 0) for e in experiments if e.success]
-            role_tokens = [e.agent_tokens.get(role, 0) for e in experiments if e.success]
-            
-            avg_dur = statistics.mean(role_durations) if role_durations else 0
-            avg_tok = statistics.mean(role_tokens) if role_tokens else 0
+        for role, duration_stats in agent_durations.items():
+            f.write(f"| {role} | {duration_stats['count']} | {duration_stats['mean']:.1f} "
+                    f"| {int(agent_tokens[role]['mean'])} |\n")
+        
+        # Test-Fix-Schleife (iterative Experimente)
+        costs = iteration_costs(experiments)
+        if costs:
+            f.write("\n## Test-Fix-Schleife (iterative Experimente)\n\n")
+            f.write("Iterationen bis gruen nur ueber erfolgreiche Experimente; "
+                    "Testschleife = alle Fixes + alle Testlaeufe eines Experiments.\n\n")
+            f.write("\n".join(format_iteration_tables(costs)) + "\n")
+
+
+        # Verteilungen pro Gruppe (Task-Dauer, erfolgreiche Experimente)
+        if len(successful_tasks):
+            f.write("\n## Verteilung der Task-Dauer (Sekunden)\n\n")
+            for title, key in (("Nach Modell", "model"), ("Nach Agent", "agent"),
+                               ("Nach Runner", "runner"), ("Nach Task", "task")):
+                _write_distribution_table(f, title, grouped_stats(successful_tasks, key, successful_tasks.duration))
+        
+        # Durchsatz nach Modell und Hardware
+        raw = throughput_by_model_and_hardware(experiments)
+        if raw["groups"]:
+            f.write("\n## Durchsatz nach Modell und Hardware\n\n")
+            f.write("Median (p90) pro Experiment, nur erfolgreiche Experimente.\n\n")
+            f.write("\n".join(format_throughput_table(raw)) + "\n")
             
-            f.write(f"| {role} | {avg_dur:.1f} | {int(avg_tok)} |\n")
+            if normalize_hardware is None:
+                normalize_hardware = len(raw["factors"]) > 1
+            if normalize_hardware:
+                normalized = throughput_by_model_and_hardware(experiments, normalize=True)
+                f.write(f"\n### Normiert auf {normalized['reference']}\n\n")
+                f.write("| Hardware | Faktor (>1 = schneller) |\n")
+                f.write("|----------|-------------------------|\n")
+                for hardware, factor in normalized["factors"].items():
+                    f.write(f"| {hardware} | {factor:.2f} |\n")
+                f.write("\n" + "\n".join(format_throughput_table(normalized)) + "\n")
+        
+        # Pareto-Front pro Aufgabe
+        fronts = pareto_by_task(experiments)
+        if fronts:
+            f.write("\n## Pareto-Front pro Aufgabe (Erfolgsrate, Dauer, Tokens)\n\n")
+            f.write("Eine dominierte Konfiguration ist gegenueber der genannten in keiner Achse besser "
+                    "und kann aus kuenftigen Laeufen gestrichen werden.\n")
+            for task, rows in fronts.items():
+                f.write(f"\n### {task}\n\n")
+                f.write("\n".join(format_pareto_table(rows)) + "\n")
         
         # LaTeX Tabelle
         f.write("\n## LaTeX Tabelle (fuer Paper)\n\n")
@@ -202,123 +523,251 @@ def generate_comparison_report(experiments: List[ExperimentSummary], output_file
         f.write("\\end{tabular}\n")
         f.write("\\end{table}\n")
         f.write("```\n")
+        
+        # LaTeX: Modell-Vergleich mit Konfidenzintervallen
+        f.write("\n```latex\n")
+        f.write("\\begin{table}[h]\n")
+        f.write("\\centering\n")
+        f.write("\\caption{Modell-Vergleich (Mittelwert und 95\\%-Bootstrap-Konfidenzintervall)}\n")
+        f.write("\\begin{tabular}{|l|c|c|c|c|}\n")
+        f.write("\\hline\n")
+        f.write("Modell & n & Dauer (s) & Tokens & Erfolg (\\%) \\\\\n")
+        f.write("\\hline\n")
+        
+        for model, rate in rates.items():
+            duration_text = format_ci(duration_ci[model]) if model in duration_ci else "--"
+            tokens_text = format_ci(tokens_ci[model], digits=0) if model in tokens_ci else "--"
+            success_text = format_ci(success_ci[model], digits=0, scale=100)
+            f.write(f"{model} & {rate['count']} & {duration_text} & {tokens_text} & {success_text} \\\\\n")
+        
+        f.write("\\hline\n")
+        f.write("\\end{tabular}\n")
+        f.write("\\end{table}\n")
+        f.write("```\n")
     
     print(f"✅ Report gespeichert: {output_file}")
 
 
+def _column_name(role: str) -> str:
+    """Spaltenname aus einer Rolle, z.B. "Python Developer" -> "python_developer"."""
+    return "".join(c if c.isalnum() else "_" for c in role.lower()).strip("_")
+
+
 def export_to_csv(experiments: List[ExperimentSummary], output_file: str = "experiments_data.csv"):
-    """Exportiert alle Daten als CSV fuer weitere Analyse (Excel, SPSS, R)."""
+    """
+    Exportiert alle Daten als CSV fuer weitere Analyse (Excel, SPSS, R).
+    
+    Modell- und Rollen-Spalten ergeben sich aus den Experimenten (auch
+    "Developer-Fix" oder die Task-Entwickler des Multi-Task-Runners);
+    Dauer und Tokens sind Summen ueber alle Tasks einer Rolle.
+    """
+    model_keys = list(dict.fromkeys(key for exp in experiments for key in exp.models))
+    roles = list(dict.fromkeys(role for exp in experiments for role in exp.agent_durations))
     
     with open(output_file, "w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
         
         # Header
-        writer.writerow([
-            "experiment_id",
-            "experiment_name", 
-            "timestamp",
-            "model_product_owner",
-            "model_developer",
-            "model_qa",
-            "model_writer",
-            "total_duration_seconds",
-            "total_tokens",
-            "success",
-            "duration_product_owner",
-            "duration_developer",
-            "duration_qa",
-            "duration_writer",
-            "tokens_product_owner",
-            "tokens_developer",
-            "tokens_qa",
-            "tokens_writer"
-        ])
+        writer.writerow(
+            ["experiment_id", "experiment_name", "timestamp", "runner_type"]
+            + [f"model_{key}" for key in model_keys]
+            + ["total_duration_seconds", "total_tokens", "success", "iterations", "test_seconds"]
+            + [f"duration_{_column_name(role)}" for role in roles]
+            + [f"tokens_{_column_name(role)}" for role in roles]
+            + [f"count_{_column_name(role)}" for role in roles]
+        )
         
         for exp in experiments:
-            writer.writerow([
-                exp.experiment_id,
-                exp.experiment_name,
-                exp.timestamp,
-                exp.models.get("product_owner", ""),
-                exp.models.get("developer", ""),
-                exp.models.get("qa_engineer", ""),
-                exp.models.get("technical_writer", ""),
-                exp.total_duration,
-                exp.total_tokens,
-                1 if exp.success else 0,
-                exp.agent_durations.get("Product Owner", 0),
-                exp.agent_durations.get("Python Developer", 0),
-                exp.agent_durations.get("QA Engineer", 0),
-                exp.agent_durations.get("Technical Writer", 0),
-                exp.agent_tokens.get("Product Owner", 0),
-                exp.agent_tokens.get("Python Developer", 0),
-                exp.agent_tokens.get("QA Engineer", 0),
-                exp.agent_tokens.get("Technical Writer", 0)
-            ])
+            series = iteration_series(exp) if is_iterative(exp) else None
+            writer.writerow(
+                [exp.experiment_id, exp.experiment_name, exp.timestamp, exp.runner_type]
+                + [exp.models.get(key, "") for key in model_keys]
+                + [
+                    exp.total_duration,
+                    exp.total_tokens,
+                    1 if exp.success else 0,
+                    series["iterations"] if series else "",
+                    round(sum(series["test_seconds"]), 3) if series and series["test_seconds"] else "",
+                ]
+                + [round(exp.agent_durations.get(role, 0), 3) for role in roles]
+                + [exp.agent_tokens.get(role, 0) for role in roles]
+                + [exp.agent_counts.get(role, 0) for role in roles]
+            )
     
     print(f"✅ CSV exportiert: {output_file}")
 
 
-def generate_charts(experiments: List[ExperimentSummary], output_dir: str = "charts"):
-    """Erstellt Diagramme (benoetigt matplotlib)."""
+def generate_charts(
+    experiments: List[ExperimentSummary],
+    output_dir: str = "charts",
+    fmt: str = "png",
+    workers: Optional[int] = None
+):
+    """
+    Erstellt Diagramme (benoetigt matplotlib).
+    
+    Unveraenderte Diagramme (gleicher Daten-Hash) werden uebersprungen, der
+    Rest wird parallel gezeichnet; fmt="svg" fuer Vektorgrafiken.
+    """
     try:
-        import matplotlib.pyplot as plt
         import matplotlib
-        matplotlib.use('Agg')  # Fuer Server ohne Display
     except ImportError:
         print("⚠️ matplotlib nicht installiert. Installieren mit: pip install matplotlib")
         return
     
-    os.makedirs(output_dir, exist_ok=True)
+    table = ExperimentTable(experiments)
+    successful = table.where(table.success)
+    tasks = TaskTable(experiments)
+    successful_tasks = tasks.where(tasks.success)
+    specs = []
     
     # 1. Balkendiagramm: Dauer pro Modell
-    by_model = {}
-    for exp in experiments:
-        model = exp.models.get("developer", "unknown")
-        if model not in by_model:
-            by_model[model] = []
-        if exp.success:
-            by_model[model].append(exp.total_duration)
-    
-    models = list(by_model.keys())
-    avg_durations = [statistics.mean(by_model[m]) if by_model[m] else 0 for m in models]
-    
-    plt.figure(figsize=(10, 6))
-    plt.bar(models, avg_durations, color='steelblue')
-    plt.xlabel('Developer Modell')
-    plt.ylabel('Durchschnittliche Dauer (Sekunden)')
-    plt.title('Ausfuehrungszeit nach Modell')
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    plt.savefig(f"{output_dir}/duration_by_model.png", dpi=150)
-    plt.close()
+    model_durations = grouped_stats(successful, "model", successful.duration)
+    models = list(group_rates(table, "model"))
+    specs.append(ChartSpec("duration_by_model", "bar", {
+        "labels": models,
+        "values": [model_durations.get(m, {}).get("mean", 0) for m in models],
+        "color": "steelblue",
+        "xlabel": "Developer Modell",
+        "ylabel": "Durchschnittliche Dauer (Sekunden)",
+        "title": "Ausfuehrungszeit nach Modell",
+    }))
     
     # 2. Balkendiagramm: Tokens pro Agent
-    agent_roles = ["Product Owner", "Python Developer", "QA Engineer", "Technical Writer"]
-    avg_tokens = []
+    agent_tokens = grouped_stats(successful_tasks, "agent", successful_tasks.tokens)
+    specs.append(ChartSpec("tokens_by_agent", "bar", {
+        "labels": list(agent_tokens),
+        "values": [stats["mean"] for stats in agent_tokens.values()],
+        "color": ['#2ecc71', '#3498db', '#e74c3c', '#9b59b6'],
+        "xlabel": "Agent",
+        "ylabel": "Durchschnittliche Tokens",
+        "title": "Token-Nutzung pro Agent",
+    }))
+    
+    # 3. Pareto-Front pro Aufgabe
+    for task, rows in pareto_by_task(experiments).items():
+        safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in task)
+        specs.append(ChartSpec(f"pareto_{safe_name}", "pareto", {"task": task, "rows": rows}))
+    
+    start = time.perf_counter()
+    result = render_charts(specs, output_dir, fmt=fmt, workers=workers)
+    elapsed = time.perf_counter() - start
+    print(f"✅ Diagramme erstellt in: {output_dir}/ "
+          f"({len(result['rendered'])} neu, {len(result['skipped'])} unveraendert, {elapsed:.1f}s)")
+
+
+# ============================================================
+# REGRESSIONEN
+# ============================================================
+
+def check_regressions(
+    experiments: List[ExperimentSummary],
+    recent: int = 3,
+    baseline: int = 20,
+    min_change: float = 0.2,
+    z_threshold: float = 3.0,
+    output_file: Optional[str] = None
+) -> int:
+    """
+    Prueft die juengsten Laeufe gegen die rollierende Baseline (siehe regression.py).
     
-    for role in agent_roles:
-        role_tokens = [e.agent_tokens.get(role, 0) for e in experiments if e.success]
-        avg_tokens.append(statistics.mean(role_tokens) if role_tokens else 0)
+    Returns:
+        Exit-Code: 1 bei mindestens einer Regression, sonst 0
+    """
+    results = detect_regressions(experiments, recent=recent, baseline=baseline,
+                                 min_change=min_change, z_threshold=z_threshold)
+    regressions = [r for r in results if r["regression"]]
     
-    plt.figure(figsize=(10, 6))
-    plt.bar(agent_roles, avg_tokens, color=['#2ecc71', '#3498db', '#e74c3c', '#9b59b6'])
-    plt.xlabel('Agent')
-    plt.ylabel('Durchschnittliche Tokens')
-    plt.title('Token-Nutzung pro Agent')
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    plt.savefig(f"{output_dir}/tokens_by_agent.png", dpi=150)
-    plt.close()
+    if not results:
+        print(f"ℹ️ Zu wenig Historie fuer einen Vergleich (mindestens {recent} + 5 Laeufe pro Aufgabe/Modell/Runner).")
+    else:
+        print("\n".join(format_regressions(results)))
+    if output_file:
+        with open(output_file, "w", encoding="utf-8") as f:
+            f.write(f"# Regressions-Check ({datetime.now().strftime('%Y-%m-%d %H:%M')})\n\n")
+            f.write(f"Juengste {recent} Laeufe gegen die {baseline} Laeufe davor; "
+                    f"Regression ab {min_change * 100:.0f}% Verschlechterung und robustem z >= {z_threshold}.\n\n")
+            f.write("\n".join(format_regressions(results)) + "\n")
     
-    print(f"✅ Diagramme erstellt in: {output_dir}/")
+    if regressions:
+        print(f"\n❌ {len(regressions)} Regression(en) gefunden.")
+        return 1
+    print(f"\n✅ Keine Regressionen ({len(results)} Vergleiche).")
+    return 0
 
 
 # ============================================================
 # CLI
 # ============================================================
 
+def load_filtered(base_dir: str, filter_text: str = "") -> List[ExperimentSummary]:
+    """Mit Filter ueber den Katalog, sonst direkt aus den Ordnern (inkrementell ueber den Cache)."""
+    if filter_text:
+        return query_experiments(base_dir, **parse_filters(filter_text))
+    return load_all_experiments(base_dir)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Nicht-interaktive Variante des Menues, z.B. fuer naechtliche Batches:
+    
+        python experiment_analyzer.py --base-dir projekte regressions --recent 3
+        python experiment_analyzer.py --filter "runner=iterative" report
+    """
+    parser = argparse.ArgumentParser(description="Experiment Analyzer - Wissenschaftliche Analyse")
+    parser.add_argument("--base-dir", default="projekte", help="Projekt-Ordner (Standard: projekte)")
+    parser.add_argument("--filter", default="", help="z.B. 'model=qwen2.5-coder:3b success=1 runner=iterative'")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    report = commands.add_parser("report", help="Vergleichsreport (Markdown)")
+    report.add_argument("--output", default="analysis_report.md")
+    csv_export = commands.add_parser("csv", help="CSV exportieren")
+    csv_export.add_argument("--output", default="experiments_data.csv")
+    chart = commands.add_parser("charts", help="Diagramme erstellen")
+    chart.add_argument("--output", default="charts")
+    chart.add_argument("--format", choices=("png", "svg"), default="png")
+    commands.add_parser("all", help="Report, CSV und Diagramme")
+    commands.add_parser("catalog", help="Katalog neu aufbauen")
+    regressions = commands.add_parser("regressions", help="Latenz-Regressionen gegen die Baseline pruefen")
+    regressions.add_argument("--recent", type=int, default=3, help="juengste Laeufe pro Aufgabe/Modell/Runner")
+    regressions.add_argument("--baseline", type=int, default=20, help="Laeufe davor als Baseline")
+    regressions.add_argument("--min-change", type=float, default=0.2, help="minimale Verschlechterung (0.2 = 20%%)")
+    regressions.add_argument("--z", type=float, default=3.0, help="minimaler robuster z-Wert")
+    regressions.add_argument("--output", default=None, help="Ergebnis zusaetzlich als Markdown speichern")
+    args = parser.parse_args(argv)
+    
+    if args.command == "catalog":
+        added, skipped = rebuild_catalog(args.base_dir)
+        print(f"📚 Katalog neu aufgebaut: {added} Experimente")
+        for directory, reason in skipped:
+            print(f"   ⚠️ {directory}: {reason}")
+        return 0
+    
+    experiments = load_filtered(args.base_dir, args.filter)
+    if not experiments:
+        print("Keine Experimente gefunden.")
+        return 2
+    
+    if args.command == "report":
+        generate_comparison_report(experiments, args.output)
+    elif args.command == "csv":
+        export_to_csv(experiments, args.output)
+    elif args.command == "charts":
+        generate_charts(experiments, args.output, fmt=args.format)
+    elif args.command == "all":
+        generate_comparison_report(experiments)
+        export_to_csv(experiments)
+        generate_charts(experiments)
+    elif args.command == "regressions":
+        return check_regressions(experiments, recent=args.recent, baseline=args.baseline,
+                                 min_change=args.min_change, z_threshold=args.z, output_file=args.output)
+    return 0
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(main())
+    
     print("""
 ╔══════════════════════════════════════════════════════════════════════╗
 ║              EXPERIMENT ANALYZER - Wissenschaftliche Analyse         ║
@@ -327,13 +776,16 @@ if __name__ == "__main__":
 ║  2. CSV exportieren (fuer Excel/SPSS)                                ║
 ║  3. Diagramme erstellen (benoetigt matplotlib)                       ║
 ║  4. Alles ausfuehren                                                 ║
-║  5. Beenden                                                          ║
+║  5. Katalog neu aufbauen                                             ║
+║  6. Regressionen pruefen (juengste Laeufe vs. Baseline)              ║
+║  7. Beenden                                                          ║
 ╚══════════════════════════════════════════════════════════════════════╝
     """)
     
     base_dir = input("Projekt-Ordner (Enter fuer 'projekte'): ").strip() or "projekte"
+    filter_text = input("Filter (z.B. model=qwen2.5-coder:3b success=1 runner=iterative since=2025-12-01, Enter fuer alle): ").strip()
     
-    experiments = load_all_experiments(base_dir)
+    experiments = load_filtered(base_dir, filter_text)
     
     if not experiments:
         print("Keine Experimente gefunden.")
@@ -342,7 +794,7 @@ if __name__ == "__main__":
     
     print(f"\n📊 {len(experiments)} Experimente gefunden.\n")
     
-    choice = input("Auswahl (1-5): ").strip()
+    choice = input("Auswahl (1-7): ").strip()
     
     if choice == "1":
         generate_comparison_report(experiments)
@@ -354,5 +806,12 @@ if __name__ == "__main__":
         generate_comparison_report(experiments)
         export_to_csv(experiments)
         generate_charts(experiments)
+    elif choice == "5":
+        added, skipped = rebuild_catalog(base_dir)
+        print(f"📚 Katalog neu aufgebaut: {added} Experimente")
+        for directory, reason in skipped:
+            print(f"   ⚠️ {directory}: {reason}")
+    elif choice == "6":
+        check_regressions(experiments)
     else:
         print("Beendet.")
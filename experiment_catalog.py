@@ -0,0 +1,395 @@
+"""
+Experiment-Katalog (SQLite)
+===========================
+Zentrale, indizierte Uebersicht aller Experimente eines Basis-Ordners
+(`projekte/catalog.sqlite`). Jeder `ExperimentTracer.save_results`-Aufruf
+traegt Konfiguration, Gesamtmetriken und Agent-Metriken per Upsert ein.
+
+Der Analyzer filtert dann per SQL (Modell, Zeitraum, Erfolg, Runner-Typ)
+statt jeden Ordner zu oeffnen:
+
+    catalog = ExperimentCatalog.for_base_dir("projekte")
+    rows = catalog.query(model="qwen2.5-coder:3b", success=True, since="2025-12-01")
+
+Aeltere Experimente (vor dem Katalog) nimmt `rebuild_catalog()` auf;
+`sync_catalog()` traegt nur noch fehlende Ordner nach.
+Synchrones sqlite3: Tracer und Analyzer laufen ohne Event-Loop.
+"""
+
+import os
+import json
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from experiment_store import load_experiment_data
+from throughput import hardware_fingerprint, count_generated_loc
+
+
+CATALOG_FILENAME = "catalog.sqlite"
+
+RUNNER_TYPES = ("sequential", "iterative", "multi_task")
+
+# Ordner im Basis-Ordner, die keine Experimente sind (dazu alle mit "." am Anfang)
+NON_EXPERIMENT_DIRS = ("charts", "__pycache__")
+
+# Spalten, die nach der ersten Version dazukamen (ALTER TABLE fuer alte Kataloge)
+_ADDED_COLUMNS = {
+    "experiments": (("hardware", "TEXT"), ("generated_loc", "INTEGER")),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS experiments (
+    experiment_id   TEXT PRIMARY KEY,
+    experiment_name TEXT NOT NULL,
+    runner_type     TEXT NOT NULL,
+    timestamp       TEXT NOT NULL,
+    models          TEXT NOT NULL,
+    total_duration  REAL NOT NULL,
+    total_tokens    INTEGER NOT NULL,
+    success         INTEGER NOT NULL,
+    error_message   TEXT,
+    directory       TEXT NOT NULL,
+    updated_at      TEXT NOT NULL,
+    hardware        TEXT,
+    generated_loc   INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_experiments_timestamp ON experiments (timestamp);
+CREATE INDEX IF NOT EXISTS idx_experiments_runner ON experiments (runner_type, success);
+CREATE INDEX IF NOT EXISTS idx_experiments_name ON experiments (experiment_name);
+
+CREATE TABLE IF NOT EXISTS experiment_models (
+    experiment_id TEXT NOT NULL REFERENCES experiments (experiment_id) ON DELETE CASCADE,
+    agent         TEXT NOT NULL,
+    model         TEXT NOT NULL,
+    PRIMARY KEY (experiment_id, agent)
+);
+CREATE INDEX IF NOT EXISTS idx_models_model ON experiment_models (model);
+
+CREATE TABLE IF NOT EXISTS agent_metrics (
+    experiment_id           TEXT NOT NULL REFERENCES experiments (experiment_id) ON DELETE CASCADE,
+    seq                     INTEGER NOT NULL,
+    agent_role              TEXT NOT NULL,
+    model                   TEXT,
+    task_name               TEXT,
+    duration_seconds        REAL,
+    estimated_input_tokens  INTEGER,
+    estimated_output_tokens INTEGER,
+    success                 INTEGER,
+    PRIMARY KEY (experiment_id, seq)
+);
+
+CREATE TABLE IF NOT EXISTS executions (
+    experiment_id TEXT NOT NULL REFERENCES experiments (experiment_id) ON DELETE CASCADE,
+    seq           INTEGER NOT NULL,
+    label         TEXT,
+    iteration     INTEGER,
+    wall_seconds  REAL,
+    PRIMARY KEY (experiment_id, seq)
+);
+"""
+
+
+def infer_runner_type(data: Dict[str, Any]) -> str:
+    """Runner-Typ fuer Experimente, deren Konfiguration ihn noch nicht enthaelt."""
+    runner_type = data.get("config", {}).get("runner_type")
+    if runner_type:
+        return runner_type
+    roles = {m.get("agent_role", "") for m in data.get("agent_metrics", [])}
+    if "Tester" in roles or "Developer-Fix" in roles:
+        return "iterative"
+    if any(role.startswith("Developer-") for role in roles):
+        return "multi_task"
+    return "sequential"
+
+
+class ExperimentCatalog:
+    """Indizierter Katalog aller Experimente eines Basis-Ordners."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+        for table, columns in _ADDED_COLUMNS.items():
+            existing = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+            for name, column_type in columns:
+                if name not in existing:
+                    self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+
+    @classmethod
+    def for_base_dir(cls, base_dir: str) -> "ExperimentCatalog":
+        return cls(Path(base_dir) / CATALOG_FILENAME)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --------------------------------------------------------
+    # Schreiben
+    # --------------------------------------------------------
+
+    def upsert(self, data: Dict[str, Any], directory: Path):
+        """Traegt ein Experiment ein bzw. aktualisiert es (Struktur wie `*_full.json`)."""
+        config = data["config"]
+        experiment_id = config["experiment_id"]
+        with self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO experiments (
+                    experiment_id, experiment_name, runner_type, timestamp, models,
+                    total_duration, total_tokens, success, error_message, directory, updated_at,
+                    hardware, generated_loc
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (experiment_id) DO UPDATE SET
+                    experiment_name = excluded.experiment_name,
+                    runner_type     = excluded.runner_type,
+                    timestamp       = excluded.timestamp,
+                    models          = excluded.models,
+                    total_duration  = excluded.total_duration,
+                    total_tokens    = excluded.total_tokens,
+                    success         = excluded.success,
+                    error_message   = excluded.error_message,
+                    directory       = excluded.directory,
+                    updated_at      = excluded.updated_at,
+                    hardware        = excluded.hardware,
+                    generated_loc   = excluded.generated_loc
+                """,
+                (
+                    experiment_id,
+                    config["experiment_name"],
+                    infer_runner_type(data),
+                    config["timestamp"],
+                    json.dumps(config.get("models", {}), ensure_ascii=False),
+                    data.get("total_duration_seconds", 0.0),
+                    data.get("total_estimated_tokens", 0),
+                    int(bool(data.get("success"))),
+                    data.get("error_message"),
+                    str(Path(directory).resolve()),
+                    datetime.now().isoformat(),
+                    hardware_fingerprint(data.get("system_info")),
+                    count_generated_loc(Path(directory)),
+                )
+            )
+            self._conn.execute("DELETE FROM experiment_models WHERE experiment_id = ?", (experiment_id,))
+            self._conn.executemany(
+                "INSERT INTO experiment_models (experiment_id, agent, model) VALUES (?, ?, ?)",
+                [(experiment_id, agent, model) for agent, model in config.get("models", {}).items()]
+            )
+            self._conn.execute("DELETE FROM agent_metrics WHERE experiment_id = ?", (experiment_id,))
+            self._conn.executemany(
+                """
+                INSERT INTO agent_metrics (
+                    experiment_id, seq, agent_role, model, task_name, duration_seconds,
+                    estimated_input_tokens, estimated_output_tokens, success
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        experiment_id, seq, m["agent_role"], m.get("model"), m.get("task_name"),
+                        m.get("duration_seconds"), m.get("estimated_input_tokens"),
+                        m.get("estimated_output_tokens"), int(bool(m.get("success")))
+                    )
+                    for seq, m in enumerate(data.get("agent_metrics", []))
+                ]
+            )
+            self._conn.execute("DELETE FROM executions WHERE experiment_id = ?", (experiment_id,))
+            self._conn.executemany(
+                "INSERT INTO executions (experiment_id, seq, label, iteration, wall_seconds) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (experiment_id, seq, m.get("label"), m.get("iteration"), m.get("wall_seconds"))
+                    for seq, m in enumerate(data.get("execution_metrics") or [])
+                ]
+            )
+
+    def remove(self, experiment_id: str):
+        with self._conn:
+            self._conn.execute("DELETE FROM experiments WHERE experiment_id = ?", (experiment_id,))
+
+    # --------------------------------------------------------
+    # Abfragen
+    # --------------------------------------------------------
+
+    def query(
+        self,
+        model: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        success: Optional[bool] = None,
+        runner_type: Optional[str] = None,
+        name: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Experimente nach Filtern, sortiert nach Zeitstempel.
+
+        Args:
+            model: Experimente, in denen irgendein Agent dieses Modell nutzt
+            since/until: ISO-Datum bzw. -Zeitstempel (until als Datum: inklusive)
+            success: nur erfolgreiche (True) bzw. fehlgeschlagene (False)
+            runner_type: "sequential", "iterative" oder "multi_task"
+            name: Experiment-Name (SQL LIKE, z.B. "pokemon%")
+        """
+        clauses, params = [], []
+        if model:
+            clauses.append("experiment_id IN (SELECT experiment_id FROM experiment_models WHERE model = ?)")
+            params.append(model)
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            if "T" not in until:
+                # Reines Datum: der ganze Tag gehoert dazu
+                until = (datetime.fromisoformat(until) + timedelta(days=1)).date().isoformat()
+            clauses.append("timestamp < ?")
+            params.append(until)
+        if success is not None:
+            clauses.append("success = ?")
+            params.append(int(success))
+        if runner_type:
+            clauses.append("runner_type = ?")
+            params.append(runner_type)
+        if name:
+            clauses.append("experiment_name LIKE ?")
+            params.append(name)
+
+        sql = "SELECT * FROM experiments"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp"
+
+        rows = []
+        for row in self._conn.execute(sql, params):
+            entry = dict(row)
+            entry["models"] = json.loads(entry["models"])
+            entry["success"] = bool(entry["success"])
+            rows.append(entry)
+        return rows
+
+    def agent_metrics(self, experiment_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Agent-Metriken pro Experiment, in Einfuege-Reihenfolge."""
+        result: Dict[str, List[Dict[str, Any]]] = {experiment_id: [] for experiment_id in experiment_ids}
+        for start in range(0, len(experiment_ids), 500):
+            chunk = experiment_ids[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            for row in self._conn.execute(
+                f"SELECT * FROM agent_metrics WHERE experiment_id IN ({placeholders}) ORDER BY experiment_id, seq",
+                chunk
+            ):
+                entry = dict(row)
+                entry["success"] = bool(entry["success"])
+                result[entry["experiment_id"]].append(entry)
+        return result
+
+    def executions(self, experiment_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Sandbox-Laeufe (label, iteration, wall_seconds) pro Experiment."""
+        result: Dict[str, List[Dict[str, Any]]] = {experiment_id: [] for experiment_id in experiment_ids}
+        for start in range(0, len(experiment_ids), 500):
+            chunk = experiment_ids[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            for row in self._conn.execute(
+                f"SELECT * FROM executions WHERE experiment_id IN ({placeholders}) ORDER BY experiment_id, seq",
+                chunk
+            ):
+                result[row["experiment_id"]].append(dict(row))
+        return result
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM experiments").fetchone()[0]
+
+    def directories(self) -> set:
+        """Aufgeloeste Ordner aller eingetragenen Experimente."""
+        return {row[0] for row in self._conn.execute("SELECT directory FROM experiments")}
+
+
+# ============================================================
+# BACKFILL
+# ============================================================
+
+def experiment_directories(base_dir: str) -> List[Path]:
+    """Unterordner von base_dir ohne bekannte Nicht-Experiment-Ordner (charts/, ...)."""
+    return sorted(
+        p for p in Path(base_dir).iterdir()
+        if p.is_dir() and p.name not in NON_EXPERIMENT_DIRS and not p.name.startswith(".")
+    )
+
+
+def _upsert_directories(
+    catalog: ExperimentCatalog,
+    exp_dirs: List[Path],
+    skipped: List[Tuple[str, str]],
+    found_ids: set
+) -> int:
+    """Traegt die Ordner ein; Fehler landen in skipped, IDs in found_ids."""
+    added = 0
+    for exp_dir in exp_dirs:
+        try:
+            data = load_experiment_data(exp_dir)
+        except FileNotFoundError:
+            skipped.append((exp_dir.name, "keine Experiment-Daten (kein Store, kein *_full.json)"))
+            continue
+        except Exception as e:
+            skipped.append((exp_dir.name, str(e)))
+            continue
+        catalog.upsert(data, exp_dir)
+        found_ids.add(data["config"]["experiment_id"])
+        added += 1
+    return added
+
+
+def rebuild_catalog(base_dir: str, prune: bool = True) -> Tuple[int, List[Tuple[str, str]]]:
+    """
+    Nimmt alle Experiment-Ordner unter base_dir in den Katalog auf.
+
+    Returns:
+        (Anzahl eingetragener Experimente, [(Ordner, Grund)] fuer uebersprungene)
+    """
+    skipped: List[Tuple[str, str]] = []
+    found_ids = set()
+
+    with ExperimentCatalog.for_base_dir(base_dir) as catalog:
+        added = _upsert_directories(catalog, experiment_directories(base_dir), skipped, found_ids)
+
+        if prune:
+            # Eintraege, deren Ordner geloescht wurde
+            for row in catalog.query():
+                if row["experiment_id"] not in found_ids and not os.path.isdir(row["directory"]):
+                    catalog.remove(row["experiment_id"])
+
+    return added, skipped
+
+
+def sync_catalog(base_dir: str) -> Tuple[int, List[Tuple[str, str]]]:
+    """
+    Traegt nur Ordner nach, die noch nicht im Katalog stehen - etwa Experimente
+    von vor dem Katalog, wenn `save_results` die Datei fuer einen neuen Lauf
+    angelegt hat. Ordner ohne Experiment-Daten werden wie bei rebuild_catalog
+    gemeldet; nur bekannte Nicht-Experiment-Ordner (NON_EXPERIMENT_DIRS)
+    bleiben aussen vor.
+
+    Returns:
+        (Anzahl nachgetragener Experimente, [(Ordner, Grund)] fuer uebersprungene)
+    """
+    skipped: List[Tuple[str, str]] = []
+    with ExperimentCatalog.for_base_dir(base_dir) as catalog:
+        known = catalog.directories()
+        missing = [p for p in experiment_directories(base_dir) if str(p.resolve()) not in known]
+        added = _upsert_directories(catalog, missing, skipped, set())
+    return added, skipped
+
+
+if __name__ == "__main__":
+    import sys
+    base = sys.argv[1] if len(sys.argv) > 1 else "projekte"
+    count, skipped_dirs = rebuild_catalog(base)
+    print(f"📚 Katalog {Path(base) / CATALOG_FILENAME}: {count} Experimente eingetragen")
+    for directory, reason in skipped_dirs:
+        print(f"   ⚠️ {directory}: {reason}")
@@ -14,18 +14,27 @@ Ergebnisse werden als JSON und CSV exportiert fuer statistische Analyse.
 import os
 import sys
 import json
-import csv
 import time
+import atexit
+import sqlite3
 import platform
 import psutil
 from datetime import datetime
 from dataclasses import dataclass, asdict
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Callable
+from contextlib import contextmanager
 from pathlib import Path
 
 # CrewAI imports
 from crewai import Agent, Task, Crew, LLM
 
+from trace_writer import TraceWriter
+from resource_sampler import ResourceSampler
+from otel_tracing import SpanHandle, SpanRecorder
+from experiment_store import ExperimentStore, export_files, store_path_for
+from experiment_catalog import ExperimentCatalog, CATALOG_FILENAME
+from self_profiler import SelfProfiler
+
 
 # ============================================================
 # KONFIGURATION
@@ -39,13 +48,14 @@ class ExperimentConfig:
     task_description: str
     models: Dict[str, str]  # {"agent_role": "model_name"}
     timestamp: str = ""
+    runner_type: str = "sequential"  # "sequential", "iterative", "multi_task"
     
     def __post_init__(self):
         if not self.timestamp:
             self.timestamp = datetime.now().isoformat()
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentMetrics:
     """Metriken fuer einen einzelnen Agent."""
     agent_role: str
@@ -62,6 +72,22 @@ class AgentMetrics:
     error_message: Optional[str] = None
 
 
+@dataclass(slots=True)
+class ExecutionMetrics:
+    """Ressourcenverbrauch eines Sandbox-Laufs von generiertem Code."""
+    label: str                      # z.B. "tests", "run", "gui_smoke"
+    model: str
+    iteration: int
+    wall_seconds: float
+    user_cpu_seconds: float
+    system_cpu_seconds: float
+    peak_rss_mb: float
+    returncode: int
+    timed_out: bool
+    limits_enforced: bool
+    limit_exceeded: Optional[str] = None   # "memory", "cpu", "processes", "timeout"
+
+
 @dataclass
 class ExperimentResult:
     """Gesamtergebnis eines Experiments."""
@@ -95,10 +121,17 @@ def get_system_info() -> Dict[str, Any]:
     }
 
 
-def get_resource_snapshot() -> Dict[str, float]:
-    """Momentaufnahme der Systemressourcen."""
+def get_resource_snapshot(sampler: Optional[ResourceSampler] = None) -> Dict[str, float]:
+    """
+    Momentaufnahme der Systemressourcen (blockiert nicht).
+    Laeuft ein ResourceSampler, wird dessen letzte Messung verwendet.
+    """
+    if sampler is not None:
+        latest = sampler.latest()
+        if latest:
+            return latest
     return {
-        "cpu_percent": psutil.cpu_percent(interval=0.1),
+        "cpu_percent": psutil.cpu_percent(interval=None),
         "ram_percent": psutil.virtual_memory().percent,
         "ram_used_gb": round(psutil.virtual_memory().used / (1024**3), 2)
     }
@@ -108,6 +141,24 @@ def get_resource_snapshot() -> Dict[str, float]:
 # TOKEN ESTIMATION
 # ============================================================
 
+def _deep_sizeof(obj: Any, seen: Optional[set] = None) -> int:
+    """sys.getsizeof inklusive Inhalt (Listen, Dicts, Dataclasses mit/ohne Slots)."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(_deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(_deep_sizeof(getattr(obj, name), seen) for name in obj.__slots__ if hasattr(obj, name))
+    elif hasattr(obj, "__dict__"):
+        size += _deep_sizeof(vars(obj), seen)
+    return size
+
+
 def estimate_tokens(text: str) -> int:
     """
     Schaetzt die Anzahl der Tokens (grobe Naeherung).
@@ -118,27 +169,205 @@ def estimate_tokens(text: str) -> int:
     return len(text) // 4
 
 
+# ============================================================
+# TRACE-LISTENER
+# ============================================================
+
+# Bekommen jedes Trace-Event (plus experiment_id), z.B. metrics_server.TraceMetrics
+TRACE_LISTENERS: List[Callable[[Dict[str, Any]], None]] = []
+
+# bounded_memory: so viele Trace-Events puffern, bevor sie in den Store gehen
+TRACE_STORE_BATCH = 256
+
+_metrics_server = None
+_metrics_server_failed = False     # Port belegt o.ae.: nicht bei jedem Tracer erneut versuchen
+_live_dashboard = None
+
+
+def add_trace_listener(listener: Callable[[Dict[str, Any]], None]):
+    if listener not in TRACE_LISTENERS:
+        TRACE_LISTENERS.append(listener)
+
+
+def remove_trace_listener(listener: Callable[[Dict[str, Any]], None]):
+    if listener in TRACE_LISTENERS:
+        TRACE_LISTENERS.remove(listener)
+
+
+def publish_event(event: str, data: Dict[str, Any] = None, experiment_id: str = ""):
+    """Event nur an die Listener (ohne Trace-Datei), z.B. Batch-Fortschritt."""
+    entry = {
+        "timestamp": datetime.now().isoformat(),
+        "experiment_id": experiment_id,
+        "event": event,
+        "data": data or {}
+    }
+    for listener in list(TRACE_LISTENERS):
+        try:
+            listener(entry)
+        except Exception as e:
+            print(f"⚠️ Trace-Listener {listener!r} fehlgeschlagen: {e}")
+
+
+def enable_metrics_endpoint(port: Optional[int] = None, host: str = "127.0.0.1"):
+    """
+    Startet den Prometheus-Endpoint (metrics_server.py) einmal pro Prozess.
+    Ohne port: EXPERIMENT_METRICS_PORT, sonst passiert nichts. Ist der Port
+    belegt, laeuft das Experiment ohne Endpoint weiter.
+    """
+    global _metrics_server, _metrics_server_failed
+    if _metrics_server is not None or _metrics_server_failed:
+        return _metrics_server
+    if port is None:
+        port_env = os.environ.get("EXPERIMENT_METRICS_PORT")
+        if not port_env:
+            return None
+        port = int(port_env)
+    
+    from metrics_server import MetricsServer, TraceMetrics
+    collector = TraceMetrics()
+    try:
+        _metrics_server = MetricsServer(collector.registry, host=host, port=port).start()
+    except OSError as e:
+        _metrics_server_failed = True
+        print(f"⚠️ Prometheus-Endpoint {host}:{port} nicht verfuegbar: {e}")
+        return None
+    add_trace_listener(collector)
+    print(f"📈 Prometheus-Metriken: {_metrics_server.url}")
+    return _metrics_server
+
+
+def enable_live_dashboard(catalog_path: Optional[Path] = None, force: bool = False):
+    """
+    Startet das rich-Live-Dashboard (live_dashboard.py) einmal pro Prozess,
+    wenn EXPERIMENT_DASHBOARD=1 gesetzt ist (oder force=True).
+    """
+    global _live_dashboard
+    if _live_dashboard is not None:
+        return _live_dashboard
+    if not force and os.environ.get("EXPERIMENT_DASHBOARD", "0") != "1":
+        return None
+    
+    from live_dashboard import LiveDashboard
+    try:
+        _live_dashboard = LiveDashboard(catalog_path=catalog_path).start()
+    except ImportError as e:
+        print(f"⚠️ Live-Dashboard nicht verfuegbar: {e}")
+        return None
+    add_trace_listener(_live_dashboard)
+    atexit.register(_live_dashboard.stop)
+    return _live_dashboard
+
+
+def dashboard_active() -> bool:
+    """True, solange das Live-Dashboard laeuft (Runner schalten dann verbose ab)."""
+    return _live_dashboard is not None
+
+
 # ============================================================
 # TRACING CALLBACK
 # ============================================================
 
 class ExperimentTracer:
-    """Trackt alle Agent-Aktivitaeten waehrend eines Experiments."""
+    """
+    Trackt alle Agent-Aktivitaeten waehrend eines Experiments.
+    
+    Trace-Events werden gepuffert von einem Hintergrund-Thread geschrieben
+    (siehe trace_writer.py). flush_interval und fsync steuern, wie oft
+    geschrieben bzw. auf die Platte synchronisiert wird.
+    
+    Ressourcen misst ein ResourceSampler alle resource_interval Sekunden
+    (siehe resource_sampler.py); 0 schaltet den Sampler ab, dann gibt es
+    nur Snapshots an den Task-Grenzen. Mit track_processes werden RSS/CPU
+    zusaetzlich Ollama, Orchestrator und Sandbox zugeordnet.
+    
+    Mit otel_exporter ("file", "otlp", "console", "memory") entstehen zusaetzlich
+    verschachtelte OpenTelemetry-Spans experiment -> task -> llm_call/test_run
+    (siehe otel_tracing.py); default aus EXPERIMENT_OTEL_EXPORTER.
+    
+    Alle Ergebnisse landen in einer SQLite-Datei pro Experiment (siehe
+    experiment_store.py). Die bisherigen CSV/Markdown/JSON-Dateien werden nur
+    mit export_files=True (oder EXPERIMENT_EXPORT_FILES=1) mitgeschrieben.
+    Zusaetzlich wird das Experiment in den Katalog des Basis-Ordners
+    eingetragen (default: <output_dir>/../catalog.sqlite).
+    
+    Mit profile=True (oder EXPERIMENT_PROFILE=1) tastet ein SelfProfiler den
+    Runner-Thread ab und trennt Orchestrator-Zeit von LLM-Wartezeit und
+    Test-Subprozessen (siehe self_profiler.py): `<id>_profile.folded` als
+    Flamegraph-Eingabe und `<id>_profile.md` mit den Top-Hotspots.
     
-    def __init__(self, experiment_id: str, output_dir: str):
+    Mit bounded_memory=True (oder EXPERIMENT_BOUNDED_MEMORY=1) fuer lange
+    Batch-Laeufe in einem Prozess: Trace-Events, Task-Outputs, Snapshots und
+    Sandbox-Metriken gehen sofort in den Store statt in Listen; im Speicher
+    bleiben nur die (geslotteten) AgentMetrics pro Task. memory_stats() misst,
+    was der Tracer noch haelt.
+    """
+    
+    def __init__(self, experiment_id: str, output_dir: str,
+                 flush_interval: float = 0.5, fsync: str = "close",
+                 resource_interval: float = 0.5, track_processes: bool = True,
+                 otel_exporter: Optional[str] = None, otel_endpoint: Optional[str] = None,
+                 export_files: Optional[bool] = None, catalog_path: Optional[str] = None,
+                 profile: Optional[bool] = None, profile_interval: float = 0.01,
+                 bounded_memory: Optional[bool] = None):
         self.experiment_id = experiment_id
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.trace_file = self.output_dir / f"{self.experiment_id}_trace.jsonl"
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._trace_writer: Optional[TraceWriter] = None
+        
+        self.store = ExperimentStore(store_path_for(self.output_dir, experiment_id))
+        if export_files is None:
+            export_files = os.environ.get("EXPERIMENT_EXPORT_FILES", "0") == "1"
+        self.export_files = export_files
+        self.catalog_path = Path(catalog_path) if catalog_path else self.output_dir.parent / CATALOG_FILENAME
+        
+        self.sampler: Optional[ResourceSampler] = None
+        if resource_interval and resource_interval > 0:
+            self.sampler = ResourceSampler(
+                interval=resource_interval,
+                sink=lambda rows: self.store.insert_rows("resources", rows),
+                track_processes=track_processes
+            )
+        
+        self.spans = SpanRecorder(
+            exporter=otel_exporter,
+            file_path=str(self.output_dir / f"{self.experiment_id}_otel.jsonl"),
+            endpoint=otel_endpoint,
+            resource_attributes={"experiment.id": experiment_id}
+        )
+        self.experiment_span = SpanHandle()
+        self.task_span = SpanHandle()
+        self._open_spans: List[SpanHandle] = []   # offene tracer.span()-Bloecke
+        self._span_names: List[str] = []          # Namen dazu (Phasen fuer den Profiler)
+        
+        if profile is None:
+            profile = os.environ.get("EXPERIMENT_PROFILE", "0") == "1"
+        self.profiler: Optional[SelfProfiler] = None
+        if profile:
+            self.profiler = SelfProfiler(interval=profile_interval, phase_fn=self._profile_phase)
+        self._task_active = False
+        
+        if bounded_memory is None:
+            bounded_memory = os.environ.get("EXPERIMENT_BOUNDED_MEMORY", "0") == "1"
+        self.bounded_memory = bounded_memory
+        self._pending_trace: List[Dict[str, Any]] = []   # nur bounded_memory: naechster Store-Batch
         
         self.agent_metrics: List[AgentMetrics] = []
         self.task_outputs: List[Dict[str, str]] = []
         self.resource_snapshots: List[Dict[str, Any]] = []
+        self.execution_metrics: List[ExecutionMetrics] = []
         self.logs: List[Dict[str, Any]] = []
         
         self.current_task_start: Optional[float] = None
         self.current_agent: Optional[str] = None
         self.current_task: Optional[str] = None
         
+        enable_metrics_endpoint()
+        enable_live_dashboard(self.catalog_path)
+        
     def log(self, event: str, data: Dict[str, Any] = None):
         """Loggt ein Event mit Timestamp."""
         entry = {
@@ -147,34 +376,168 @@ class ExperimentTracer:
             "event": event,
             "data": data or {}
         }
-        self.logs.append(entry)
+        if self.bounded_memory:
+            self._pending_trace.append(entry)
+            if len(self._pending_trace) >= TRACE_STORE_BATCH:
+                self._flush_trace_rows()
+        else:
+            self.logs.append(entry)
         
-        # Auch in Logdatei schreiben
-        log_file = self.output_dir / f"{self.experiment_id}_trace.jsonl"
-        with open(log_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        # Auch in Logdatei schreiben (asynchron, gepuffert)
+        if self._trace_writer is None or self._trace_writer.closed:
+            self._trace_writer = TraceWriter(
+                str(self.trace_file),
+                flush_interval=self.flush_interval,
+                fsync=self.fsync
+            )
+        self._trace_writer.write(entry)
+        if TRACE_LISTENERS:
+            publish_event(event, entry["data"], self.experiment_id)
+    
+    def _flush_trace_rows(self):
+        if self._pending_trace:
+            self.store.insert_rows("trace", self._pending_trace)
+            self._pending_trace = []
+    
+    def _keep(self, table: str, records: List[Any], row: Dict[str, Any], record: Any = None):
+        """Haengt an die Liste an bzw. schreibt im bounded_memory-Modus direkt in den Store."""
+        if self.bounded_memory:
+            self.store.insert_rows(table, [row])
+        else:
+            records.append(row if record is None else record)
+    
+    def memory_stats(self) -> Dict[str, Any]:
+        """Vom Tracer gehaltener Speicher (Listen und Puffer, ohne Sampler-Ring)."""
+        retained = {
+            name: _deep_sizeof(getattr(self, name))
+            for name in ("agent_metrics", "task_outputs", "resource_snapshots",
+                         "execution_metrics", "logs", "_pending_trace")
+        }
+        total = sum(retained.values())
+        tasks = len(self.agent_metrics)
+        return {
+            "bounded_memory": self.bounded_memory,
+            "tasks": tasks,
+            "retained_bytes": total,
+            "bytes_per_task": round(total / tasks) if tasks else 0,
+            "by_list": retained
+        }
+    
+    def flush(self):
+        """Wartet, bis alle Trace-Events in der Datei stehen."""
+        if self._trace_writer is not None:
+            self._trace_writer.flush()
+    
+    def close(self):
+        """Leert die Trace-Queue und schliesst die Datei."""
+        if self._trace_writer is not None:
+            self._trace_writer.close()
+        self._finish_profile()
+        self.spans.shutdown()
+        self.store.close()
+    
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[SpanHandle]:
+        """
+        OTel-Span fuer einen Block (z.B. "iteration", "llm_call", "test_run"),
+        als Kind des laufenden Tasks bzw. des innersten offenen Blocks.
+        Ohne OTel nur das Trace-Event "span_completed" (fuer trace_timeline.py).
+        """
+        parent = self.task_span if self.task_span.recording else self._current_scope()
+        started = time.perf_counter()
+        with self.spans.span(name, parent=parent, **attributes) as handle:
+            self._open_spans.append(handle)
+            self._span_names.append(name)
+            try:
+                yield handle
+            finally:
+                self._open_spans.pop()
+                self._span_names.pop()
+                self.log("span_completed", {
+                    "name": name,
+                    "duration_seconds": round(time.perf_counter() - started, 3),
+                    "attributes": attributes
+                })
+    
+    def _current_scope(self) -> SpanHandle:
+        return self._open_spans[-1] if self._open_spans else self.experiment_span
+    
+    def _profile_phase(self) -> str:
+        """Phase fuer den Profiler, z.B. "iteration/Developer-Fix:iteration_2/llm_call"."""
+        parts = list(self._span_names)
+        if self._task_active:
+            parts.append(f"{self.current_agent}:{self.current_task}")
+        # Task-interne Spans (llm_call, test_run) nach dem Task einordnen
+        if self._task_active and len(parts) > 1 and parts[-2] in ("llm_call", "test_run"):
+            parts[-2], parts[-1] = parts[-1], parts[-2]
+        return "/".join(parts) or "between_tasks"
+    
+    def _finish_profile(self) -> Optional[Dict[str, Any]]:
+        """Stoppt den Profiler und schreibt Flamegraph-Datei und Hotspot-Tabelle."""
+        if self.profiler is None:
+            return None
+        profiler, self.profiler = self.profiler, None
+        profiler.stop()
+        profiler.write_folded(self.output_dir / f"{self.experiment_id}_profile.folded")
+        profiler.write_summary(self.output_dir / f"{self.experiment_id}_profile.md", title=self.experiment_id)
+        summary = profiler.summary()
+        self.log("self_profile", {
+            "samples": summary["samples"],
+            "categories": summary["categories"],
+            "hotspots": summary["hotspots"][:5]
+        })
+        return summary
     
     def start_experiment(self):
         """Markiert den Start eines Experiments."""
         self.start_time = time.time()
+        if self.sampler is not None:
+            self.sampler.start()
+        if self.profiler is not None:
+            self.profiler.start()
+        self.experiment_span = self.spans.start("experiment", experiment_id=self.experiment_id)
         self.log("experiment_started", {"system_info": get_system_info()})
     
     def end_experiment(self):
         """Markiert das Ende eines Experiments."""
         self.end_time = time.time()
+        if self.sampler is not None:
+            self.sampler.stop()
         self.log("experiment_ended", {
-            "total_duration": self.end_time - self.start_time
+            "total_duration": self.end_time - self.start_time,
+            "resource_samples": self.sampler.sample_count if self.sampler else 0,
+            "processes": self.sampler.process_summary() if self.sampler else {},
+            "tracer_memory": self.memory_stats()
+        })
+        self.task_span.end(success=False)   # Task durch Exception abgebrochen
+        self.experiment_span.set_many({
+            "tasks": len(self.agent_metrics),
+            "tokens.output": sum(m.estimated_output_tokens for m in self.agent_metrics),
+            "duration_seconds": round(self.end_time - self.start_time, 2)
         })
+        self.experiment_span.end()
+        if sys.exc_info()[0] is not None:
+            # Abbruch: save_results kommt nicht mehr, Profil jetzt schreiben
+            self._finish_profile()
+        self.flush()
     
-    def start_task(self, agent_role: str, task_name: str, model: str):
+    def start_task(self, agent_role: str, task_name: str, model: str, iteration: Optional[int] = None):
         """Markiert den Start eines Tasks."""
         self.current_task_start = time.time()
         self.current_agent = agent_role
         self.current_task = task_name
         self.current_model = model
+        self._task_active = True
         
-        snapshot = get_resource_snapshot()
-        self.resource_snapshots.append({
+        if self.sampler is not None:
+            self.sampler.begin_span(agent_role, task_name, model)
+        self.task_span.end(success=False)   # vorheriger Task ohne end_task
+        self.task_span = self.spans.start(
+            "task", parent=self._current_scope(),
+            agent=agent_role, task=task_name, model=model, iteration=iteration
+        )
+        snapshot = get_resource_snapshot(self.sampler)
+        self._keep_snapshot({
             "phase": "task_start",
             "agent": agent_role,
             "task": task_name,
@@ -185,6 +548,7 @@ class ExperimentTracer:
             "agent": agent_role,
             "task": task_name,
             "model": model,
+            "iteration": iteration,
             "resources": snapshot
         })
     
@@ -212,14 +576,16 @@ class ExperimentTracer:
         )
         self.agent_metrics.append(metrics)
         
-        self.task_outputs.append({
+        self._keep("outputs", self.task_outputs, {
             "agent": self.current_agent,
             "task": self.current_task,
             "output": output_text[:5000] if output_text else ""  # Truncate for storage
         })
         
-        snapshot = get_resource_snapshot()
-        self.resource_snapshots.append({
+        snapshot = get_resource_snapshot(self.sampler)
+        if self.sampler is not None:
+            self.sampler.end_span()
+        self._keep_snapshot({
             "phase": "task_end",
             "agent": self.current_agent,
             "task": self.current_task,
@@ -229,6 +595,7 @@ class ExperimentTracer:
         self.log("task_completed", {
             "agent": self.current_agent,
             "task": self.current_task,
+            "model": self.current_model,
             "duration_seconds": round(duration, 2),
             "output_chars": output_chars,
             "estimated_tokens": estimate_tokens(output_text),
@@ -236,87 +603,90 @@ class ExperimentTracer:
             "resources": snapshot
         })
         
+        self.task_span.set_many({
+            "tokens.input": metrics.estimated_input_tokens,
+            "tokens.output": metrics.estimated_output_tokens,
+            "duration_seconds": metrics.duration_seconds,
+            "error": error
+        })
+        self.task_span.end(success=success)
+        self._task_active = False
+        
+        return metrics
+    
+    def _keep_snapshot(self, snapshot: Dict[str, Any]):
+        # bounded_memory mit Sampler: die Zeitreihe ersetzt die Snapshots
+        if self.bounded_memory and self.sampler is not None:
+            return
+        self._keep("resources", self.resource_snapshots, snapshot)
+    
+    def record_execution(self, metrics: ExecutionMetrics, model: str = None, iteration: int = None):
+        """Speichert die Ressourcen-Metriken eines Sandbox-Laufs."""
+        if model is not None:
+            metrics.model = model
+        if iteration is not None:
+            metrics.iteration = iteration
+        row = asdict(metrics)
+        self._keep("executions", self.execution_metrics, row, record=metrics)
+        self.log("code_executed", row)
         return metrics
     
     def save_results(self, result: ExperimentResult):
-        """Speichert alle Ergebnisse in verschiedenen Formaten."""
-        
-        # 1. Vollstaendiges JSON
-        json_file = self.output_dir / f"{self.experiment_id}_full.json"
-        with open(json_file, "w", encoding="utf-8") as f:
-            json.dump({
-                "config": asdict(result.config),
-                "agent_metrics": [asdict(m) for m in result.agent_metrics],
-                "total_duration_seconds": result.total_duration_seconds,
-                "total_estimated_tokens": result.total_estimated_tokens,
-                "system_info": result.system_info,
-                "success": result.success,
-                "error_message": result.error_message
-            }, f, indent=2, ensure_ascii=False)
-        
-        # 2. CSV fuer Metriken (einfach in Excel/SPSS importierbar)
-        csv_file = self.output_dir / f"{self.experiment_id}_metrics.csv"
-        with open(csv_file, "w", newline="", encoding="utf-8") as f:
-            if result.agent_metrics:
-                writer = csv.DictWriter(f, fieldnames=asdict(result.agent_metrics[0]).keys())
-                writer.writeheader()
-                for m in result.agent_metrics:
-                    writer.writerow(asdict(m))
-        
-        # 3. Ressourcen-Snapshots CSV
-        resources_csv = self.output_dir / f"{self.experiment_id}_resources.csv"
-        with open(resources_csv, "w", newline="", encoding="utf-8") as f:
-            if self.resource_snapshots:
-                writer = csv.DictWriter(f, fieldnames=self.resource_snapshots[0].keys())
-                writer.writeheader()
-                writer.writerows(self.resource_snapshots)
-        
-        # 4. Zusammenfassung als Markdown
-        summary_file = self.output_dir / f"{self.experiment_id}_summary.md"
-        with open(summary_file, "w", encoding="utf-8") as f:
-            f.write(f"# Experiment: {result.config.experiment_name}\n\n")
-            f.write(f"**ID:** {result.config.experiment_id}\n\n")
-            f.write(f"**Timestamp:** {result.config.timestamp}\n\n")
-            f.write(f"**Status:** {'Erfolgreich' if result.success else 'Fehlgeschlagen'}\n\n")
-            
-            f.write("## Systeminfo\n\n")
-            f.write(f"- Platform: {result.system_info.get('platform')}\n")
-            f.write(f"- Python: {result.system_info.get('python_version')}\n")
-            f.write(f"- CPU Cores: {result.system_info.get('cpu_count')}\n")
-            f.write(f"- RAM Total: {result.system_info.get('ram_total_gb')} GB\n\n")
-            
-            f.write("## Verwendete Modelle\n\n")
-            f.write("| Agent | Modell |\n")
-            f.write("|-------|--------|\n")
-            for agent, model in result.config.models.items():
-                f.write(f"| {agent} | {model} |\n")
-            
-            f.write("\n## Metriken\n\n")
-            f.write("| Agent | Task | Dauer (s) | Output Tokens | Erfolg |\n")
-            f.write("|-------|------|-----------|---------------|--------|\n")
-            for m in result.agent_metrics:
-                status = "✓" if m.success else "✗"
-                f.write(f"| {m.agent_role} | {m.task_name} | {m.duration_seconds} | {m.estimated_output_tokens} | {status} |\n")
-            
-            f.write(f"\n## Gesamtergebnis\n\n")
-            f.write(f"- **Gesamtdauer:** {result.total_duration_seconds:.2f} Sekunden\n")
-            f.write(f"- **Geschaetzte Tokens:** {result.total_estimated_tokens}\n")
-            
-            if result.error_message:
-                f.write(f"\n## Fehler\n\n```\n{result.error_message}\n```\n")
+        """Speichert alle Ergebnisse im Experiment-Store (optional zusaetzlich als Einzeldateien)."""
+        store = self.store
+        
+        # Ressourcen-Zeitreihe (schreibt der Sampler fortlaufend in den Store)
+        if self.sampler is not None and self.sampler.sample_count:
+            self.sampler.stop()
+            self.sampler.flush()
+        elif not self.bounded_memory:
+            # Ohne Sampler: nur die Snapshots an den Task-Grenzen
+            store.replace_rows("resources", self.resource_snapshots)
         
-        # 5. Crew Output
-        output_file = self.output_dir / f"{self.experiment_id}_output.md"
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(f"# Output: {result.config.experiment_name}\n\n")
-            f.write(result.crew_output)
+        # Selbst-Profiling (laeuft bis hierher, damit Datei-I/O nach dem Experiment mitzaehlt)
+        profile_summary = self._finish_profile()
+        if profile_summary is not None:
+            store.put_meta("profile", profile_summary)
+        
+        store.put_meta("config", asdict(result.config))
+        store.put_meta("system_info", result.system_info)
+        store.put_meta("process_resources", self.sampler.process_summary() if self.sampler else {})
+        store.put_meta("crew_output", result.crew_output)
+        store.put_meta("result", {
+            "total_duration_seconds": result.total_duration_seconds,
+            "total_estimated_tokens": result.total_estimated_tokens,
+            "success": result.success,
+            "error_message": result.error_message
+        })
+        store.replace_rows("agent_metrics", [asdict(m) for m in result.agent_metrics])
+        if self.bounded_memory:
+            # Executions, Outputs und Trace stehen schon im Store
+            self._flush_trace_rows()
+        else:
+            store.replace_rows("executions", [asdict(m) for m in self.execution_metrics])
+            store.replace_rows("outputs", result.individual_task_outputs)
+            store.replace_rows("trace", self.logs)
+        
+        exported = export_files(store, self.output_dir, self.experiment_id) if self.export_files else []
+        
+        # Zentraler Katalog (Fehler hier duerfen das Experiment nicht kosten)
+        try:
+            with ExperimentCatalog(self.catalog_path) as catalog:
+                catalog.upsert(store.full_data(), self.output_dir)
+        except sqlite3.Error as e:
+            print(f"⚠️ Katalog {self.catalog_path} nicht aktualisiert: {e}")
         
         print(f"\n📊 Ergebnisse gespeichert in: {self.output_dir}/")
-        print(f"   - {self.experiment_id}_full.json (vollstaendige Daten)")
-        print(f"   - {self.experiment_id}_metrics.csv (fuer Excel/SPSS)")
-        print(f"   - {self.experiment_id}_resources.csv (Ressourcen)")
-        print(f"   - {self.experiment_id}_summary.md (Zusammenfassung)")
+        print(f"   - {store.path.name} (alle Daten)")
+        for path in exported:
+            print(f"   - {path.name}")
         print(f"   - {self.experiment_id}_trace.jsonl (Event-Log)")
+        if self.spans.enabled and self.spans.exporter == "file":
+            print(f"   - {self.experiment_id}_otel.jsonl (OpenTelemetry-Spans)")
+        if profile_summary is not None:
+            print(f"   - {self.experiment_id}_profile.folded / _profile.md (Selbst-Profiling)")
+        
+        self.close()
 
 
 # ============================================================
@@ -363,12 +733,14 @@ def run_experiment(
         experiment_id=experiment_id,
         experiment_name=experiment_name,
         task_description=task_description or "Snake-Spiel mit GUI",
-        models=models
+        models=models,
+        runner_type="sequential"
     )
     
     # Tracer initialisieren
     tracer = ExperimentTracer(experiment_id, str(output_dir))
     tracer.start_experiment()
+    verbose = not dashboard_active()   # CrewAI-Ausgaben wuerden das Live-Dashboard ueberschreiben
     
     print("=" * 70)
     print(f"🔬 EXPERIMENT: {experiment_name}")
@@ -401,7 +773,7 @@ def run_experiment(
             goal="Klare und praezise Anforderungen fuer Software-Features definieren",
             backstory="Du bist ein erfahrener Product Owner mit tiefem Verstaendnis fuer Nutzerbeduerfnisse.",
             llm=product_owner_llm,
-            verbose=True
+            verbose=verbose
         )
         
         developer = Agent(
@@ -421,7 +793,7 @@ def run_experiment(
             9. Alle Features aus der Spezifikation muessen implementiert sein
             10. Saubere Klassenstruktur mit klaren Verantwortlichkeiten""",
             llm=developer_llm,
-            verbose=True
+            verbose=verbose
         )
         
         qa_engineer = Agent(
@@ -431,7 +803,7 @@ def run_experiment(
             Pruefe auf: Syntaxfehler, fehlende Imports, Logikfehler, fehlende Funktionen.
             Gib konkrete Code-Fixes an, nicht nur Beschreibungen.""",
             llm=qa_llm,
-            verbose=True
+            verbose=verbose
         )
         
         technical_writer = Agent(
@@ -439,7 +811,7 @@ def run_experiment(
             goal="Klare technische Dokumentation erstellen",
             backstory="Du bist ein erfahrener Technical Writer.",
             llm=writer_llm,
-            verbose=True
+            verbose=verbose
         )
         
         # Tasks erstellen
@@ -503,7 +875,7 @@ def run_experiment(
         crew = Crew(
             agents=[product_owner, developer, qa_engineer, technical_writer],
             tasks=[define_requirements, implement_code, review_code, write_documentation],
-            verbose=True
+            verbose=verbose
         )
         
         # Task-Tracking manuell (da CrewAI keine nativen Callbacks hat)
@@ -517,8 +889,10 @@ def run_experiment(
         # Alle Tasks auf einmal tracken (Start)
         experiment_start = time.time()
         
-        # Crew ausfuehren
-        result = crew.kickoff()
+        # Crew ausfuehren (alle Agents sequenziell, ein gemeinsamer Span)
+        with tracer.span("llm_call", models=", ".join(sorted(set(models.values())))) as llm_span:
+            result = crew.kickoff()
+            llm_span.set("tokens.output", estimate_tokens(str(result)))
         
         experiment_end = time.time()
         
@@ -620,6 +994,7 @@ def run_model_comparison(
     print("=" * 70)
     
     for i, models in enumerate(model_configs, 1):
+        publish_event("batch_progress", {"queued": len(model_configs) - i, "completed": i - 1})
         print(f"\n--- Konfiguration {i}/{len(model_configs)} ---")
         print(f"    Modelle: {models}")
         
@@ -640,6 +1015,8 @@ def run_model_comparison(
         except Exception as e:
             print(f"❌ Konfiguration {i} fehlgeschlagen: {e}")
     
+    publish_event("batch_progress", {"queued": 0, "completed": len(model_configs)})
+    
     # Vergleichs-Report erstellen
     comparison_file = Path(output_base_dir) / f"{experiment_name}_comparison.md"
     with open(comparison_file, "w", encoding="utf-8") as f:
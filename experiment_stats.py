@@ -0,0 +1,158 @@
+"""
+Konfidenzintervalle und Signifikanztests (NumPy)
+================================================
+Bei n=3 Laeufen pro Konfiguration sind Mittelwert-Unterschiede meist
+Rauschen. Dieses Modul liefert dazu:
+
+- bootstrap_ci():        Perzentil-Bootstrap-KI des Mittelwerts pro Gruppe
+                         (Dauer, Tokens, Erfolgsrate als 0/1-Werte)
+- permutation_tests():   paarweise Permutationstests der Mittelwert-Differenz
+                         zwischen Gruppen, mit Holm-Korrektur
+
+Alle Gruppen werden gemeinsam resampelt: die Werte liegen nach Gruppe
+sortiert in einem Array, Indizes werden als Matrix (Resamples x Werte)
+gezogen und per reduceat pro Gruppe summiert. 10.000 Resamples ueber alle
+Gruppen brauchen so nur Millisekunden bis wenige hundert Millisekunden.
+"""
+
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from experiment_table import _Table
+
+
+DEFAULT_RESAMPLES = 10_000
+
+# Obergrenze fuer Resamples x Werte pro Block (Speicher ~ 8 Byte pro Element)
+_BLOCK_ELEMENTS = 4_000_000
+
+
+def _sorted_groups(table: _Table, by: str, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[str]]:
+    """Werte nach Gruppe sortiert, dazu Segment-Starts, -Groessen und Gruppennamen."""
+    column = table.columns[by]
+    values = np.asarray(values, dtype=np.float64)
+    order = np.argsort(column.codes, kind="stable")
+    codes = column.codes[order]
+    present = np.unique(codes)
+    starts = np.searchsorted(codes, present)
+    counts = np.diff(np.append(starts, codes.size))
+    return values[order], starts, counts, [column.categories[c] for c in present]
+
+
+def bootstrap_ci(
+    table: _Table,
+    by: str,
+    values: np.ndarray,
+    n_resamples: int = DEFAULT_RESAMPLES,
+    confidence: float = 0.95,
+    seed: Optional[int] = 0
+) -> Dict[str, Dict[str, float]]:
+    """
+    Perzentil-Bootstrap-Konfidenzintervall des Mittelwerts pro Gruppe.
+
+    Returns:
+        {Gruppe: {"n", "mean", "ci_low", "ci_high"}}
+    """
+    sorted_values, starts, counts, groups = _sorted_groups(table, by, values)
+    if sorted_values.size == 0:
+        return {}
+    rng = np.random.default_rng(seed)
+
+    # Fuer jede Position: Start und Groesse ihrer Gruppe
+    group_start = np.repeat(starts, counts)
+    group_size = np.repeat(counts, counts)
+
+    block = max(1, _BLOCK_ELEMENTS // sorted_values.size)
+    means = np.empty((n_resamples, len(groups)))
+    for first in range(0, n_resamples, block):
+        rows = min(block, n_resamples - first)
+        # Ziehen mit Zuruecklegen innerhalb der eigenen Gruppe
+        offsets = (rng.random((rows, sorted_values.size)) * group_size).astype(np.int64)
+        resampled = sorted_values[group_start + offsets]
+        means[first:first + rows] = np.add.reduceat(resampled, starts, axis=1) / counts
+
+    alpha = (1.0 - confidence) / 2
+    low, high = np.quantile(means, [alpha, 1.0 - alpha], axis=0)
+    point = np.add.reduceat(sorted_values, starts) / counts
+    return {
+        group: {"n": int(counts[i]), "mean": float(point[i]), "ci_low": float(low[i]), "ci_high": float(high[i])}
+        for i, group in enumerate(groups)
+    }
+
+
+def _holm(p_values: List[float]) -> List[float]:
+    """Holm-Bonferroni-adjustierte p-Werte (gleiche Reihenfolge wie die Eingabe)."""
+    m = len(p_values)
+    order = np.argsort(p_values)
+    adjusted = np.empty(m)
+    running = 0.0
+    for rank, index in enumerate(order):
+        running = max(running, min(1.0, (m - rank) * p_values[index]))
+        adjusted[index] = running
+    return adjusted.tolist()
+
+
+def permutation_test(
+    a: np.ndarray,
+    b: np.ndarray,
+    n_permutations: int = DEFAULT_RESAMPLES,
+    seed: Optional[int] = 0
+) -> float:
+    """Zweiseitiger Permutationstest fuer die Differenz der Mittelwerte."""
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    if a.size == 0 or b.size == 0:
+        return float("nan")
+    pooled = np.concatenate((a, b))
+    observed = abs(a.mean() - b.mean())
+    rng = np.random.default_rng(seed)
+
+    extreme = 0
+    block = max(1, _BLOCK_ELEMENTS // pooled.size)
+    for first in range(0, n_permutations, block):
+        rows = min(block, n_permutations - first)
+        # Jede Zeile eine zufaellige Permutation der gepoolten Werte
+        permuted = rng.permuted(np.broadcast_to(pooled, (rows, pooled.size)), axis=1)
+        differences = np.abs(permuted[:, :a.size].mean(axis=1) - permuted[:, a.size:].mean(axis=1))
+        extreme += int(np.count_nonzero(differences >= observed - 1e-12))
+    # +1-Korrektur: der beobachtete Fall zaehlt als eine Permutation
+    return (extreme + 1) / (n_permutations + 1)
+
+
+def permutation_tests(
+    table: _Table,
+    by: str,
+    values: np.ndarray,
+    n_permutations: int = DEFAULT_RESAMPLES,
+    seed: Optional[int] = 0
+) -> List[Dict[str, object]]:
+    """
+    Paarweise Permutationstests zwischen allen Gruppen.
+
+    Returns:
+        [{"a", "b", "mean_a", "mean_b", "difference", "p_value", "p_holm"}, ...]
+    """
+    sorted_values, starts, counts, groups = _sorted_groups(table, by, values)
+    segments = {group: sorted_values[start:start + count] for group, start, count in zip(groups, starts, counts)}
+    results = []
+    for a, b in combinations(groups, 2):
+        p_value = permutation_test(segments[a], segments[b], n_permutations, seed)
+        results.append({
+            "a": a,
+            "b": b,
+            "mean_a": float(segments[a].mean()),
+            "mean_b": float(segments[b].mean()),
+            "difference": float(segments[a].mean() - segments[b].mean()),
+            "p_value": p_value,
+        })
+    for result, adjusted in zip(results, _holm([r["p_value"] for r in results])):
+        result["p_holm"] = adjusted
+    return results
+
+
+def format_ci(ci: Dict[str, float], digits: int = 1, scale: float = 1.0) -> str:
+    """Mittelwert mit KI als Text, z.B. "12.3 [10.1, 14.8]"."""
+    return (f"{ci['mean'] * scale:.{digits}f} "
+            f"[{ci['ci_low'] * scale:.{digits}f}, {ci['ci_high'] * scale:.{digits}f}]")
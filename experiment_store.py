@@ -0,0 +1,382 @@
+"""
+Experiment-Store (SQLite)
+=========================
+Eine Datei pro Experiment (`<experiment_id>_store.sqlite`) statt vieler
+Einzeldateien. Enthaelt:
+
+- meta           - Konfiguration, Systeminfo, Gesamtergebnis, Prozess-Ressourcen
+- agent_metrics  - eine Zeile pro Task
+- executions     - Sandbox-Laeufe (ExecutionMetrics)
+- resources      - Ressourcen-Zeitreihe des Samplers
+- outputs        - Task-Outputs und Crew-Output
+- trace          - alle Trace-Events (data als JSON)
+
+CSV/Markdown/JSON werden erst bei Bedarf daraus gerendert:
+
+    python experiment_store.py export experiments/EXPERIMENT_ID
+
+bzw. direkt nach dem Lauf mit `ExperimentTracer(..., export_files=True)`.
+"""
+
+import sys
+import csv
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+STORE_SUFFIX = "_store.sqlite"
+
+TABLES = ("agent_metrics", "executions", "resources", "outputs", "trace")
+
+
+def loads(data):
+    """JSON parsen - mit orjson, falls installiert (deutlich schneller bei grossen *_full.json)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def store_path_for(output_dir: Path, experiment_id: str) -> Path:
+    return Path(output_dir) / f"{experiment_id}{STORE_SUFFIX}"
+
+
+def _column_type(value: Any) -> str:
+    if isinstance(value, bool) or isinstance(value, int):
+        return "INTEGER"
+    if isinstance(value, float):
+        return "REAL"
+    return "TEXT"
+
+
+def _db_value(value: Any):
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+class ExperimentStore:
+    """
+    SQLite-Datei eines Experiments. Tabellen werden aus den ersten Zeilen
+    angelegt und bei neuen Schluesseln um Spalten erweitert. Thread-sicher
+    (der ResourceSampler schreibt aus seinem Thread).
+
+    Mit read_only=True (Analyse, Katalog) wird die Datei mit mode=ro geoeffnet:
+    kein Journal-Wechsel, kein CREATE, kein Schreibzugriff.
+    """
+
+    def __init__(self, path: Path, read_only: bool = False):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._columns: Dict[str, List[str]] = {}
+        if read_only:
+            uri = self.path.resolve().as_uri() + "?mode=ro"
+            self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            return
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.commit()
+
+    # --------------------------------------------------------
+    # Schreiben
+    # --------------------------------------------------------
+
+    def put_meta(self, key: str, value: Any):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                (key, json.dumps(value, ensure_ascii=False, default=str))
+            )
+            self._conn.commit()
+
+    def _ensure_columns(self, table: str, rows: List[Dict[str, Any]]):
+        if table not in TABLES:
+            raise ValueError(f"Unbekannte Tabelle '{table}'")
+        known = self._columns.get(table)
+        if known is None:
+            known = [row[1] for row in self._conn.execute(f'PRAGMA table_info("{table}")')][1:]
+            if not known:
+                self._conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" (seq INTEGER PRIMARY KEY AUTOINCREMENT)')
+            self._columns[table] = known
+        for row in rows:
+            for key, value in row.items():
+                if key not in known:
+                    self._conn.execute(f'ALTER TABLE "{table}" ADD COLUMN "{key}" {_column_type(value)}')
+                    known.append(key)
+
+    def _insert(self, table: str, rows: List[Dict[str, Any]]):
+        """INSERT ohne Commit (Aufrufer haelt Lock und Transaktion)."""
+        if not rows:
+            return
+        self._ensure_columns(table, rows)
+        columns = self._columns[table]
+        placeholders = ", ".join("?" for _ in columns)
+        column_list = ", ".join(f'"{c}"' for c in columns)
+        self._conn.executemany(
+            f'INSERT INTO "{table}" ({column_list}) VALUES ({placeholders})',
+            [tuple(_db_value(row.get(c)) for c in columns) for row in rows]
+        )
+
+    def insert_rows(self, table: str, rows: Iterable[Dict[str, Any]]):
+        """Haengt Zeilen (Dicts) an eine Tabelle an."""
+        rows = list(rows)
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._insert(table, rows)
+
+    def replace_rows(self, table: str, rows: Iterable[Dict[str, Any]]):
+        """
+        Ersetzt den Tabelleninhalt (save_results darf mehrfach laufen).
+        DELETE und INSERT in einer Transaktion: Leser sehen nie eine leere Tabelle.
+        """
+        rows = list(rows)
+        with self._lock, self._conn:
+            if self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,)
+            ).fetchone():
+                self._conn.execute(f'DELETE FROM "{table}"')
+            self._insert(table, rows)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # --------------------------------------------------------
+    # Lesen
+    # --------------------------------------------------------
+
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return loads(row[0]) if row else default
+
+    def rows(self, table: str) -> List[Dict[str, Any]]:
+        """Alle Zeilen einer Tabelle in Einfuege-Reihenfolge (ohne seq)."""
+        with self._lock:
+            exists = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,)
+            ).fetchone()
+            if not exists:
+                return []
+            cursor = self._conn.execute(f'SELECT * FROM "{table}" ORDER BY seq')
+            names = [d[0] for d in cursor.description][1:]
+            return [dict(zip(names, row[1:])) for row in cursor]
+
+    def trace(self) -> List[Dict[str, Any]]:
+        events = self.rows("trace")
+        for event in events:
+            event["data"] = loads(event["data"]) if event.get("data") else {}
+        return events
+
+    def full_data(self) -> Dict[str, Any]:
+        """Dieselbe Struktur wie frueher `*_full.json`."""
+        result = self.get_meta("result", {})
+        agent_metrics = self.rows("agent_metrics")
+        for m in agent_metrics:
+            m["success"] = bool(m.get("success"))
+        executions = self.rows("executions")
+        for m in executions:
+            m["timed_out"] = bool(m.get("timed_out"))
+            m["limits_enforced"] = bool(m.get("limits_enforced"))
+        return {
+            "config": self.get_meta("config", {}),
+            "agent_metrics": agent_metrics,
+            "total_duration_seconds": result.get("total_duration_seconds", 0.0),
+            "total_estimated_tokens": result.get("total_estimated_tokens", 0),
+            "system_info": self.get_meta("system_info", {}),
+            "execution_metrics": executions,
+            "process_resources": self.get_meta("process_resources", {}),
+            "success": result.get("success", False),
+            "error_message": result.get("error_message"),
+        }
+
+
+# ============================================================
+# LADEN (Analyzer, Notebook)
+# ============================================================
+
+def load_experiment_data(experiment_dir: Path) -> Dict[str, Any]:
+    """
+    Laedt die Daten eines Experiments - aus dem Store, sonst aus `*_full.json`
+    (aeltere Experimente bzw. Export).
+    """
+    experiment_dir = Path(experiment_dir)
+    stores = sorted(experiment_dir.glob(f"*{STORE_SUFFIX}"))
+    if stores:
+        store = ExperimentStore(stores[0], read_only=True)
+        try:
+            data = store.full_data()
+        finally:
+            store.close()
+        if data["config"]:
+            return data
+
+    json_files = sorted(experiment_dir.glob("*_full.json"))
+    if not json_files:
+        raise FileNotFoundError(f"Keine Experiment-Daten in {experiment_dir}")
+    with open(json_files[0], "rb") as f:
+        return loads(f.read())
+
+
+# ============================================================
+# EXPORT (die bisherigen Einzeldateien)
+# ============================================================
+
+def _write_csv(path: Path, rows: List[Dict[str, Any]]):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if rows:
+            writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def render_summary(data: Dict[str, Any]) -> str:
+    """Zusammenfassung als Markdown (frueher `*_summary.md`)."""
+    config = data["config"]
+    system_info = data["system_info"]
+    lines = [
+        f"# Experiment: {config.get('experiment_name')}\n",
+        f"**ID:** {config.get('experiment_id')}\n",
+        f"**Timestamp:** {config.get('timestamp')}\n",
+        f"**Status:** {'Erfolgreich' if data['success'] else 'Fehlgeschlagen'}\n",
+        "## Systeminfo\n",
+        f"- Platform: {system_info.get('platform')}",
+        f"- Python: {system_info.get('python_version')}",
+        f"- CPU Cores: {system_info.get('cpu_count')}",
+        f"- RAM Total: {system_info.get('ram_total_gb')} GB\n",
+        "## Verwendete Modelle\n",
+        "| Agent | Modell |",
+        "|-------|--------|",
+    ]
+    for agent, model in config.get("models", {}).items():
+        lines.append(f"| {agent} | {model} |")
+
+    lines += [
+        "\n## Metriken\n",
+        "| Agent | Task | Dauer (s) | Output Tokens | Erfolg |",
+        "|-------|------|-----------|---------------|--------|",
+    ]
+    for m in data["agent_metrics"]:
+        status = "✓" if m["success"] else "✗"
+        lines.append(f"| {m['agent_role']} | {m['task_name']} | {m['duration_seconds']} | "
+                     f"{m['estimated_output_tokens']} | {status} |")
+
+    if data["execution_metrics"]:
+        lines += [
+            "\n## Sandbox-Laeufe\n",
+            "| Lauf | Iteration | Wall (s) | CPU user (s) | CPU sys (s) | Peak RSS (MB) | Limit |",
+            "|------|-----------|----------|--------------|-------------|---------------|-------|",
+        ]
+        for m in data["execution_metrics"]:
+            lines.append(f"| {m['label']} | {m['iteration']} | {m['wall_seconds']} | {m['user_cpu_seconds']} | "
+                         f"{m['system_cpu_seconds']} | {m['peak_rss_mb']} | {m['limit_exceeded'] or '-'} |")
+
+    if data.get("process_resources"):
+        lines += [
+            "\n## Ressourcen pro Prozess\n",
+            "| Prozess | PIDs | Peak RSS (MB) | Mittel RSS (MB) | Peak CPU % | Mittel CPU % | Threads |",
+            "|---------|------|---------------|-----------------|------------|--------------|---------|",
+        ]
+        for group, stats in data["process_resources"].items():
+            pids = ", ".join(str(pid) for pid in stats["pids"][:5]) or "-"
+            if len(stats["pids"]) > 5:
+                pids += f" (+{len(stats['pids']) - 5})"
+            lines.append(f"| {group} | {pids} | {stats['peak_rss_mb']} | {stats['mean_rss_mb']} | "
+                         f"{stats['peak_cpu_percent']} | {stats['mean_cpu_percent']} | {stats['peak_threads']} |")
+        by_model = data["process_resources"].get("ollama", {}).get("peak_rss_mb_by_model")
+        if by_model:
+            lines += [
+                "\n**Ollama Peak RSS pro Modell** (waehrend der Tasks des Modells):\n",
+                "| Modell | Peak RSS (MB) |",
+                "|--------|---------------|",
+            ]
+            lines += [f"| {model} | {rss} |" for model, rss in by_model.items()]
+
+    lines += [
+        "\n## Gesamtergebnis\n",
+        f"- **Gesamtdauer:** {data['total_duration_seconds']:.2f} Sekunden",
+        f"- **Geschaetzte Tokens:** {data['total_estimated_tokens']}",
+    ]
+    if data.get("error_message"):
+        lines.append(f"\n## Fehler\n\n```\n{data['error_message']}\n```")
+    return "\n".join(lines) + "\n"
+
+
+def export_files(store: ExperimentStore, output_dir: Path, experiment_id: str) -> List[Path]:
+    """Rendert die bisherigen Einzeldateien aus dem Store."""
+    output_dir = Path(output_dir)
+    data = store.full_data()
+    written = []
+
+    path = output_dir / f"{experiment_id}_full.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    written.append(path)
+
+    path = output_dir / f"{experiment_id}_metrics.csv"
+    _write_csv(path, data["agent_metrics"])
+    written.append(path)
+
+    path = output_dir / f"{experiment_id}_resources.csv"
+    _write_csv(path, store.rows("resources"))
+    written.append(path)
+
+    if data["execution_metrics"]:
+        path = output_dir / f"{experiment_id}_executions.csv"
+        _write_csv(path, data["execution_metrics"])
+        written.append(path)
+
+    path = output_dir / f"{experiment_id}_summary.md"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(render_summary(data))
+    written.append(path)
+
+    path = output_dir / f"{experiment_id}_output.md"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"# Output: {data['config'].get('experiment_name')}\n\n")
+        f.write(store.get_meta("crew_output", ""))
+    written.append(path)
+
+    return written
+
+
+def export_experiment_dir(experiment_dir: Path) -> List[Path]:
+    """Export fuer ein Experiment-Verzeichnis (CLI)."""
+    written = []
+    for store_file in sorted(Path(experiment_dir).glob(f"*{STORE_SUFFIX}")):
+        experiment_id = store_file.name[:-len(STORE_SUFFIX)]
+        store = ExperimentStore(store_file, read_only=True)
+        try:
+            written += export_files(store, store_file.parent, experiment_id)
+        finally:
+            store.close()
+    return written
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] != "export":
+        print("Aufruf: python experiment_store.py export <experiment_dir> [<experiment_dir> ...]")
+        sys.exit(2)
+    for directory in sys.argv[2:]:
+        files = export_experiment_dir(Path(directory))
+        if not files:
+            print(f"⚠️ Kein Store in {directory}")
+        for path in files:
+            print(f"   - {path}")
@@ -0,0 +1,230 @@
+"""
+Spaltenorientierte Experiment-Tabellen (NumPy)
+==============================================
+Alle Experimente bzw. alle Task-Datensaetze als NumPy-Spalten statt als
+Listen von Objekten. Gruppierte Kennzahlen (Modell, Agent, Runner, Task)
+entstehen in einem Durchgang: einmal sortieren, dann Segmente per
+reduceat bzw. Index-Arithmetik auswerten - auch bei Zehntausenden
+Task-Datensaetzen im Millisekunden-Bereich.
+
+    table = TaskTable.from_summaries(experiments)
+    by_model = grouped_stats(table, "model", table.duration)
+    by_model["qwen2.5-coder:3b"]["p95"]
+
+Kategorische Spalten sind als Codes (int32) plus Kategorienliste gespeichert.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+
+PERCENTILES = (25, 50, 75, 90, 95, 99)
+
+STAT_KEYS = ("count", "mean", "std_dev", "min", "max", "median", "p90", "p95", "p99", "iqr")
+
+
+def encode(values: Sequence[str]) -> Tuple[np.ndarray, List[str]]:
+    """Kategorische Spalte -> (Codes, sortierte Kategorien)."""
+    categories, codes = np.unique(np.asarray(values, dtype=object).astype(str), return_inverse=True)
+    return codes.astype(np.int32), categories.tolist()
+
+
+@dataclass
+class Column:
+    """Kategorische Spalte."""
+    codes: np.ndarray
+    categories: List[str]
+
+    @classmethod
+    def of(cls, values: Sequence[str]) -> "Column":
+        if len(values) == 0:
+            return cls(np.zeros(0, dtype=np.int32), [])
+        return cls(*encode(values))
+
+    def labels(self) -> np.ndarray:
+        return np.asarray(self.categories, dtype=object)[self.codes]
+
+
+class _Table:
+    """Gemeinsame Basis: kategorische Spalten in self.columns, Messwerte als Attribute."""
+
+    columns: Dict[str, Column]
+
+    def __len__(self) -> int:
+        return len(self.success)
+
+    def where(self, mask: np.ndarray) -> "_Table":
+        """Zeilen-Auswahl (z.B. table.where(table.success))."""
+        subset = object.__new__(type(self))
+        for name, value in vars(self).items():
+            if name == "columns":
+                subset.columns = {key: Column(col.codes[mask], col.categories) for key, col in value.items()}
+            elif isinstance(value, np.ndarray):
+                setattr(subset, name, value[mask])
+            else:
+                setattr(subset, name, value)
+        return subset
+
+
+class ExperimentTable(_Table):
+    """Eine Zeile pro Experiment."""
+
+    def __init__(self, experiments: Sequence[Any]):
+        self.experiment_id = np.asarray([e.experiment_id for e in experiments], dtype=object)
+        self.duration = np.fromiter((e.total_duration for e in experiments), dtype=np.float64, count=len(experiments))
+        self.tokens = np.fromiter((e.total_tokens for e in experiments), dtype=np.float64, count=len(experiments))
+        self.success = np.fromiter((bool(e.success) for e in experiments), dtype=bool, count=len(experiments))
+        # Summen ueber die Tasks (fuer Tokens/s) und generierte Codezeilen
+        self.input_tokens = np.fromiter(
+            (sum(t.get("estimated_input_tokens") or 0 for t in e.task_metrics) for e in experiments),
+            dtype=np.float64, count=len(experiments))
+        self.task_seconds = np.fromiter(
+            (sum(t.get("duration_seconds") or 0.0 for t in e.task_metrics) for e in experiments),
+            dtype=np.float64, count=len(experiments))
+        self.loc = np.fromiter((e.generated_loc for e in experiments), dtype=np.float64, count=len(experiments))
+        self.columns = {
+            "model": Column.of([e.models.get("developer", "unknown") for e in experiments]),
+            "runner": Column.of([e.runner_type or "unknown" for e in experiments]),
+            "name": Column.of([e.experiment_name for e in experiments]),
+            "hardware": Column.of([e.hardware or "unbekannt" for e in experiments]),
+        }
+
+
+class TaskTable(_Table):
+    """Eine Zeile pro Task-Datensatz (agent_metrics) ueber alle Experimente."""
+
+    def __init__(self, experiments: Sequence[Any]):
+        experiment_index, agents, models, runners, tasks = [], [], [], [], []
+        duration, tokens, success = [], [], []
+        for index, exp in enumerate(experiments):
+            for record in exp.task_metrics:
+                experiment_index.append(index)
+                agents.append(record.get("agent_role") or "unknown")
+                models.append(record.get("model") or "unknown")
+                runners.append(exp.runner_type or "unknown")
+                tasks.append(record.get("task_name") or "unknown")
+                duration.append(record.get("duration_seconds") or 0.0)
+                tokens.append(record.get("estimated_output_tokens") or 0)
+                success.append(bool(record.get("success")) and bool(exp.success))
+        self.experiment_index = np.asarray(experiment_index, dtype=np.int64)
+        self.duration = np.asarray(duration, dtype=np.float64)
+        self.tokens = np.asarray(tokens, dtype=np.float64)
+        self.success = np.asarray(success, dtype=bool)
+        self.columns = {
+            "agent": Column.of(agents),
+            "model": Column.of(models),
+            "runner": Column.of(runners),
+            "task": Column.of(tasks),
+        }
+
+    @classmethod
+    def from_summaries(cls, experiments: Sequence[Any]) -> "TaskTable":
+        return cls(experiments)
+
+
+# ============================================================
+# KENNZAHLEN
+# ============================================================
+
+def _segment_stats(sorted_values: np.ndarray, starts: np.ndarray, counts: np.ndarray) -> Dict[str, np.ndarray]:
+    """Kennzahlen fuer aufsteigend sortierte Segmente [start, start+count)."""
+    sums = np.add.reduceat(sorted_values, starts)
+    means = sums / counts
+    deviations = sorted_values - np.repeat(means, counts)
+    squares = np.add.reduceat(deviations * deviations, starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        std = np.where(counts > 1, np.sqrt(squares / np.maximum(counts - 1, 1)), np.nan)
+
+    result = {
+        "count": counts,
+        "mean": means,
+        "std_dev": std,
+        "min": sorted_values[starts],
+        "max": sorted_values[starts + counts - 1],
+    }
+    # Perzentile wie numpy "linear": Position q*(n-1) im sortierten Segment
+    for q in PERCENTILES:
+        position = (counts - 1) * (q / 100.0)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, counts - 1)
+        fraction = position - lower
+        low_values = sorted_values[starts + lower]
+        high_values = sorted_values[starts + upper]
+        result[f"p{q}"] = low_values + (high_values - low_values) * fraction
+    result["median"] = result["p50"]
+    result["iqr"] = result["p75"] - result["p25"]
+    return result
+
+
+def _as_dict(stats: Dict[str, np.ndarray], i: int, digits: int) -> Dict[str, float]:
+    row = {"count": int(stats["count"][i])}
+    for key in STAT_KEYS[1:]:
+        value = float(stats[key][i])
+        if not np.isnan(value):
+            row[key] = round(value, digits)
+    return row
+
+
+def describe(values: Union[Sequence[float], np.ndarray], digits: int = 2) -> Dict[str, float]:
+    """Kennzahlen einer einzelnen Werteliste."""
+    values = np.sort(np.asarray(values, dtype=np.float64))
+    if values.size == 0:
+        return {"count": 0}
+    stats = _segment_stats(values, np.array([0]), np.array([values.size]))
+    return _as_dict(stats, 0, digits)
+
+
+def grouped_stats(
+    table: _Table,
+    by: Union[str, Sequence[str]],
+    values: np.ndarray,
+    digits: int = 2
+) -> Dict[Union[str, Tuple[str, ...]], Dict[str, float]]:
+    """
+    Kennzahlen von `values` pro Gruppe, in einem Durchgang.
+
+    Args:
+        table: ExperimentTable oder TaskTable
+        by: Spaltenname ("model", "agent", "runner", "task") oder Liste davon
+        values: Messwert-Spalte derselben Tabelle (z.B. table.duration)
+
+    Returns:
+        {Gruppe: {count, mean, std_dev, min, max, median, p90, p95, p99, iqr}},
+        Gruppe als String bzw. Tupel bei mehreren Spalten
+    """
+    keys = [by] if isinstance(by, str) else list(by)
+    values = np.asarray(values, dtype=np.float64)
+    if values.size == 0:
+        return {}
+    columns = [table.columns[key] for key in keys]
+
+    # Sortieren nach Gruppe, innerhalb der Gruppe nach Wert (letzter lexsort-Schluessel zuerst)
+    order = np.lexsort([values] + [col.codes for col in reversed(columns)])
+    group_codes = np.stack([col.codes[order] for col in columns])
+    sorted_values = values[order]
+
+    boundaries = np.flatnonzero(np.any(group_codes[:, 1:] != group_codes[:, :-1], axis=0)) + 1
+    starts = np.concatenate(([0], boundaries))
+    counts = np.diff(np.concatenate((starts, [values.size])))
+    stats = _segment_stats(sorted_values, starts, counts)
+
+    result = {}
+    for i, start in enumerate(starts):
+        labels = tuple(col.categories[group_codes[k, start]] for k, col in enumerate(columns))
+        result[labels[0] if len(labels) == 1 else labels] = _as_dict(stats, i, digits)
+    return result
+
+
+def group_rates(table: _Table, by: str) -> Dict[str, Dict[str, float]]:
+    """Anzahl und Erfolgsrate pro Gruppe (ueber alle Zeilen, auch fehlgeschlagene)."""
+    column = table.columns[by]
+    if not len(column.codes):
+        return {}
+    counts = np.bincount(column.codes, minlength=len(column.categories))
+    successes = np.bincount(column.codes, weights=table.success.astype(np.float64), minlength=len(column.categories))
+    return {
+        category: {"count": int(counts[i]), "success_rate": float(successes[i] / counts[i])}
+        for i, category in enumerate(column.categories) if counts[i]
+    }
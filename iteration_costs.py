@@ -0,0 +1,142 @@
+"""
+Kosten der Test-Fix-Schleife
+============================
+Iterative Experimente (iterative_crew.py) wiederholen "Tests ausfuehren ->
+Developer-Fix", bis alle Tests gruen sind oder max_iterations erreicht ist.
+Pro Experiment wird daraus eine Serie pro Iteration gebildet:
+
+- Fix-Dauer und -Tokens (Task-Datensaetze der Rolle "Developer-Fix")
+- Testlauf-Dauer (Sandbox-Laeufe mit label "tests")
+
+und pro Developer-Modell zusammengefasst: Iterationen bis gruen, Zeit pro
+Fix-Iteration, Kosten der gesamten Testschleife und was jede weitere
+Iteration im Mittel kostet.
+"""
+
+from typing import Any, Dict, List, Sequence
+
+from experiment_table import describe
+
+
+FIX_ROLE = "Developer-Fix"
+TEST_LABEL = "tests"
+
+
+def iteration_series(experiment: Any) -> Dict[str, Any]:
+    """
+    Serien pro Iteration eines Experiments.
+
+    Returns:
+        {"iterations", "green", "fix_seconds", "fix_tokens", "test_seconds"};
+        Listen-Index 0 entspricht Iteration 1
+    """
+    fixes = [t for t in experiment.task_metrics if t.get("agent_role") == FIX_ROLE]
+    tests = [e for e in experiment.executions if e.get("label") == TEST_LABEL]
+
+    test_seconds: Dict[int, float] = {}
+    for run in tests:
+        iteration = run.get("iteration") or 0
+        test_seconds[iteration] = test_seconds.get(iteration, 0.0) + (run.get("wall_seconds") or 0.0)
+
+    # Nach dem letzten Testlauf gibt es keinen Fix mehr (gruen oder max_iterations)
+    iterations = max([len(fixes) + 1] + list(test_seconds))
+    return {
+        "iterations": iterations,
+        "green": bool(experiment.success),
+        "fix_seconds": [t.get("duration_seconds") or 0.0 for t in fixes],
+        "fix_tokens": [t.get("estimated_output_tokens") or 0 for t in fixes],
+        "test_seconds": [test_seconds.get(i, 0.0) for i in range(1, iterations + 1)] if test_seconds else [],
+    }
+
+
+def is_iterative(experiment: Any) -> bool:
+    return experiment.runner_type == "iterative" or any(
+        t.get("agent_role") == FIX_ROLE for t in experiment.task_metrics
+    )
+
+
+def iteration_costs(experiments: Sequence[Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Kennzahlen der Testschleife pro Developer-Modell.
+
+    Returns:
+        {Modell: {"experiments", "green_rate", "iterations_to_green", "fix_seconds",
+                  "test_seconds", "loop_seconds", "loop_share", "per_iteration"}}
+        (Kennzahlen als describe()-Dicts, per_iteration als Liste pro Iteration)
+    """
+    by_model: Dict[str, List[Any]] = {}
+    for exp in experiments:
+        if is_iterative(exp):
+            by_model.setdefault(exp.models.get("developer", "unknown"), []).append(exp)
+
+    result = {}
+    for model, group in sorted(by_model.items()):
+        series = [iteration_series(exp) for exp in group]
+        loop_seconds = [sum(s["fix_seconds"]) + sum(s["test_seconds"]) for s in series]
+        loop_share = [
+            loop / exp.total_duration for loop, exp in zip(loop_seconds, group) if exp.total_duration > 0
+        ]
+
+        per_iteration = []
+        for index in range(max(s["iterations"] for s in series)):
+            fixes = [s["fix_seconds"][index] for s in series if index < len(s["fix_seconds"])]
+            tokens = [s["fix_tokens"][index] for s in series if index < len(s["fix_tokens"])]
+            tests = [s["test_seconds"][index] for s in series if index < len(s["test_seconds"])]
+            per_iteration.append({
+                "iteration": index + 1,
+                "reached": sum(1 for s in series if s["iterations"] > index),
+                "fix_seconds": describe(fixes),
+                "fix_tokens": describe(tokens),
+                "test_seconds": describe(tests),
+            })
+
+        result[model] = {
+            "experiments": len(group),
+            "green_rate": sum(s["green"] for s in series) / len(series),
+            "iterations_to_green": describe([s["iterations"] for s in series if s["green"]]),
+            "fix_seconds": describe([value for s in series for value in s["fix_seconds"]]),
+            "test_seconds": describe([value for s in series for value in s["test_seconds"]]),
+            "loop_seconds": describe(loop_seconds),
+            "loop_share": describe(loop_share, digits=3),
+            "per_iteration": per_iteration,
+        }
+    return result
+
+
+def _mean(stats: Dict[str, float], digits: int = 1) -> str:
+    return f"{stats['mean']:.{digits}f}" if "mean" in stats else "-"
+
+
+def format_iteration_tables(costs: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Markdown-Zeilen: Uebersicht pro Modell und Serie pro Iteration."""
+    lines = [
+        "| Modell | n | Gruen | Iterationen bis gruen (Median) | s pro Fix | s pro Testlauf "
+        "| Testschleife (s) | Anteil an Gesamtdauer | Kosten je weitere Iteration (s) |",
+        "|--------|---|-------|--------------------------------|-----------|----------------"
+        "|------------------|-----------------------|---------------------------------|",
+    ]
+    for model, c in costs.items():
+        to_green = c["iterations_to_green"]
+        median = f"{to_green['median']:g}" if "median" in to_green else "-"
+        share = f"{c['loop_share']['mean'] * 100:.0f}%" if "mean" in c["loop_share"] else "-"
+        extra = c["fix_seconds"].get("mean", 0.0) + c["test_seconds"].get("mean", 0.0)
+        lines.append(
+            f"| {model} | {c['experiments']} | {c['green_rate'] * 100:.0f}% | {median} "
+            f"| {_mean(c['fix_seconds'])} | {_mean(c['test_seconds'], 2)} | {_mean(c['loop_seconds'])} "
+            f"| {share} | {extra:.1f} |"
+        )
+
+    for model, c in costs.items():
+        lines += [
+            "",
+            f"**{model}** - pro Iteration:",
+            "",
+            "| Iteration | erreicht | Testlauf (s) | Fix (s) | Fix-Tokens |",
+            "|-----------|----------|--------------|---------|------------|",
+        ]
+        for row in c["per_iteration"]:
+            lines.append(
+                f"| {row['iteration']} | {row['reached']} | {_mean(row['test_seconds'], 2)} "
+                f"| {_mean(row['fix_seconds'])} | {_mean(row['fix_tokens'], 0)} |"
+            )
+    return lines
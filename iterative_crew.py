@@ -11,21 +11,25 @@ Dies implementiert einen iterativen Entwicklungsprozess wie in echten Teams.
 
 import os
 import sys
-import subprocess
 import tempfile
 import re
+import json
 import time
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 
 from crewai import Agent, Task, Crew, LLM
 
 from experiment_runner import (
-    ExperimentConfig, ExperimentTracer, ExperimentResult,
-    get_system_info, estimate_tokens
+    ExperimentConfig, ExperimentTracer, ExperimentResult, ExecutionMetrics,
+    get_system_info, estimate_tokens, dashboard_active
 )
+from sandbox import SandboxLimits, run_sandboxed
+from compile_cache import COMPILE_CACHE
+from static_gate import run_static_gate, format_diagnostics
+from code_extraction import extract_python_code, requested_class_names
 
 
 # ============================================================
@@ -33,7 +37,12 @@ from experiment_runner import (
 # ============================================================
 
 MAX_ITERATIONS = 3  # Maximale Anzahl an Korrektur-Durchlaeufen
-PYTHON_EXECUTABLE = sys.executable
+
+# Headless tkinter fuer GUI-Code (siehe sandbox_shims/tkinter)
+HEADLESS_SHIM_DIR = Path(__file__).resolve().parent / "sandbox_shims"
+GUI_VIRTUAL_SECONDS = 120      # Virtuelle Spielzeit pro Smoke-Test
+GUI_KEY_INTERVAL_MS = 400      # Abstand der eingespielten Tastendruecke
+GUI_SMOKE_KEYS = ["Up", "Right", "Down", "Left", "space", "w", "d", "s", "a", "Return"]
 
 
 @dataclass
@@ -43,97 +52,192 @@ class TestResult:
     output: str
     errors: List[str]
     iteration: int
+    metrics: Optional[ExecutionMetrics] = None
 
 
 # ============================================================
 # CODE EXECUTION & TESTING
 # ============================================================
 
-def extract_python_code(text: str) -> str:
-    """Extrahiert Python-Code aus LLM-Output."""
-    # Suche nach ```python ... ``` Bloecken
-    code_blocks = re.findall(r'```python\n(.*?)```', text, re.DOTALL)
-    if code_blocks:
-        return '\n\n'.join(code_blocks)
-    
-    # Suche nach ``` ... ``` Bloecken
-    code_blocks = re.findall(r'```\n(.*?)```', text, re.DOTALL)
-    if code_blocks:
-        return '\n\n'.join(code_blocks)
-    
-    # Wenn Text mit import beginnt, ist es wahrscheinlich Code
-    if text.strip().startswith('import') or text.strip().startswith('from'):
-        return text
-    
-    return text
+def check_syntax(code: str) -> Tuple[bool, str]:
+    """Prueft Python-Syntax ohne Ausfuehrung (Ergebnis landet im Compile-Cache)."""
+    entry = COMPILE_CACHE.compile(code)
+    return entry.syntax_ok, entry.message
+
+
+def default_key_script(virtual_seconds: float = GUI_VIRTUAL_SECONDS,
+                       interval_ms: int = GUI_KEY_INTERVAL_MS) -> str:
+    """Erzeugt ein Tasten-Skript, das GUI_SMOKE_KEYS reihum einspielt."""
+    events = []
+    at_ms = interval_ms
+    i = 0
+    while at_ms < virtual_seconds * 1000:
+        events.append(f"{at_ms}:{GUI_SMOKE_KEYS[i % len(GUI_SMOKE_KEYS)]}")
+        at_ms += interval_ms
+        i += 1
+    return ",".join(events)
+
+
+def headless_env(report_file: Optional[str] = None,
+                 virtual_seconds: float = GUI_VIRTUAL_SECONDS,
+                 key_script: str = "") -> Dict[str, str]:
+    """Umgebung fuer Subprozesse, in der `import tkinter` den Headless-Shim laedt."""
+    env = os.environ.copy()
+    python_path = env.get("PYTHONPATH", "")
+    env["PYTHONPATH"] = str(HEADLESS_SHIM_DIR) + (os.pathsep + python_path if python_path else "")
+    env["HEADLESS_TK_VIRTUAL_SECONDS"] = str(virtual_seconds)
+    env["HEADLESS_TK_KEYS"] = key_script
+    if report_file:
+        env["HEADLESS_TK_REPORT"] = report_file
+    else:
+        env.pop("HEADLESS_TK_REPORT", None)
+    return env
 
 
-def check_syntax(code: str) -> Tuple[bool, str]:
-    """Prueft Python-Syntax ohne Ausfuehrung."""
+def is_gui_code(code: str) -> bool:
+    """GUI-Code erkennt man an tkinter-Import oder mainloop()."""
+    return 'mainloop()' in code or re.search(r'^\s*(import|from)\s+tkinter', code, re.MULTILINE) is not None
+
+
+def run_gui_smoke_test(
+    code: str,
+    timeout: int = 30,
+    virtual_seconds: float = GUI_VIRTUAL_SECONDS,
+    key_script: Optional[str] = None,
+    limits: Optional[SandboxLimits] = None
+) -> Tuple[bool, str, Dict]:
+    """
+    Fuehrt GUI-Code mit dem Headless-tkinter aus.
+    mainloop() spult eine virtuelle Uhr vor, Tastendruecke werden eingespielt.
+
+    Returns:
+        (erfolg, nachricht, report) - report enthaelt Callbacks, Frame-Kosten,
+        Canvas-Operationen, Fehler aus Callbacks und unter "execution" die
+        ExecutionMetrics des Sandbox-Laufs.
+    """
+    if key_script is None:
+        key_script = default_key_script(virtual_seconds)
+
+    report: Dict = {}
+    entry = COMPILE_CACHE.materialize(code)
+    if not entry.syntax_ok:
+        return False, entry.message, report
+
+    fd, report_file = tempfile.mkstemp(suffix=".report.json")
+    os.close(fd)
     try:
-        compile(code, '<string>', 'exec')
-        return True, "Syntax OK"
-    except SyntaxError as e:
-        return False, f"Syntaxfehler Zeile {e.lineno}: {e.msg}"
+        run = run_sandboxed(
+            entry.source_path,
+            timeout=timeout,
+            label="gui_smoke",
+            limits=limits,
+            env=headless_env(report_file, virtual_seconds, key_script),
+            cwd=tempfile.gettempdir(),
+            bytecode_path=entry.bytecode_path
+        )
 
+        if os.path.getsize(report_file):
+            with open(report_file, "r", encoding="utf-8") as rf:
+                report = json.load(rf)
+        report["execution"] = run.metrics
 
-def run_code_with_timeout(code: str, timeout: int = 5) -> Tuple[bool, str]:
+        if run.timed_out:
+            return False, f"Timeout nach {timeout} Sekunden - GUI blockiert (Endlosschleife ausserhalb von after()?)", report
+
+        if run.returncode != 0:
+            return False, run.stderr or _limit_message(run.metrics), report
+
+        if report.get("callback_errors"):
+            errors = report.get("first_errors") or []
+            return False, (
+                f"{report['callback_errors']} Fehler in GUI-Callbacks:\n" + "\n".join(errors)
+            ), report
+
+        frame_cost = report.get("frame_cost", {})
+        return True, (
+            f"GUI headless ausgefuehrt: {report.get('callbacks_run', 0)} Callbacks, "
+            f"{report.get('keys_sent', 0)} Tasten, "
+            f"{report.get('virtual_seconds', 0)}s virtuell in {report.get('wall_seconds', 0)}s "
+            f"(Frame avg {frame_cost.get('mean_ms', 0)} ms, p95 {frame_cost.get('p95_ms', 0)} ms, "
+            f"Ende: {report.get('stop_reason', '?')})"
+        ), report
+
+    except Exception as e:
+        return False, str(e), report
+    finally:
+        try:
+            os.unlink(report_file)
+        except:
+            pass
+
+
+def _limit_message(metrics: ExecutionMetrics) -> str:
+    messages = {
+        "memory": "Speicher-Limit der Sandbox ueberschritten",
+        "cpu": "CPU-Zeit-Limit der Sandbox ueberschritten - moeglicherweise Endlosschleife",
+        "processes": "Prozess-Limit der Sandbox ueberschritten",
+    }
+    return messages.get(metrics.limit_exceeded, "Unbekannter Fehler")
+
+
+def execute_code(
+    code: str,
+    timeout: int = 5,
+    limits: Optional[SandboxLimits] = None
+) -> Tuple[bool, str, Optional[ExecutionMetrics]]:
     """
-    Fuehrt Python-Code aus und prueft auf Fehler.
-    Timeout verhindert Endlosschleifen.
+    Fuehrt Python-Code in der Sandbox aus.
+
+    Returns:
+        (erfolg, nachricht, metriken)
     """
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, encoding='utf-8') as f:
-        # Fuer GUI-Code: Fuege Auto-Close hinzu
-        modified_code = code
-        if 'mainloop()' in code:
-            # Ersetze mainloop mit timeout-version
-            modified_code = code.replace(
-                'mainloop()', 
-                'after(100, lambda: root.destroy() if hasattr(root, "destroy") else None); mainloop()'
-            )
-            # Oder einfacher: Nicht ausfuehren fuer GUI
-            return True, "GUI-Code erkannt - Syntax OK, Ausfuehrung uebersprungen"
-        
-        f.write(modified_code)
-        temp_file = f.name
+    if is_gui_code(code):
+        success, message, report = run_gui_smoke_test(code, timeout=max(timeout, 30), limits=limits)
+        return success, message, report.get("execution")
+
+    entry = COMPILE_CACHE.materialize(code)
+    if not entry.syntax_ok:
+        return False, entry.message, None
     
     try:
-        result = subprocess.run(
-            [PYTHON_EXECUTABLE, temp_file],
-            capture_output=True,
-            text=True,
+        run = run_sandboxed(
+            entry.source_path,
             timeout=timeout,
-            cwd=os.path.dirname(temp_file)
+            label="run",
+            limits=limits,
+            cwd=tempfile.gettempdir(),
+            bytecode_path=entry.bytecode_path
         )
         
-        if result.returncode == 0:
-            return True, result.stdout or "Code erfolgreich ausgefuehrt"
+        if run.timed_out:
+            return False, f"Timeout nach {timeout} Sekunden - moeglicherweise Endlosschleife", run.metrics
+        if run.returncode == 0:
+            return True, run.stdout or "Code erfolgreich ausgefuehrt", run.metrics
         else:
-            return False, result.stderr or "Unbekannter Fehler"
+            return False, run.stderr or _limit_message(run.metrics), run.metrics
             
-    except subprocess.TimeoutExpired:
-        return False, f"Timeout nach {timeout} Sekunden - moeglicherweise Endlosschleife"
     except Exception as e:
-        return False, str(e)
-    finally:
-        try:
-            os.unlink(temp_file)
-        except:
-            pass
+        return False, str(e), None
+
 
+def run_code_with_timeout(code: str, timeout: int = 5) -> Tuple[bool, str]:
+    """
+    Fuehrt Python-Code aus und prueft auf Fehler.
+    Timeout und Sandbox-Limits verhindern Endlosschleifen und ausufernden Speicher.
+    GUI-Code laeuft headless (siehe run_gui_smoke_test).
+    """
+    success, message, _ = execute_code(code, timeout)
+    return success, message
 
-def run_tests(code: str, test_code: str) -> TestResult:
+
+def run_tests(code: str, test_code: str, limits: Optional[SandboxLimits] = None) -> TestResult:
     """
     Fuehrt Tests gegen den Code aus.
-    Kombiniert Code + Tests in einer Datei und fuehrt aus.
+    Code und Test-Modul sind getrennte Compile-Einheiten (Cache-Treffer fuer
+    den Code aus check_syntax und fuer unveraenderte Tests); die Sandbox
+    fuehrt beide nacheinander im selben Modul aus.
     """
-    # Kombiniere Code und Tests
-    combined = f'''
-# ===== HAUPTCODE =====
-{code}
-
-# ===== TESTS =====
-import unittest
+    test_module = f'''import unittest
 
 {test_code}
 
@@ -142,22 +246,42 @@ if __name__ == "__main__":
     unittest.main(verbosity=2, exit=False)
 '''
     
-    with tempfile.NamedTemporaryFile(mode='w', suffix='_test.py', delete=False, encoding='utf-8') as f:
-        f.write(combined)
-        temp_file = f.name
+    entry = COMPILE_CACHE.materialize(code)
+    if not entry.syntax_ok:
+        return TestResult(success=False, output=entry.message, errors=[entry.message], iteration=0)
+    test_entry = COMPILE_CACHE.materialize(test_module)
+    if not test_entry.syntax_ok:
+        message = f"Tests: {test_entry.message}"
+        return TestResult(success=False, output=message, errors=[message], iteration=0)
     
     try:
-        result = subprocess.run(
-            [PYTHON_EXECUTABLE, temp_file],
-            capture_output=True,
-            text=True,
-            timeout=30
+        # Headless-tkinter: ein mainloop() im Hauptcode blockiert die Tests nicht
+        run = run_sandboxed(
+            entry.source_path,
+            timeout=30,
+            label="tests",
+            limits=limits,
+            env=headless_env(virtual_seconds=1),
+            bytecode_path=entry.bytecode_path,
+            then=[(test_entry.source_path, test_entry.bytecode_path)]
         )
         
-        output = result.stdout + result.stderr
+        if run.timed_out:
+            return TestResult(
+                success=False, 
+                output="", 
+                errors=["Timeout - Tests brauchen zu lange"],
+                iteration=0,
+                metrics=run.metrics
+            )
+        
+        output = run.stdout + run.stderr
         
         # Parse Test-Ergebnisse
         errors = []
+        if run.metrics.limit_exceeded:
+            errors.append(_limit_message(run.metrics))
+        
         if 'FAIL' in output:
             # Extrahiere Fehler-Details
             fail_matches = re.findall(r'FAIL: (\w+).*?\n(.*?)(?=\n-{70}|\Z)', output, re.DOTALL)
@@ -170,17 +294,10 @@ if __name__ == "__main__":
                 errors.append(f"Test {test_name} Error: {details[:200]}")
         
         if 'OK' in output and not errors:
-            return TestResult(success=True, output=output, errors=[], iteration=0)
+            return TestResult(success=True, output=output, errors=[], iteration=0, metrics=run.metrics)
         else:
-            return TestResult(success=False, output=output, errors=errors, iteration=0)
+            return TestResult(success=False, output=output, errors=errors, iteration=0, metrics=run.metrics)
             
-    except subprocess.TimeoutExpired:
-        return TestResult(
-            success=False, 
-            output="", 
-            errors=["Timeout - Tests brauchen zu lange"],
-            iteration=0
-        )
     except Exception as e:
         return TestResult(
             success=False,
@@ -188,11 +305,16 @@ if __name__ == "__main__":
             errors=[str(e)],
             iteration=0
         )
-    finally:
-        try:
-            os.unlink(temp_file)
-        except:
-            pass
+
+
+def count_tests(output: str) -> Tuple[int, int]:
+    """(ausgefuehrt, bestanden) aus der unittest-Ausgabe."""
+    ran = re.search(r'Ran (\d+) tests?', output)
+    if not ran:
+        return 0, 0
+    total = int(ran.group(1))
+    failed = sum(int(n) for n in re.findall(r'(?:failures|errors)=(\d+)', output))
+    return total, max(total - failed, 0)
 
 
 # ============================================================
@@ -204,7 +326,8 @@ def run_iterative_experiment(
     task_description: str = None,
     models: Dict[str, str] = None,
     output_base_dir: str = "projekte",
-    max_iterations: int = MAX_ITERATIONS
+    max_iterations: int = MAX_ITERATIONS,
+    sandbox_limits: Optional[SandboxLimits] = None
 ) -> ExperimentResult:
     """
     Fuehrt ein iteratives Experiment mit Test-Feedback-Loop durch.
@@ -215,6 +338,9 @@ def run_iterative_experiment(
     3. Tests werden ausgefuehrt
     4. Bei Fehlern: Feedback an Developer
     5. Wiederhole bis Tests gruen oder max_iterations erreicht
+    
+    sandbox_limits begrenzt Speicher, CPU-Zeit und Prozesse der Testlaeufe
+    (default: sandbox.DEFAULT_LIMITS).
     """
     
     if models is None:
@@ -249,11 +375,14 @@ Beginne mit: class Pokemon:
         experiment_id=experiment_id,
         experiment_name=experiment_name,
         task_description=task_description,
-        models=models
+        models=models,
+        runner_type="iterative"
     )
     
     tracer = ExperimentTracer(experiment_id, str(output_dir))
     tracer.start_experiment()
+    verbose = not dashboard_active()
+    compile_stats_start = COMPILE_CACHE.stats()   # prozessweiter Cache: nur dieses Experiment loggen
     
     print("=" * 70)
     print(f"🔄 ITERATIVE EXPERIMENT: {experiment_name}")
@@ -291,7 +420,7 @@ REGELN:
 3. KEINE Platzhalter, KEIN 'pass', KEIN '...'
 4. Code muss syntaktisch korrekt sein""",
             llm=developer_llm,
-            verbose=True
+            verbose=verbose
         )
         
         dev_task = Task(
@@ -301,10 +430,12 @@ REGELN:
         )
         
         tracer.start_task("Developer", "initial_code", models['developer'])
-        dev_crew = Crew(agents=[developer], tasks=[dev_task], verbose=True)
-        dev_result = dev_crew.kickoff()
+        dev_crew = Crew(agents=[developer], tasks=[dev_task], verbose=verbose)
+        with tracer.span("llm_call", model=models['developer'], agent="Developer") as llm_span:
+            dev_result = dev_crew.kickoff()
+            llm_span.set("tokens.output", estimate_tokens(str(dev_result)))
         
-        current_code = extract_python_code(str(dev_result))
+        current_code = extract_python_code(str(dev_result), requested_class_names(task_description))
         tracer.end_task(task_description, current_code, success=True)
         
         print(f"\n✅ Initial Code: {len(current_code)} Zeichen")
@@ -334,7 +465,7 @@ KRITISCHE REGELN:
 5. Die Klassen sind DIREKT im selben Modul - KEIN from X import Y noetig
 6. Beginne direkt mit: class Test...(unittest.TestCase):""",
             llm=tester_llm,
-            verbose=True
+            verbose=verbose
         )
         
         # Analysiere welche Klassen und Methoden im Code sind
@@ -364,10 +495,12 @@ Beginne direkt mit: class Test{class_names[0] if class_names else 'Code'}(unitte
         )
         
         tracer.start_task("Tester", "write_tests", models['tester'])
-        test_crew = Crew(agents=[tester], tasks=[test_task], verbose=True)
-        test_result = test_crew.kickoff()
+        test_crew = Crew(agents=[tester], tasks=[test_task], verbose=verbose)
+        with tracer.span("llm_call", model=models['tester'], agent="Tester") as llm_span:
+            test_result = test_crew.kickoff()
+            llm_span.set("tokens.output", estimate_tokens(str(test_result)))
         
-        test_code = extract_python_code(str(test_result))
+        test_code = extract_python_code(str(test_result), [f"Test{class_names[0]}"] if class_names else [])
         tracer.end_task("Test generation", test_code, success=True)
         
         print(f"\n✅ Tests generiert: {len(test_code)} Zeichen")
@@ -380,43 +513,82 @@ Beginne direkt mit: class Test{class_names[0] if class_names else 'Code'}(unitte
         
         while iteration < max_iterations and not all_tests_pass:
             iteration += 1
-            print(f"\n{'='*50}")
-            print(f"🔄 Iteration {iteration}/{max_iterations}: Running Tests")
-            print(f"{'='*50}")
+            with tracer.span("iteration", iteration=iteration) as iteration_span:
+                print(f"\n{'='*50}")
+                print(f"🔄 Iteration {iteration}/{max_iterations}: Running Tests")
+                print(f"{'='*50}")
             
-            # Tests ausfuehren
-            test_result = run_tests(current_code, test_code)
-            test_result.iteration = iteration
+                # Statischer Pre-Gate: sicher scheiternde Laeufe ohne Subprozess erkennen
+                needs_run, diagnostics, gate_ms = run_static_gate(current_code, test_code)
+                tracer.log("static_gate", {
+                    "iteration": iteration,
+                    "duration_ms": gate_ms,
+                    "errors": sum(1 for d in diagnostics if d.severity == "error"),
+                    "warnings": sum(1 for d in diagnostics if d.severity == "warning"),
+                    "subprocess_skipped": not needs_run,
+                    "diagnostics": [asdict(d) for d in diagnostics[:20]]
+                })
             
-            if test_result.success:
-                print(f"\n✅ Alle Tests bestanden!")
-                all_tests_pass = True
-                break
-            else:
-                print(f"\n❌ Tests fehlgeschlagen:")
-                for error in test_result.errors[:3]:  # Max 3 Fehler zeigen
-                    print(f"   - {error[:100]}...")
+                if needs_run:
+                    # Tests ausfuehren
+                    with tracer.span("test_run", iteration=iteration, model=models['developer']) as run_span:
+                        test_result = run_tests(current_code, test_code, limits=sandbox_limits)
+                        run_span.set("success", test_result.success)
+                        if test_result.metrics:
+                            run_span.set_many({
+                                "wall_seconds": test_result.metrics.wall_seconds,
+                                "peak_rss_mb": test_result.metrics.peak_rss_mb,
+                                "limit_exceeded": test_result.metrics.limit_exceeded
+                            })
+                    if test_result.metrics:
+                        tracer.record_execution(test_result.metrics, model=models['developer'], iteration=iteration)
+                    if diagnostics and not test_result.success:
+                        test_result.output += "\n\nSTATISCHE ANALYSE:\n" + format_diagnostics(diagnostics)
+                else:
+                    print(f"\n🔍 Statische Analyse ({gate_ms:.1f} ms): Tests wuerden sicher fehlschlagen - Subprozess uebersprungen")
+                    test_result = TestResult(
+                        success=False,
+                        output="STATISCHE ANALYSE:\n" + format_diagnostics(diagnostics),
+                        errors=[d.format() for d in diagnostics if d.severity == "error"],
+                        iteration=iteration
+                    )
+                test_result.iteration = iteration
+                if needs_run:
+                    ran, passed = count_tests(test_result.output)
+                    tracer.log("test_results", {
+                        "iteration": iteration, "ran": ran, "passed": passed, "success": test_result.success
+                    })
+                iteration_span.set_many({"success": test_result.success, "subprocess_skipped": not needs_run})
+            
+                if test_result.success:
+                    print(f"\n✅ Alle Tests bestanden!")
+                    all_tests_pass = True
+                    break
+                else:
+                    print(f"\n❌ Tests fehlgeschlagen:")
+                    for error in test_result.errors[:3]:  # Max 3 Fehler zeigen
+                        print(f"   - {error[:100]}...")
                 
-                if iteration < max_iterations:
-                    # Feedback an Developer
-                    print(f"\n🔧 Sende Feedback an Developer...")
+                    if iteration < max_iterations:
+                        # Feedback an Developer
+                        print(f"\n🔧 Sende Feedback an Developer...")
                     
-                    fix_developer = Agent(
-                        role="Python Developer (Bugfix)",
-                        goal="Behebe die gemeldeten Fehler im Code",
-                        backstory="""Du bist ein erfahrener Python-Entwickler der Bugs fixt.
+                        fix_developer = Agent(
+                            role="Python Developer (Bugfix)",
+                            goal="Behebe die gemeldeten Fehler im Code",
+                            backstory="""Du bist ein erfahrener Python-Entwickler der Bugs fixt.
 REGELN:
 1. Analysiere die Fehlermeldungen genau
 2. Gib den KOMPLETTEN korrigierten Code aus
 3. Keine Erklaerungen, NUR Code
 4. Behalte alle funktionierenden Teile bei""",
-                        llm=developer_llm,
-                        verbose=True
-                    )
+                            llm=developer_llm,
+                            verbose=verbose
+                        )
                     
-                    error_summary = "\n".join(test_result.errors[:5])
-                    fix_task = Task(
-                        description=f"""Der folgende Code hat Test-Fehler:
+                        error_summary = "\n".join(test_result.errors[:5])
+                        fix_task = Task(
+                            description=f"""Der folgende Code hat Test-Fehler:
 
 ```python
 {current_code}
@@ -431,23 +603,27 @@ TEST OUTPUT:
 Korrigiere den Code so dass alle Tests bestehen.
 Gib den KOMPLETTEN korrigierten Code aus.
 Beginne mit: class Pokemon:""",
-                        expected_output="Korrigierter Python-Code",
-                        agent=fix_developer
-                    )
+                            expected_output="Korrigierter Python-Code",
+                            agent=fix_developer
+                        )
                     
-                    tracer.start_task("Developer-Fix", f"iteration_{iteration}", models['developer'])
-                    fix_crew = Crew(agents=[fix_developer], tasks=[fix_task], verbose=True)
-                    fix_result = fix_crew.kickoff()
+                        tracer.start_task("Developer-Fix", f"iteration_{iteration}", models['developer'], iteration=iteration)
+                        fix_crew = Crew(agents=[fix_developer], tasks=[fix_task], verbose=verbose)
+                        with tracer.span("llm_call", model=models['developer'], agent="Developer-Fix") as llm_span:
+                            fix_result = fix_crew.kickoff()
+                            llm_span.set("tokens.output", estimate_tokens(str(fix_result)))
                     
-                    current_code = extract_python_code(str(fix_result))
-                    tracer.end_task(error_summary, current_code, success=True)
+                        current_code = extract_python_code(str(fix_result), class_names)
+                        tracer.end_task(error_summary, current_code, success=True)
                     
-                    print(f"\n✅ Code korrigiert: {len(current_code)} Zeichen")
+                        print(f"\n✅ Code korrigiert: {len(current_code)} Zeichen")
         
         # =========================================
         # PHASE 4: Finalize
         # =========================================
         experiment_end = time.time()
+        tracer.log("iterations_summary", {"iterations": iteration, "success": all_tests_pass})
+        tracer.log("compile_cache", COMPILE_CACHE.stats(since=compile_stats_start))
         tracer.end_experiment()
         
         # Speichere finalen Code
@@ -0,0 +1,252 @@
+"""
+Live-Dashboard im Terminal
+==========================
+Zeigt waehrend eines Laufs (mit `rich`):
+
+- Zustand jedes Agents (wartet / laeuft / fertig / Fehler), Modell und Task
+- Tokens/s des letzten Tasks pro Agent
+- Laufzeit des aktuellen Tasks gegen den historischen Median (p50) fuer
+  dieselbe Task/Modell-Kombination aus dem Experiment-Katalog
+- Bestandene Tests pro Iteration
+- Fortschritt und ETA fuer Batch-Laeufe
+
+Gespeist wird es aus den Trace-Events (Listener). Der Listener legt Events nur
+in eine Queue - Auswertung und Rendern passieren im Render-Thread, der
+Hot-Path des Tracers wird nicht langsamer.
+
+Aktivieren:
+    EXPERIMENT_DASHBOARD=1 python iterative_crew.py
+"""
+
+import time
+import queue
+import sqlite3
+import statistics
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from rich.console import Group
+    from rich.live import Live
+    from rich.table import Table
+    from rich.text import Text
+    RICH_AVAILABLE = True
+except ImportError:
+    RICH_AVAILABLE = False
+
+
+STATE_STYLES = {
+    "laeuft": "bold yellow",
+    "fertig": "green",
+    "Fehler": "bold red",
+}
+
+
+def _format_seconds(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+def load_historical_p50(catalog_path: Optional[Path]) -> Dict[Tuple[str, str], float]:
+    """Median der Task-Dauer pro (task_name, model) aus dem Katalog."""
+    if catalog_path is None or not Path(catalog_path).exists():
+        return {}
+    durations: Dict[Tuple[str, str], List[float]] = defaultdict(list)
+    try:
+        conn = sqlite3.connect(f"file:{catalog_path}?mode=ro", uri=True)
+        try:
+            for task_name, model, duration in conn.execute(
+                "SELECT task_name, model, duration_seconds FROM agent_metrics WHERE duration_seconds IS NOT NULL"
+            ):
+                durations[(task_name, model)].append(duration)
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return {}
+    return {key: statistics.median(values) for key, values in durations.items()}
+
+
+class LiveDashboard:
+    """Trace-Listener mit rich-Live-Ansicht in einem eigenen Thread."""
+
+    def __init__(self, catalog_path: Optional[Path] = None, refresh_per_second: float = 4):
+        if not RICH_AVAILABLE:
+            raise ImportError("rich ist nicht installiert (pip install rich)")
+        self.refresh_per_second = refresh_per_second
+        self.historical_p50 = load_historical_p50(catalog_path)
+
+        self._events: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Zustand - nur im Render-Thread veraendert
+        self.experiment_id = ""
+        self.experiment_started: Optional[float] = None
+        self.agents: Dict[str, Dict[str, Any]] = {}
+        self.iterations: Dict[int, Dict[str, Any]] = {}
+        self.batch_queued: Optional[int] = None
+        self.batch_completed = 0
+        self.experiment_durations: List[float] = []
+        self.last_event = ""
+
+    # --------------------------------------------------------
+    # Listener (Hot-Path: nur einreihen)
+    # --------------------------------------------------------
+
+    def __call__(self, entry: Dict[str, Any]):
+        self._events.put((time.time(), entry))
+
+    # --------------------------------------------------------
+    # Steuerung
+    # --------------------------------------------------------
+
+    def start(self) -> "LiveDashboard":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="LiveDashboard", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _run(self):
+        with Live(self.render(), refresh_per_second=self.refresh_per_second,
+                  redirect_stdout=True, redirect_stderr=True, transient=False) as live:
+            while not self._stop.is_set():
+                self._drain()
+                live.update(self.render())
+                self._stop.wait(1.0 / self.refresh_per_second)
+            self._drain()
+            live.update(self.render())
+
+    # --------------------------------------------------------
+    # Events -> Zustand
+    # --------------------------------------------------------
+
+    def _drain(self):
+        while True:
+            try:
+                received, entry = self._events.get_nowait()
+            except queue.Empty:
+                return
+            self.apply(entry, received)
+
+    def apply(self, entry: Dict[str, Any], received: Optional[float] = None):
+        received = received or time.time()
+        event = entry.get("event", "")
+        data = entry.get("data") or {}
+        self.last_event = event
+
+        if event == "experiment_started":
+            self.experiment_id = entry.get("experiment_id", "")
+            self.experiment_started = received
+            self.agents.clear()
+            self.iterations.clear()
+        elif event == "experiment_ended":
+            if self.experiment_started is not None:
+                self.experiment_durations.append(received - self.experiment_started)
+            self.experiment_started = None
+        elif event == "task_started":
+            agent = self.agents.setdefault(data.get("agent", "?"), {"tokens_per_second": None})
+            agent.update({
+                "state": "laeuft",
+                "model": data.get("model", ""),
+                "task": data.get("task", ""),
+                "started": received,
+                "duration": None,
+            })
+        elif event == "task_completed":
+            agent = self.agents.setdefault(data.get("agent", "?"), {"model": data.get("model", "")})
+            duration = data.get("duration_seconds") or 0.0
+            tokens = data.get("estimated_tokens") or 0
+            agent.update({
+                "state": "fertig" if data.get("success", True) else "Fehler",
+                "task": data.get("task", agent.get("task", "")),
+                "duration": duration,
+                "tokens_per_second": tokens / duration if duration > 0 else None,
+            })
+        elif event == "test_results":
+            self.iterations[data.get("iteration", 0)] = data
+        elif event == "static_gate" and data.get("subprocess_skipped"):
+            self.iterations[data.get("iteration", 0)] = {
+                "iteration": data.get("iteration", 0), "ran": 0, "passed": 0, "skipped": True
+            }
+        elif event == "batch_progress":
+            self.batch_queued = data.get("queued")
+            self.batch_completed = data.get("completed", 0)
+
+    # --------------------------------------------------------
+    # Rendern
+    # --------------------------------------------------------
+
+    def batch_eta(self, now: Optional[float] = None) -> Optional[float]:
+        """Restzeit: wartende Experimente * mittlere Dauer + Rest des laufenden."""
+        if self.batch_queued is None or not self.experiment_durations:
+            return None
+        now = now or time.time()
+        mean_duration = statistics.mean(self.experiment_durations)
+        eta = self.batch_queued * mean_duration
+        if self.experiment_started is not None:
+            eta += max(0.0, mean_duration - (now - self.experiment_started))
+        return eta
+
+    def render(self):
+        now = time.time()
+        header = Text()
+        header.append("Experiment: ", style="bold")
+        header.append(self.experiment_id or "-")
+        if self.experiment_started is not None:
+            header.append(f"   Laufzeit: {_format_seconds(now - self.experiment_started)}")
+        if self.batch_queued is not None:
+            total = self.batch_completed + self.batch_queued + (1 if self.experiment_started else 0)
+            header.append(f"   Batch: {self.batch_completed}/{total}")
+            header.append(f"   ETA: {_format_seconds(self.batch_eta(now))}")
+
+        agents = Table(title="Agents", expand=True)
+        for column in ("Agent", "Status", "Modell", "Task", "Zeit", "p50 (hist.)", "Tokens/s"):
+            agents.add_column(column)
+        for name, agent in self.agents.items():
+            state = agent.get("state", "wartet")
+            if state == "laeuft":
+                elapsed = now - agent["started"]
+            else:
+                elapsed = agent.get("duration")
+            p50 = self.historical_p50.get((agent.get("task"), agent.get("model")))
+            elapsed_text = Text(_format_seconds(elapsed))
+            if p50 is not None and elapsed is not None and elapsed > p50 * 1.5:
+                elapsed_text.stylize("bold red")
+            tokens_per_second = agent.get("tokens_per_second")
+            agents.add_row(
+                name,
+                Text(state, style=STATE_STYLES.get(state, "")),
+                agent.get("model", ""),
+                agent.get("task", ""),
+                elapsed_text,
+                _format_seconds(p50),
+                f"{tokens_per_second:.1f}" if tokens_per_second else "-",
+            )
+
+        renderables = [header, agents]
+        if self.iterations:
+            tests = Table(title="Tests pro Iteration")
+            for column in ("Iteration", "Bestanden", "Gesamt", "Hinweis"):
+                tests.add_column(column)
+            for iteration in sorted(self.iterations):
+                row = self.iterations[iteration]
+                note = "statisch verworfen" if row.get("skipped") else ""
+                tests.add_row(str(iteration), str(row.get("passed", 0)), str(row.get("ran", 0)), note)
+            renderables.append(tests)
+
+        renderables.append(Text(f"Letztes Event: {self.last_event}", style="dim"))
+        return Group(*renderables)
@@ -0,0 +1,314 @@
+"""
+Prometheus-Metriken fuer laufende Experimente
+=============================================
+Optionaler HTTP-Endpoint `/metrics` im Runner-Prozess, damit ein lokales
+Prometheus (oder ein Skript mit curl) Durchsatz und Haenger waehrend langer
+Batches sieht. Gespeist wird er aus den Trace-Events des ExperimentTracer
+(Listener-Hook), nicht aus eigenen Messpunkten in den Runnern.
+
+Ohne Zusatzpaket: kleine Registry (Counter, Gauge, Histogram) und das
+Textformat 0.0.4 sind hier selbst implementiert.
+
+Aktivieren:
+    EXPERIMENT_METRICS_PORT=9464 python iterative_crew.py
+    curl -s localhost:9464/metrics
+"""
+
+import math
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+DEFAULT_PORT = 9464
+PREFIX = "agent_"
+
+DURATION_BUCKETS = (0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+SANDBOX_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+ITERATION_BUCKETS = (1, 2, 3, 4, 5, 7, 10)
+
+
+# ============================================================
+# REGISTRY
+# ============================================================
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Tuple[str, str] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = PREFIX + name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], Any] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: Labels {sorted(labels)} statt {list(self.labelnames)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key, value) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name + "_total", documentation, labelnames)
+
+    def inc(self, amount: float = 1, **labels):
+        if amount < 0:
+            raise ValueError("Counter koennen nur steigen")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DURATION_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["counts"][i] += 1
+                    break
+            state["sum"] += value
+            state["count"] += 1
+
+    def _render_sample(self, key, state) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, state["counts"]):
+            cumulative += count
+            labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(state['sum'])}")
+        lines.append(f"{self.name}_count{labels} {state['count']}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# ============================================================
+# TRACE-EVENTS -> METRIKEN
+# ============================================================
+
+class TraceMetrics:
+    """Listener fuer ExperimentTracer-Events; fuellt die Metriken."""
+
+    def __init__(self, registry: Optional[Registry] = None):
+        self.registry = registry or Registry()
+        r = self.registry
+        self.experiments_started = r.register(Counter("experiments_started", "Gestartete Experimente"))
+        self.experiments_finished = r.register(Counter("experiments_finished", "Beendete Experimente"))
+        self.tasks_in_flight = r.register(Gauge("tasks_in_flight", "Laufende Agent-Tasks", ["agent"]))
+        self.tasks = r.register(Counter("tasks", "Abgeschlossene Agent-Tasks", ["agent", "model", "success"]))
+        self.task_duration = r.register(Histogram(
+            "task_duration_seconds", "Dauer der Agent-Tasks", ["agent", "model"]))
+        self.output_tokens = r.register(Counter("output_tokens", "Geschaetzte Output-Tokens", ["model"]))
+        self.tokens_per_second = r.register(Gauge(
+            "tokens_per_second", "Output-Tokens/s des letzten Tasks", ["model"]))
+        self.llm_call_duration = r.register(Histogram(
+            "llm_call_duration_seconds", "Latenz der LLM-Aufrufe (crew.kickoff)", ["model"]))
+        self.test_runs = r.register(Counter("test_runs", "Sandbox-Laeufe", ["label", "outcome"]))
+        self.sandbox_wall = r.register(Histogram(
+            "sandbox_wall_seconds", "Wall-Time der Sandbox-Laeufe", ["label"], buckets=SANDBOX_BUCKETS))
+        self.gate_skips = r.register(Counter(
+            "static_gate_skips", "Testlaeufe, die die statische Analyse erspart hat"))
+        self.iterations_to_green = r.register(Histogram(
+            "iterations_to_green", "Iterationen bis alle Tests bestehen", [], buckets=ITERATION_BUCKETS))
+        self.cache_hit_ratio = r.register(Gauge("compile_cache_hit_ratio", "Trefferquote des Compile-Caches"))
+        self.queue_depth = r.register(Gauge("batch_queue_depth", "Noch wartende Experimente im Batch"))
+        self.cpu_percent = r.register(Gauge("system_cpu_percent", "System-CPU beim letzten Task-Event"))
+        self.ram_percent = r.register(Gauge("system_ram_percent", "System-RAM beim letzten Task-Event"))
+        self.last_event = r.register(Gauge(
+            "last_event_timestamp_seconds", "Unix-Zeit des letzten Trace-Events (Haenger erkennen)"))
+
+        self._lock = threading.Lock()
+        self._task_models: Dict[Tuple[str, str], str] = {}
+
+    def __call__(self, entry: Dict[str, Any]):
+        event = entry.get("event")
+        data = entry.get("data") or {}
+        self.last_event.set(time.time())
+        handler = getattr(self, f"_on_{event}", None)
+        if handler is not None:
+            handler(entry.get("experiment_id", ""), data)
+
+    def _on_experiment_started(self, experiment_id: str, data: Dict[str, Any]):
+        self.experiments_started.inc()
+
+    def _on_experiment_ended(self, experiment_id: str, data: Dict[str, Any]):
+        self.experiments_finished.inc()
+
+    def _on_task_started(self, experiment_id: str, data: Dict[str, Any]):
+        agent = data.get("agent", "")
+        with self._lock:
+            self._task_models[(experiment_id, agent)] = data.get("model", "")
+        self.tasks_in_flight.inc(agent=agent)
+        self._resources(data)
+
+    def _on_task_completed(self, experiment_id: str, data: Dict[str, Any]):
+        agent = data.get("agent", "")
+        with self._lock:
+            started_model = self._task_models.pop((experiment_id, agent), "")
+        model = data.get("model") or started_model
+        duration = data.get("duration_seconds") or 0.0
+        tokens = data.get("estimated_tokens") or 0
+        self.tasks_in_flight.dec(agent=agent)
+        self.tasks.inc(agent=agent, model=model, success=str(bool(data.get("success"))).lower())
+        self.task_duration.observe(duration, agent=agent, model=model)
+        self.output_tokens.inc(tokens, model=model)
+        if duration > 0:
+            self.tokens_per_second.set(round(tokens / duration, 2), model=model)
+        self._resources(data)
+
+    def _on_span_completed(self, experiment_id: str, data: Dict[str, Any]):
+        if data.get("name") == "llm_call":
+            attributes = data.get("attributes") or {}
+            model = attributes.get("model") or attributes.get("models") or ""
+            self.llm_call_duration.observe(data.get("duration_seconds", 0.0), model=model)
+
+    def _on_code_executed(self, experiment_id: str, data: Dict[str, Any]):
+        label = data.get("label", "")
+        if data.get("limit_exceeded"):
+            outcome = f"limit_{data['limit_exceeded']}"
+        else:
+            outcome = "passed" if data.get("returncode") == 0 else "failed"
+        self.test_runs.inc(label=label, outcome=outcome)
+        self.sandbox_wall.observe(data.get("wall_seconds", 0.0), label=label)
+
+    def _on_static_gate(self, experiment_id: str, data: Dict[str, Any]):
+        if data.get("subprocess_skipped"):
+            self.gate_skips.inc()
+
+    def _on_iterations_summary(self, experiment_id: str, data: Dict[str, Any]):
+        if data.get("success"):
+            self.iterations_to_green.observe(data.get("iterations", 0))
+
+    def _on_compile_cache(self, experiment_id: str, data: Dict[str, Any]):
+        self.cache_hit_ratio.set(data.get("hit_rate", 0.0))
+
+    def _on_batch_progress(self, experiment_id: str, data: Dict[str, Any]):
+        self.queue_depth.set(data.get("queued", 0))
+
+    def _resources(self, data: Dict[str, Any]):
+        resources = data.get("resources") or {}
+        if "cpu_percent" in resources:
+            self.cpu_percent.set(resources["cpu_percent"])
+        if "ram_percent" in resources:
+            self.ram_percent.set(resources["ram_percent"])
+
+
+# ============================================================
+# HTTP-SERVER
+# ============================================================
+
+class MetricsServer:
+    """HTTP-Server mit `/metrics` in einem Daemon-Thread."""
+
+    def __init__(self, registry: Registry, host: str = "127.0.0.1", port: int = DEFAULT_PORT):
+        self.registry = registry
+        registry_ref = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404, "Nur /metrics")
+                    return
+                body = registry_ref.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # keine Zeile pro Scrape auf der Konsole
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self.host, self.port = self._httpd.server_address[:2]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="MetricsServer", daemon=True)
+
+    def start(self) -> "MetricsServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/metrics"
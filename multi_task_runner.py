@@ -10,7 +10,6 @@ Dies loest das Context-Window-Problem bei grossen Projekten.
 import os
 import json
 import time
-import re
 from datetime import datetime
 from pathlib import Path
 from dataclasses import dataclass, asdict
@@ -21,8 +20,9 @@ from crewai import Agent, Task, Crew, LLM
 # Import aus experiment_runner
 from experiment_runner import (
     ExperimentConfig, ExperimentTracer, ExperimentResult,
-    get_system_info, estimate_tokens
+    get_system_info, estimate_tokens, dashboard_active
 )
+from code_extraction import extract_python_code, requested_class_names
 
 
 # ============================================================
@@ -514,11 +514,13 @@ def run_multi_task_experiment(
         experiment_id=experiment_id,
         experiment_name=experiment_name,
         task_description="Pokemon RPG mit Multi-Task Architektur",
-        models=models
+        models=models,
+        runner_type="multi_task"
     )
     
     tracer = ExperimentTracer(experiment_id, str(output_dir))
     tracer.start_experiment()
+    verbose = not dashboard_active()
     
     print("=" * 70)
     print(f"🔬 MULTI-TASK EXPERIMENT: {experiment_name}")
@@ -555,7 +557,7 @@ KRITISCHE REGELN:
 4. Code muss syntaktisch korrekt sein
 5. Beginne direkt mit 'import' Statements""",
                 llm=developer_llm,
-                verbose=True
+                verbose=verbose
             )
             
             task = Task(
@@ -567,7 +569,7 @@ KRITISCHE REGELN:
             crew = Crew(
                 agents=[developer],
                 tasks=[task],
-                verbose=True
+                verbose=verbose
             )
             
             # Task tracken
@@ -578,7 +580,9 @@ KRITISCHE REGELN:
             )
             
             task_start = time.time()
-            result = crew.kickoff()
+            with tracer.span("llm_call", model=models['developer'], agent="Developer") as llm_span:
+                result = crew.kickoff()
+                llm_span.set("tokens.output", estimate_tokens(str(result)))
             task_duration = time.time() - task_start
             
             output_text = str(result)
@@ -644,23 +648,10 @@ KRITISCHE REGELN:
 def combine_code_parts(code_outputs: Dict[str, str], output_dir: Path) -> str:
     """
     Kombiniert die einzelnen Code-Teile zu einer ausfuehrbaren Datei.
-    """
     
-    # Extrahiere Python-Code aus den Outputs
-    def extract_code(text: str) -> str:
-        """Extrahiert Code aus Markdown-Bloecken oder Text."""
-        # Suche nach ```python ... ``` Bloecken
-        code_blocks = re.findall(r'```python\n(.*?)```', text, re.DOTALL)
-        if code_blocks:
-            return '\n\n'.join(code_blocks)
-        
-        # Suche nach ``` ... ``` Bloecken
-        code_blocks = re.findall(r'```\n(.*?)```', text, re.DOTALL)
-        if code_blocks:
-            return '\n\n'.join(code_blocks)
-        
-        # Nehme den gesamten Text
-        return text
+    Pro Teil wird der beste Code-Block gewaehlt (siehe code_extraction.py),
+    bewertet auch danach, ob er die Klassen aus der Task-Vorlage enthaelt.
+    """
     
     parts = []
     
@@ -681,7 +672,8 @@ from typing import List, Optional
     
     # Fuege jeden Code-Teil hinzu
     for task_id in sorted(code_outputs.keys()):
-        code = extract_code(code_outputs[task_id])
+        template = POKEMON_TASKS.get(task_id, {}).get("description", "")
+        code = extract_python_code(code_outputs[task_id], requested_class_names(template))
         parts.append(f"\n# {'='*60}")
         parts.append(f"# {task_id.upper()}")
         parts.append(f"# {'='*60}\n")
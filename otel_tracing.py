@@ -0,0 +1,279 @@
+"""
+OpenTelemetry-Spans fuer Experimente
+====================================
+Verschachtelte Spans fuer Jaeger/Tempo/Zipkin statt nur flacher JSONL-Events:
+
+    experiment
+    ├── task                (agent, model, tokens, success)
+    │   └── llm_call        (model, tokens.output)
+    └── iteration           (iteration, success, subprocess_skipped)
+        ├── test_run        (iteration, success, peak_rss_mb)
+        └── task            (Developer-Fix)
+            └── llm_call
+
+Exporter:
+    "file"    - eine JSON-Zeile pro Span in `<experiment_id>_otel.jsonl`
+    "otlp"    - OTLP/HTTP (Endpoint aus OTEL_EXPORTER_OTLP_ENDPOINT oder Parameter)
+    "console" - Ausgabe auf stdout
+    "memory"  - im Speicher (finished_spans()), fuer self_check()
+
+`python otel_tracing.py` spielt ein kleines iteratives Experiment durch den
+ExperimentTracer und prueft Eltern-Kette und Attribute der Spans.
+
+OpenTelemetry ist optional: ohne installiertes SDK (oder ohne Exporter) sind
+alle Aufrufe No-ops. Jeder Tracer bekommt einen eigenen TracerProvider - der
+globale Provider (den z.B. CrewAI fuer seine Telemetrie setzt) bleibt unberuehrt.
+"""
+
+import os
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    from opentelemetry import trace as otel_trace
+    from opentelemetry.context import Context
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        ConsoleSpanExporter,
+        SimpleSpanProcessor,
+    )
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+    OTEL_AVAILABLE = True
+except ImportError:
+    OTEL_AVAILABLE = False
+
+
+EXPORTERS = ("file", "otlp", "console", "memory")
+SERVICE_NAME = "agent-experiments"
+
+# Exporter per Umgebung waehlen, ohne Code zu aendern
+ENV_EXPORTER = "EXPERIMENT_OTEL_EXPORTER"
+
+
+def _attribute_value(value: Any):
+    """OTel erlaubt nur str/bool/int/float (und Listen davon)."""
+    if isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, (list, tuple)) and all(isinstance(v, (str, bool, int, float)) for v in value):
+        return list(value)
+    return str(value)
+
+
+class SpanHandle:
+    """Duenne Huelle um einen OTel-Span (bzw. No-op ohne OTel)."""
+
+    def __init__(self, span=None):
+        self._span = span
+        self._success: Optional[bool] = None
+
+    def set(self, key: str, value: Any):
+        if key == "success":
+            self._success = value
+        if self._span is not None and value is not None:
+            self._span.set_attribute(key, _attribute_value(value))
+
+    def set_many(self, attributes: Dict[str, Any]):
+        for key, value in attributes.items():
+            self.set(key, value)
+
+    def record_error(self, error: BaseException):
+        if self._span is not None:
+            self._span.record_exception(error)
+            self._span.set_status(otel_trace.Status(otel_trace.StatusCode.ERROR, str(error)))
+
+    def end(self, success: Optional[bool] = None):
+        """Beendet den Span; success=False (oder vorher gesetzt) markiert ihn als Fehler."""
+        if self._span is None:
+            return
+        if success is None:
+            success = self._success
+        if success is not None:
+            self._span.set_attribute("success", success)
+            if not success:
+                self._span.set_status(otel_trace.Status(otel_trace.StatusCode.ERROR))
+        self._span.end()
+        self._span = None
+
+    @property
+    def recording(self) -> bool:
+        return self._span is not None
+
+
+class SpanRecorder:
+    """Erzeugt verschachtelte Spans und exportiert sie ueber einen eigenen Provider."""
+
+    def __init__(
+        self,
+        exporter: Optional[str] = None,
+        file_path: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        resource_attributes: Optional[Dict[str, Any]] = None
+    ):
+        exporter = exporter if exporter is not None else os.environ.get(ENV_EXPORTER) or None
+        self.exporter = exporter
+        self.file_path = file_path
+        self._provider = None
+        self._tracer = None
+        self._file = None
+        self._memory = None
+
+        if exporter is None:
+            return
+        if exporter not in EXPORTERS:
+            raise ValueError(f"Unbekannter OTel-Exporter '{exporter}', erlaubt: {', '.join(EXPORTERS)}")
+        if not OTEL_AVAILABLE:
+            print("⚠️ OpenTelemetry nicht installiert (pip install opentelemetry-sdk) - Spans deaktiviert")
+            return
+
+        attributes = {"service.name": SERVICE_NAME}
+        attributes.update({k: _attribute_value(v) for k, v in (resource_attributes or {}).items()})
+        self._provider = TracerProvider(resource=Resource.create(attributes))
+
+        if exporter == "file":
+            if not file_path:
+                raise ValueError("OTel-Exporter 'file' braucht file_path")
+            self._file = open(file_path, "a", encoding="utf-8")
+            span_exporter = ConsoleSpanExporter(
+                out=self._file,
+                formatter=lambda span: span.to_json(indent=None) + "\n"
+            )
+            self._provider.add_span_processor(SimpleSpanProcessor(span_exporter))
+        elif exporter == "otlp":
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            span_exporter = OTLPSpanExporter(endpoint=endpoint) if endpoint else OTLPSpanExporter()
+            self._provider.add_span_processor(BatchSpanProcessor(span_exporter))
+        elif exporter == "memory":
+            self._memory = InMemorySpanExporter()
+            self._provider.add_span_processor(SimpleSpanProcessor(self._memory))
+        else:
+            self._provider.add_span_processor(SimpleSpanProcessor(ConsoleSpanExporter()))
+
+        self._tracer = self._provider.get_tracer(__name__)
+
+    @property
+    def enabled(self) -> bool:
+        return self._tracer is not None
+
+    def start(self, name: str, parent: Optional[SpanHandle] = None, **attributes) -> SpanHandle:
+        """Startet einen Span als Kind von `parent` (ohne parent: neuer Root-Span)."""
+        if self._tracer is None:
+            return SpanHandle()
+        context = Context()   # nicht an fremde aktive Spans (z.B. CrewAI) haengen
+        if parent is not None and parent.recording:
+            context = otel_trace.set_span_in_context(parent._span)
+        span = self._tracer.start_span(name, context=context)
+        handle = SpanHandle(span)
+        handle.set_many(attributes)
+        return handle
+
+    @contextmanager
+    def span(self, name: str, parent: Optional[SpanHandle] = None, **attributes) -> Iterator[SpanHandle]:
+        """Span fuer einen Block; Exceptions werden am Span vermerkt und weitergereicht."""
+        handle = self.start(name, parent, **attributes)
+        try:
+            yield handle
+        except BaseException as e:
+            handle.record_error(e)
+            raise
+        finally:
+            handle.end()
+
+    def finished_spans(self) -> List[Any]:
+        """Beendete Spans (nur Exporter "memory", sonst leer)."""
+        return list(self._memory.get_finished_spans()) if self._memory is not None else []
+
+    def shutdown(self):
+        """Exportiert ausstehende Spans und schliesst den Exporter."""
+        if self._provider is not None:
+            self._provider.shutdown()
+            self._provider = None
+            self._tracer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# ============================================================
+# SELBSTTEST
+# ============================================================
+
+def self_check() -> List[str]:
+    """
+    Spielt ein iteratives Experiment (Task mit llm_call, eine Iteration mit
+    test_run und Fix-Task) durch den ExperimentTracer mit In-Memory-Exporter.
+
+    Returns:
+        Liste der Abweichungen (leer = Span-Baum und Attribute stimmen)
+    """
+    import tempfile
+    from experiment_runner import ExperimentTracer
+
+    if not OTEL_AVAILABLE:
+        return ["OpenTelemetry nicht installiert"]
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        tracer = ExperimentTracer("otel_check", output_dir, resource_interval=0,
+                                  otel_exporter="memory", catalog_path=os.path.join(output_dir, "catalog.sqlite"))
+        tracer.start_experiment()
+        tracer.start_task("Developer", "initial_code", "model-a")
+        with tracer.span("llm_call", model="model-a", agent="Developer") as llm_span:
+            llm_span.set("tokens.output", 42)
+        tracer.end_task("input", "output", success=True)
+        with tracer.span("iteration", iteration=1) as iteration_span:
+            with tracer.span("test_run", iteration=1, model="model-a") as run_span:
+                run_span.set("success", False)
+            tracer.start_task("Developer-Fix", "iteration_1", "model-a", iteration=1)
+            with tracer.span("llm_call", model="model-a", agent="Developer-Fix") as llm_span:
+                llm_span.set("tokens.output", 7)
+            tracer.end_task("errors", "fixed", success=True)
+            iteration_span.set("success", False)
+        tracer.end_experiment()
+        spans = tracer.spans.finished_spans()
+        tracer.close()
+
+    problems = []
+    by_id = {span.context.span_id: span for span in spans}
+
+    def chain(span) -> List[str]:
+        names = [span.name]
+        while span.parent is not None:
+            span = by_id.get(span.parent.span_id)
+            if span is None:
+                names.append("?")
+                break
+            names.append(span.name)
+        return list(reversed(names))
+
+    def expect(name: str, path: List[str], attributes: Dict[str, Any], count: int = 1):
+        matching = [span for span in spans if span.name == name and chain(span) == path]
+        if len(matching) != count:
+            found = [" -> ".join(chain(span)) for span in spans if span.name == name]
+            problems.append(f"{' -> '.join(path)}: {count} erwartet, gefunden: {found}")
+            return
+        for span in matching:
+            for key, value in attributes.items():
+                if span.attributes.get(key) != value:
+                    problems.append(f"{' -> '.join(path)}: {key}={span.attributes.get(key)!r}, erwartet {value!r}")
+
+    expect("experiment", ["experiment"], {"experiment_id": "otel_check", "tasks": 2})
+    expect("task", ["experiment", "task"], {"agent": "Developer", "model": "model-a", "success": True})
+    expect("llm_call", ["experiment", "task", "llm_call"], {"model": "model-a", "tokens.output": 42})
+    expect("iteration", ["experiment", "iteration"], {"iteration": 1, "success": False})
+    expect("test_run", ["experiment", "iteration", "test_run"], {"iteration": 1, "success": False})
+    expect("task", ["experiment", "iteration", "task"], {"agent": "Developer-Fix", "iteration": 1})
+    expect("llm_call", ["experiment", "iteration", "task", "llm_call"], {"agent": "Developer-Fix", "tokens.output": 7})
+    if len(spans) != 7:
+        problems.append(f"7 Spans erwartet, gefunden: {len(spans)}")
+    return problems
+
+
+if __name__ == "__main__":
+    import sys
+    found = self_check()
+    for problem in found:
+        print(f"❌ {problem}")
+    if not found:
+        print("✅ Span-Baum experiment -> iteration -> task/llm_call/test_run und Attribute korrekt")
+    sys.exit(1 if found else 0)
@@ -0,0 +1,164 @@
+"""
+Pareto-Front: Erfolgsrate vs. Dauer vs. Tokens
+==============================================
+Fuer die Wahl der Standard-Modelle zaehlt der Kompromiss aus Erfolgsrate
+(hoeher ist besser), Wall-Clock-Zeit und Tokens (niedriger ist besser).
+Pro Aufgabe (experiment_name) wird jede Konfiguration (Runner + Modelle
+der Rollen) zu einem Punkt zusammengefasst:
+
+- Erfolgsrate ueber alle Laeufe
+- Median der Gesamtdauer und der Tokens (auch fehlgeschlagene Laeufe
+  kosten Zeit und Tokens)
+
+Eine Konfiguration ist dominiert, wenn eine andere in allen drei Achsen
+mindestens gleich gut und in einer echt besser ist. Dominierte
+Konfigurationen muessen nicht weiter laufen.
+"""
+
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from experiment_table import Column, ExperimentTable, group_rates, grouped_stats
+
+
+def configuration_label(experiment: Any) -> str:
+    """Kurzname einer Konfiguration, z.B. "codellama:13b + mistral:7b (iterative)"."""
+    models = experiment.models or {}
+    developer = models.get("developer", "unknown")
+    others = sorted({model for role, model in models.items() if role != "developer" and model != developer})
+    label = " + ".join([developer] + others)
+    return f"{label} ({experiment.runner_type or 'unknown'})"
+
+
+def dominated_by(success: np.ndarray, duration: np.ndarray, tokens: np.ndarray) -> np.ndarray:
+    """
+    Fuer jeden Punkt der Index eines dominierenden Punkts, sonst -1.
+
+    Paarweiser Vergleich per Broadcasting (n Konfigurationen pro Aufgabe
+    sind klein); bei mehreren Kandidaten wird der mit der hoechsten
+    Erfolgsrate, dann der kuerzesten Dauer genannt.
+    """
+    # better_eq[i, j]: j ist in allen Achsen mindestens so gut wie i
+    better_eq = (
+        (success[None, :] >= success[:, None])
+        & (duration[None, :] <= duration[:, None])
+        & (tokens[None, :] <= tokens[:, None])
+    )
+    strictly = (
+        (success[None, :] > success[:, None])
+        | (duration[None, :] < duration[:, None])
+        | (tokens[None, :] < tokens[:, None])
+    )
+    dominates = better_eq & strictly
+
+    result = np.full(success.size, -1, dtype=np.int64)
+    preference = np.lexsort((duration, -success))
+    for i in np.flatnonzero(dominates.any(axis=1)):
+        candidates = preference[dominates[i, preference]]
+        result[i] = candidates[0]
+    return result
+
+
+def pareto_by_task(experiments: Sequence[Any], min_runs: int = 1) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Pareto-Analyse pro Aufgabe.
+
+    Args:
+        min_runs: Konfigurationen mit weniger Laeufen werden ignoriert
+
+    Returns:
+        {Aufgabe: [{"config", "runs", "success_rate", "duration", "tokens",
+                    "pareto", "dominated_by"}, ...]}, Pareto-optimale zuerst
+    """
+    table = ExperimentTable(experiments)
+    if not len(table):
+        return {}
+    table.columns["config"] = Column.of([configuration_label(e) for e in experiments])
+
+    result: Dict[str, List[Dict[str, Any]]] = {}
+    names = table.columns["name"]
+    for code, task in enumerate(names.categories):
+        subset = table.where(names.codes == code)
+        rates = group_rates(subset, "config")
+        durations = grouped_stats(subset, "config", subset.duration)
+        tokens = grouped_stats(subset, "config", subset.tokens)
+        configs = [config for config, rate in rates.items() if rate["count"] >= min_runs]
+        if not configs:
+            continue
+
+        success = np.asarray([rates[c]["success_rate"] for c in configs])
+        duration = np.asarray([durations[c]["median"] for c in configs])
+        token_counts = np.asarray([tokens[c]["median"] for c in configs])
+        dominator = dominated_by(success, duration, token_counts)
+
+        rows = [
+            {
+                "config": config,
+                "runs": rates[config]["count"],
+                "success_rate": float(success[i]),
+                "duration": float(duration[i]),
+                "tokens": float(token_counts[i]),
+                "pareto": bool(dominator[i] < 0),
+                "dominated_by": configs[dominator[i]] if dominator[i] >= 0 else None,
+            }
+            for i, config in enumerate(configs)
+        ]
+        rows.sort(key=lambda row: (not row["pareto"], -row["success_rate"], row["duration"]))
+        result[task] = rows
+    return result
+
+
+def format_pareto_table(rows: List[Dict[str, Any]]) -> List[str]:
+    """Markdown-Zeilen einer Aufgabe; dominierte Konfigurationen sind markiert."""
+    lines = [
+        "| Konfiguration | n | Erfolgsrate | Dauer (Median, s) | Tokens (Median) | Status |",
+        "|---------------|---|-------------|-------------------|-----------------|--------|",
+    ]
+    for row in rows:
+        status = "✅ Pareto-optimal" if row["pareto"] else f"❌ dominiert von {row['dominated_by']}"
+        lines.append(
+            f"| {row['config']} | {row['runs']} | {row['success_rate'] * 100:.0f}% "
+            f"| {row['duration']:.1f} | {row['tokens']:.0f} | {status} |"
+        )
+    return lines
+
+
+def render_pareto_chart(task: str, rows: List[Dict[str, Any]], output_file: str, dpi: int = 150) -> bool:
+    """
+    Streudiagramm Dauer vs. Tokens, Farbe = Erfolgsrate; die Pareto-Front
+    ist hervorgehoben, dominierte Punkte sind grau markiert.
+    Gibt False zurueck, wenn matplotlib fehlt.
+    """
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        return False
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    front = [row for row in rows if row["pareto"]]
+    dominated = [row for row in rows if not row["pareto"]]
+
+    if dominated:
+        ax.scatter([r["duration"] for r in dominated], [r["tokens"] for r in dominated],
+                   marker="x", color="grey", label="dominiert")
+    scatter = ax.scatter([r["duration"] for r in front], [r["tokens"] for r in front],
+                         c=[r["success_rate"] * 100 for r in front], cmap="RdYlGn", vmin=0, vmax=100,
+                         s=120, edgecolors="black", label="Pareto-optimal")
+    fig.colorbar(scatter, ax=ax, label="Erfolgsrate (%)")
+    for row in rows:
+        ax.annotate(f"{row['config']}\n{row['success_rate'] * 100:.0f}%", (row["duration"], row["tokens"]),
+                    textcoords="offset points", xytext=(6, 6), fontsize=7,
+                    color="black" if row["pareto"] else "grey")
+
+    ax.margins(0.2)
+    ax.set_xlabel("Dauer (Median, Sekunden)")
+    ax.set_ylabel("Tokens (Median)")
+    ax.set_title(f"Pareto-Front: {task}")
+    ax.legend(loc="best")
+    fig.tight_layout()
+    fig.savefig(output_file, dpi=dpi)
+    plt.close(fig)
+    return True
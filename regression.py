@@ -0,0 +1,197 @@
+"""
+Regressions-Erkennung gegen eine rollierende Baseline
+=====================================================
+Nach Aenderungen an Prompts, CrewAI- oder Ollama-Versionen werden Tasks
+unbemerkt langsamer. Pro (Aufgabe, Developer-Modell, Runner) werden die
+juengsten Laeufe mit den unmittelbar davor liegenden Laeufen verglichen:
+
+    Baseline:  die `baseline` Laeufe vor den juengsten (rollierend)
+    Aktuell:   die `recent` juengsten Laeufe
+
+Verglichen werden Mediane, die Streuung der Baseline wird robust ueber
+die MAD (Median Absolute Deviation, x1.4826 ~ Standardabweichung)
+geschaetzt. Eine Regression liegt vor, wenn sich der Median in die
+schlechte Richtung um mindestens `min_change` (relativ) verschiebt UND
+der robuste z-Wert mindestens `z_threshold` betraegt - so loesen weder
+kleine, aber "signifikante" Verschiebungen bei sehr stabilen Laeufen
+noch grosse Ausreisser bei verrauschten Laeufen einen Alarm aus.
+
+Metriken (nur erfolgreiche Laeufe):
+- duration               Gesamtdauer in Sekunden (hoeher = schlechter)
+- output_tokens_per_s    siehe throughput.derived_metrics (niedriger = schlechter)
+- iterations_to_green    iterative Experimente (hoeher = schlechter)
+
+Dazu ueber alle Laeufe:
+- success_rate           Anteil erfolgreicher Laeufe (niedriger = schlechter).
+                         Sonst faellt ein Batch, in dem jeder Lauf scheitert,
+                         aus allen Vergleichen heraus und der Check ist gruen.
+                         Sind alle juengsten Laeufe gescheitert, obwohl die
+                         Baseline Erfolge hat, ist das immer eine Regression.
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from experiment_table import ExperimentTable
+from iteration_costs import is_iterative, iteration_series
+from throughput import derived_metrics
+
+
+# Richtung: +1 = hoeher ist schlechter, -1 = niedriger ist schlechter
+REGRESSION_METRICS = {
+    "duration": +1,
+    "output_tokens_per_s": -1,
+    "iterations_to_green": +1,
+}
+
+# Faktor MAD -> Standardabweichung bei Normalverteilung
+MAD_SCALE = 1.4826
+
+
+def _metric_columns(experiments: Sequence[Any]) -> Dict[str, np.ndarray]:
+    """Eine Spalte pro Metrik (NaN, wo nicht definiert oder nicht erfolgreich)."""
+    table = ExperimentTable(experiments)
+    success = table.success
+    iterations = np.asarray([
+        iteration_series(e)["iterations"] if is_iterative(e) else np.nan for e in experiments
+    ], dtype=np.float64)
+    columns = {
+        "duration": table.duration,
+        "output_tokens_per_s": derived_metrics(table)["output_tokens_per_s"],
+        "iterations_to_green": iterations,
+    }
+    return {name: np.where(success, values, np.nan) for name, values in columns.items()}
+
+
+def robust_shift(baseline: np.ndarray, recent: np.ndarray) -> Tuple[float, float, float, float]:
+    """
+    Median-Verschiebung der aktuellen Laeufe gegenueber der Baseline.
+
+    Returns:
+        (Baseline-Median, aktueller Median, relative Aenderung, robuster z-Wert)
+    """
+    base_median = float(np.median(baseline))
+    recent_median = float(np.median(recent))
+    spread = MAD_SCALE * float(np.median(np.abs(baseline - base_median)))
+    # Bei identischen Baseline-Werten (MAD = 0) mindestens 1% des Medians als Streuung
+    spread = max(spread, 0.01 * abs(base_median), 1e-9)
+    # Standardfehler des Medians der aktuellen Laeufe ~ 1.2533 * sigma / sqrt(n)
+    z = (recent_median - base_median) / (1.2533 * spread / np.sqrt(recent.size))
+    change = (recent_median - base_median) / base_median if base_median else float("inf")
+    return base_median, recent_median, change, float(z)
+
+
+def success_shift(baseline: np.ndarray, recent: np.ndarray) -> Tuple[float, float, float, float]:
+    """
+    Erfolgsraten-Verschiebung (Arrays aus 0/1).
+
+    Returns:
+        (Baseline-Rate, aktuelle Rate, relative Aenderung, z-Wert); die Streuung
+        nutzt die geglaettete Baseline-Rate (k+1)/(n+2), damit eine Baseline
+        ganz ohne Fehlschlaege nicht durch 0 teilt
+    """
+    base_rate = float(baseline.mean())
+    recent_rate = float(recent.mean())
+    smoothed = (baseline.sum() + 1) / (baseline.size + 2)
+    z = (recent_rate - base_rate) / np.sqrt(smoothed * (1 - smoothed) / recent.size)
+    change = (recent_rate - base_rate) / base_rate if base_rate else 0.0
+    return base_rate, recent_rate, change, float(z)
+
+
+def detect_regressions(
+    experiments: Sequence[Any],
+    recent: int = 3,
+    baseline: int = 20,
+    min_baseline: int = 5,
+    min_change: float = 0.2,
+    z_threshold: float = 3.0
+) -> List[Dict[str, Any]]:
+    """
+    Vergleicht pro (Aufgabe, Modell, Runner) die juengsten Laeufe mit der Baseline.
+
+    Args:
+        recent: Anzahl juengster Laeufe, die geprueft werden
+        baseline: Anzahl Laeufe davor, die die Baseline bilden
+        min_baseline: weniger gueltige Baseline-Werte -> Metrik wird uebersprungen
+                      (success_rate: weniger Baseline-Laeufe)
+        min_change: minimale relative Verschlechterung (0.2 = 20%)
+        z_threshold: minimaler robuster z-Wert
+
+    Returns:
+        [{"task", "model", "runner", "metric", "baseline_n", "recent_n",
+          "baseline_median", "recent_median", "change", "z", "regression"}, ...]
+    """
+    if not experiments:
+        return []
+    columns = _metric_columns(experiments)
+    success = ExperimentTable(experiments).success.astype(np.float64)
+
+    groups: Dict[Tuple[str, str, str], List[int]] = {}
+    for index, exp in enumerate(experiments):
+        key = (exp.experiment_name, exp.models.get("developer", "unknown"), exp.runner_type or "unknown")
+        groups.setdefault(key, []).append(index)
+
+    results = []
+    for (task, model, runner), indices in sorted(groups.items()):
+        indices.sort(key=lambda i: experiments[i].timestamp)
+        recent_idx = np.asarray(indices[-recent:])
+        baseline_idx = np.asarray(indices[-(recent + baseline):-recent] if len(indices) > recent else [], dtype=np.int64)
+        key = {"task": task, "model": model, "runner": runner}
+
+        if baseline_idx.size >= min_baseline:
+            base_success, recent_success = success[baseline_idx], success[recent_idx]
+            base_rate, recent_rate, change, z = success_shift(base_success, recent_success)
+            all_failed = recent_success.sum() == 0 and base_success.sum() > 0
+            results.append({
+                **key,
+                "metric": "success_rate",
+                "baseline_n": int(base_success.size),
+                "recent_n": int(recent_success.size),
+                "baseline_median": base_rate,
+                "recent_median": recent_rate,
+                "change": change,
+                "z": z,
+                "regression": bool(all_failed or (-change >= min_change and -z >= z_threshold)),
+            })
+
+        for metric, direction in REGRESSION_METRICS.items():
+            values = columns[metric]
+            base_values = values[baseline_idx]
+            base_values = base_values[np.isfinite(base_values)]
+            recent_values = values[recent_idx]
+            recent_values = recent_values[np.isfinite(recent_values)]
+            if base_values.size < min_baseline or recent_values.size == 0:
+                continue
+
+            base_median, recent_median, change, z = robust_shift(base_values, recent_values)
+            worse = direction * change >= min_change and direction * z >= z_threshold
+            results.append({
+                **key,
+                "metric": metric,
+                "baseline_n": int(base_values.size),
+                "recent_n": int(recent_values.size),
+                "baseline_median": base_median,
+                "recent_median": recent_median,
+                "change": change,
+                "z": z,
+                "regression": bool(worse),
+            })
+    return results
+
+
+def format_regressions(results: List[Dict[str, Any]], only_regressions: bool = False) -> List[str]:
+    """Markdown-Zeilen der Vergleiche (Regressionen mit ❌ markiert)."""
+    lines = [
+        "| Aufgabe | Modell | Runner | Metrik | Baseline (n) | Aktuell (n) | Aenderung | z | |",
+        "|---------|--------|--------|--------|--------------|-------------|-----------|---|-|",
+    ]
+    for r in results:
+        if only_regressions and not r["regression"]:
+            continue
+        lines.append(
+            f"| {r['task']} | {r['model']} | {r['runner']} | {r['metric']} "
+            f"| {r['baseline_median']:.2f} ({r['baseline_n']}) | {r['recent_median']:.2f} ({r['recent_n']}) "
+            f"| {r['change'] * 100:+.0f}% | {r['z']:+.1f} | {'❌' if r['regression'] else '✅'} |"
+        )
+    return lines
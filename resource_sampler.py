@@ -0,0 +1,397 @@
+"""
+Kontinuierlicher Ressourcen-Sampler
+===================================
+Ein Hintergrund-Thread misst waehrend des ganzen Experiments in festem
+Takt System-CPU, RAM, Swap und Disk-I/O - statt blockierender Snapshots
+nur an Task-Grenzen. So zeigen die Ressourcen-CSVs auch die Spitzen
+waehrend der Generierung.
+
+- Messwerte liegen in einem kompakten Ring-Buffer (array-Spalten)
+- Bevor der Ring ueberlaeuft, gehen die Zeilen an einen Sink (Experiment-Store)
+- Der Tracer markiert Task-Spans (`begin_span`/`end_span`); jede Messung
+  wird mit dem gerade laufenden Agent/Task/Modell annotiert
+- Optional pro Prozessgruppe (`ProcessTracker`): RSS, CPU%, Threads und
+  I/O des Ollama-Servers, des Orchestrators und der Sandbox-Kinder -
+  so ist sichtbar, ob Zeit im Modell oder im generierten Code steckt.
+  I/O ist kumuliert seit Start des Samplers (nicht seit Prozessstart),
+  die Zusammenfassung nennt dazu Peak-RSS von Ollama pro Modell
+"""
+
+import os
+import time
+import threading
+from array import array
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import psutil
+
+
+SYSTEM_FIELDS = [
+    "cpu_percent", "ram_percent", "ram_used_gb", "swap_percent",
+    "disk_read_mb_s", "disk_write_mb_s",
+]
+
+PROCESS_GROUPS = ("orchestrator", "ollama", "sandbox")
+PROCESS_METRICS = ("processes", "rss_mb", "cpu_percent", "threads", "io_read_mb", "io_write_mb")
+PROCESS_FIELDS = [f"{group}_{metric}" for group in PROCESS_GROUPS for metric in PROCESS_METRICS]
+
+OLLAMA_PROCESS_NAMES = ("ollama",)
+SANDBOX_MARKER = "sandbox_worker.py"
+
+
+def _round(name: str, value: float):
+    if name.endswith(("_processes", "_threads")):
+        return int(value)
+    return round(value, 1 if name.endswith("percent") else 3)
+
+
+# ============================================================
+# PRO-PROZESS-ZUORDNUNG
+# ============================================================
+
+class ProcessTracker:
+    """
+    Ordnet Prozesse per PID einer Gruppe zu und summiert ihre Ressourcen:
+
+    - orchestrator: dieser Python-Prozess (und sonstige Kinder)
+    - ollama:       Ollama-Server und seine Runner (per Prozessname gefunden)
+    - sandbox:      Nachfahren mit sandbox_worker.py in der Kommandozeile
+
+    psutil.Process-Objekte werden pro PID gecached, weil cpu_percent() die
+    Differenz zum vorherigen Aufruf am selben Objekt liefert. Ebenso I/O:
+    io_counters() zaehlt seit Prozessstart, gemeldet wird die Differenz zur
+    ersten Messung der PID (Prozesse, die erst nach dem Tracker starten,
+    zaehlen ab 0). I/O beendeter Prozesse bleibt in der Gruppensumme.
+    """
+
+    def __init__(self, rescan_every: int = 10):
+        self.rescan_every = rescan_every
+        self._start_time = time.time()
+        self._io_base: Dict[int, Tuple[int, int]] = {}
+        self._io_last: Dict[int, Tuple[float, float]] = {}    # letzte Differenz pro PID (MB)
+        self._io_done: Dict[str, List[float]] = {group: [0.0, 0.0] for group in PROCESS_GROUPS}
+        self._own = psutil.Process(os.getpid())
+        self._processes: Dict[int, psutil.Process] = {os.getpid(): self._own}
+        self._groups: Dict[int, str] = {os.getpid(): "orchestrator"}
+        self._ollama_pids: set = set()
+        self._samples = 0
+        self.seen_pids: Dict[str, set] = {group: set() for group in PROCESS_GROUPS}
+
+    def _find_ollama(self):
+        pids = set()
+        for proc in psutil.process_iter(["pid", "name"]):
+            name = (proc.info.get("name") or "").lower()
+            if name.startswith(OLLAMA_PROCESS_NAMES):
+                pids.add(proc.info["pid"])
+        self._ollama_pids = pids
+
+    def _classify(self, proc: psutil.Process) -> str:
+        try:
+            if proc.name().lower().startswith(OLLAMA_PROCESS_NAMES):
+                return "ollama"
+            if any(SANDBOX_MARKER in part for part in proc.cmdline()):
+                return "sandbox"
+        except (psutil.Error, OSError):
+            pass
+        return "orchestrator"
+
+    def _current_pids(self) -> Dict[int, str]:
+        if self._samples % self.rescan_every == 0:
+            self._find_ollama()
+        self._samples += 1
+
+        pids = {os.getpid(): "orchestrator"}
+        for pid in self._ollama_pids:
+            pids[pid] = "ollama"
+        try:
+            children = self._own.children(recursive=True)
+        except psutil.Error:
+            children = []
+        for child in children:
+            if child.pid not in self._groups:
+                self._groups[child.pid] = self._classify(child)
+                self._processes[child.pid] = child
+            pids[child.pid] = self._groups[child.pid]
+        return pids
+
+    def sample(self) -> Dict[str, float]:
+        """Summen pro Gruppe als flaches Dict (Schluessel wie PROCESS_FIELDS)."""
+        values = {field: 0.0 for field in PROCESS_FIELDS}
+        alive = self._current_pids()
+        for pid, group in alive.items():
+            proc = self._processes.get(pid)
+            if proc is None:
+                try:
+                    proc = psutil.Process(pid)
+                except psutil.Error:
+                    continue
+                self._processes[pid] = proc
+            try:
+                with proc.oneshot():
+                    rss = proc.memory_info().rss
+                    cpu = proc.cpu_percent(interval=None)
+                    threads = proc.num_threads()
+                    try:
+                        io = proc.io_counters()
+                    except (psutil.AccessDenied, AttributeError, NotImplementedError):
+                        io = None
+                    if io is not None and pid not in self._io_base:
+                        started_later = proc.create_time() >= self._start_time
+                        self._io_base[pid] = (0, 0) if started_later else (io.read_bytes, io.write_bytes)
+            except psutil.Error:
+                continue
+            values[f"{group}_processes"] += 1
+            values[f"{group}_rss_mb"] += rss / (1024 ** 2)
+            values[f"{group}_cpu_percent"] += cpu
+            values[f"{group}_threads"] += threads
+            if io is not None:
+                base = self._io_base[pid]
+                self._io_last[pid] = ((io.read_bytes - base[0]) / (1024 ** 2),
+                                      (io.write_bytes - base[1]) / (1024 ** 2))
+            self.seen_pids[group].add(pid)
+
+        # Beendete Prozesse vergessen, ihr I/O bleibt in der Gruppensumme
+        for pid in list(self._processes):
+            if pid not in alive:
+                group = self._groups.get(pid, "orchestrator")
+                read, write = self._io_last.pop(pid, (0.0, 0.0))
+                self._io_done[group][0] += read
+                self._io_done[group][1] += write
+                self._io_base.pop(pid, None)
+                self._processes.pop(pid, None)
+                self._groups.pop(pid, None)
+
+        for group in PROCESS_GROUPS:
+            values[f"{group}_io_read_mb"] = self._io_done[group][0]
+            values[f"{group}_io_write_mb"] = self._io_done[group][1]
+        for pid, (read, write) in self._io_last.items():
+            group = alive.get(pid)
+            if group is not None:
+                values[f"{group}_io_read_mb"] += read
+                values[f"{group}_io_write_mb"] += write
+        return values
+
+
+# ============================================================
+# SAMPLER
+# ============================================================
+
+class ResourceSampler:
+    """Misst Systemressourcen periodisch in einem Hintergrund-Thread."""
+
+    def __init__(
+        self,
+        interval: float = 0.5,
+        capacity: int = 4096,
+        sink: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+        track_processes: bool = True
+    ):
+        self.interval = interval
+        self.capacity = capacity
+        self.sink = sink
+        self.processes = ProcessTracker() if track_processes else None
+
+        self.value_fields = SYSTEM_FIELDS + (PROCESS_FIELDS if self.processes else [])
+        self.row_fields = ["timestamp", "elapsed_seconds", "agent", "task", "model"] + self.value_fields
+
+        # Ring-Buffer: eine array-Spalte pro Messwert, dazu die Span-Nummer
+        self._columns = {name: array("d", bytes(8 * capacity)) for name in ["time"] + self.value_fields}
+        self._span_ids = array("i", bytes(4 * capacity))
+        self._next = 0            # Anzahl bisher gemessener Samples
+        self._flushed = 0         # Anzahl bereits in die CSV geschriebener Samples
+
+        self._spans: List[Tuple[str, str, str]] = [("", "", "")]   # Span 0 = kein Task
+        self._current_span = 0
+        self._ollama_rss_by_model: Dict[str, float] = {}   # Peak Ollama-RSS waehrend Tasks des Modells
+
+        # Laufende Aggregate ueber alle Samples (auch die aus dem Ring verdraengten)
+        self._peaks: Dict[str, float] = {name: 0.0 for name in self.value_fields}
+        self._sums: Dict[str, float] = {name: 0.0 for name in self.value_fields}
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_time = 0.0
+        self._last_disk = None
+        self._last_time = 0.0
+
+    # --------------------------------------------------------
+    # Steuerung
+    # --------------------------------------------------------
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._start_time = time.time()
+        psutil.cpu_percent(interval=None)   # Basiswert fuer die erste Messung
+        if self.processes is not None:
+            self.processes.sample()
+        self._last_disk = _disk_counters()
+        self._last_time = time.time()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ResourceSampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Beendet den Thread und schreibt alle offenen Zeilen."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._sample()
+        self.flush()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def begin_span(self, agent: str, task: str, model: str = ""):
+        """Ab jetzt werden Messungen diesem Task (und Modell) zugeordnet."""
+        with self._lock:
+            self._spans.append((agent, task, model))
+            self._current_span = len(self._spans) - 1
+
+    def end_span(self):
+        with self._lock:
+            self._current_span = 0
+
+    # --------------------------------------------------------
+    # Messung
+    # --------------------------------------------------------
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+            if self.sink and self._next - self._flushed >= self.capacity // 2:
+                self.flush()
+
+    def _sample(self):
+        now = time.time()
+        memory = psutil.virtual_memory()
+        swap = psutil.swap_memory()
+        disk = _disk_counters()
+        elapsed = max(now - self._last_time, 1e-6)
+        read_rate = write_rate = 0.0
+        if disk is not None and self._last_disk is not None:
+            read_rate = (disk[0] - self._last_disk[0]) / (1024 ** 2) / elapsed
+            write_rate = (disk[1] - self._last_disk[1]) / (1024 ** 2) / elapsed
+        self._last_disk, self._last_time = disk, now
+
+        values = {
+            "cpu_percent": psutil.cpu_percent(interval=None),
+            "ram_percent": memory.percent,
+            "ram_used_gb": memory.used / (1024 ** 3),
+            "swap_percent": swap.percent,
+            "disk_read_mb_s": read_rate,
+            "disk_write_mb_s": write_rate,
+        }
+        if self.processes is not None:
+            values.update(self.processes.sample())
+
+        with self._lock:
+            if self.sink and self._next - self._flushed >= self.capacity:
+                # Ring voll und Thread kam nicht zum Schreiben: aeltestes Sample opfern
+                self._flushed += 1
+            slot = self._next % self.capacity
+            self._columns["time"][slot] = now
+            for name, value in values.items():
+                self._columns[name][slot] = value
+                self._sums[name] += value
+                if value > self._peaks[name]:
+                    self._peaks[name] = value
+            self._span_ids[slot] = self._current_span
+            model = self._spans[self._current_span][2]
+            if model and values.get("ollama_processes"):
+                peak = self._ollama_rss_by_model.get(model, 0.0)
+                self._ollama_rss_by_model[model] = max(peak, values["ollama_rss_mb"])
+            self._next += 1
+
+    # --------------------------------------------------------
+    # Auslesen
+    # --------------------------------------------------------
+
+    def latest(self) -> Dict[str, float]:
+        """Letzte Messung im Format von get_resource_snapshot (nicht blockierend)."""
+        with self._lock:
+            if self._next == 0:
+                return {}
+            slot = (self._next - 1) % self.capacity
+            return {
+                "cpu_percent": round(self._columns["cpu_percent"][slot], 1),
+                "ram_percent": round(self._columns["ram_percent"][slot], 1),
+                "ram_used_gb": round(self._columns["ram_used_gb"][slot], 2),
+            }
+
+    def _rows(self, first: int, last: int) -> Iterator[Dict[str, Any]]:
+        for index in range(max(first, last - self.capacity), last):
+            slot = index % self.capacity
+            agent, task, model = self._spans[self._span_ids[slot]]
+            timestamp = self._columns["time"][slot]
+            row = {
+                "timestamp": datetime.fromtimestamp(timestamp).isoformat(timespec="milliseconds"),
+                "elapsed_seconds": round(timestamp - self._start_time, 3),
+                "agent": agent,
+                "task": task,
+                "model": model,
+            }
+            for name in self.value_fields:
+                row[name] = _round(name, self._columns[name][slot])
+            yield row
+
+    def recent(self) -> List[Dict[str, Any]]:
+        """Alle Samples, die noch im Ring-Buffer liegen."""
+        with self._lock:
+            return list(self._rows(0, self._next))
+
+    def flush(self):
+        """Gibt alle noch nicht weitergereichten Samples an den Sink."""
+        if not self.sink:
+            return
+        with self._lock:
+            rows = list(self._rows(self._flushed, self._next))
+            self._flushed = self._next
+        if rows:
+            self.sink(rows)
+
+    def process_summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Peak/Mittelwerte pro Prozessgruppe ueber das ganze Experiment, I/O als
+        Summe seit Start des Samplers; bei ollama zusaetzlich Peak-RSS pro Modell.
+        """
+        if self.processes is None:
+            return {}
+        with self._lock:
+            count = max(self._next, 1)
+            summary = {}
+            for group in PROCESS_GROUPS:
+                summary[group] = {
+                    "pids": sorted(self.processes.seen_pids[group]),
+                    "peak_rss_mb": round(self._peaks[f"{group}_rss_mb"], 1),
+                    "mean_rss_mb": round(self._sums[f"{group}_rss_mb"] / count, 1),
+                    "peak_cpu_percent": round(self._peaks[f"{group}_cpu_percent"], 1),
+                    "mean_cpu_percent": round(self._sums[f"{group}_cpu_percent"] / count, 1),
+                    "peak_threads": int(self._peaks[f"{group}_threads"]),
+                    # Kumuliert und monoton: der Peak ist die Summe bis zur letzten Messung
+                    "total_io_read_mb": round(self._peaks[f"{group}_io_read_mb"], 1),
+                    "total_io_write_mb": round(self._peaks[f"{group}_io_write_mb"], 1),
+                }
+            summary["ollama"]["peak_rss_mb_by_model"] = {
+                model: round(rss, 1) for model, rss in sorted(self._ollama_rss_by_model.items())
+            }
+            return summary
+
+    @property
+    def sample_count(self) -> int:
+        return self._next
+
+
+def _disk_counters() -> Optional[Tuple[int, int]]:
+    try:
+        counters = psutil.disk_io_counters()
+    except Exception:
+        return None
+    if counters is None:
+        return None
+    return counters.read_bytes, counters.write_bytes
@@ -0,0 +1,231 @@
+"""
+Ressourcen-begrenzte Sandbox fuer generierten Code
+===================================================
+Startet generierten Code ueber sandbox_worker.py mit Limits fuer
+Adressraum, CPU-Zeit und Prozessanzahl, und misst pro Lauf:
+- Peak RSS
+- User/System CPU-Zeit
+- Wall-Time
+
+So kann eine Endlosschleife oder eine ausufernde Allokation nicht mehr
+dem Ollama-Prozess auf derselben Maschine den RAM wegnehmen, und die
+Laufzeit-Effizienz von Code verschiedener Modelle wird vergleichbar.
+
+Limits werden ueber `resource` gesetzt (Linux/macOS). Unter Windows laeuft
+der Code ohne Limits, die Messung erfolgt dann ueber psutil. Das
+Prozess-Limit (RLIMIT_NPROC) gilt pro Benutzer, siehe SandboxLimits.
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import threading
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from experiment_runner import ExecutionMetrics
+
+
+PYTHON_EXECUTABLE = sys.executable
+WORKER_SCRIPT = Path(__file__).resolve().parent / "sandbox_worker.py"
+
+# Exit-Codes des Workers (siehe sandbox_worker.py)
+_LIMIT_EXIT_CODES = {90: "memory", 91: "cpu", 92: "processes"}
+
+
+@dataclass
+class SandboxLimits:
+    """
+    Ressourcen-Limits fuer einen Sandbox-Lauf.
+
+    max_processes setzt RLIMIT_NPROC. Der Kernel zaehlt dabei ALLE Prozesse
+    und Threads des Benutzers, nicht nur die der Sandbox: laufen Ollama, IDE
+    oder Browser unter demselben Benutzer, scheitert schon der erste fork()
+    des generierten Codes. Daher default None (kein Limit); wer es setzt,
+    muss den aktuellen Stand des Benutzers einrechnen.
+    """
+    memory_mb: int = 1024           # Adressraum (RLIMIT_AS)
+    cpu_seconds: Optional[int] = None   # CPU-Zeit (RLIMIT_CPU), None = Timeout
+    max_processes: Optional[int] = None   # RLIMIT_NPROC pro Benutzer, None = kein Limit
+
+    def to_env(self, timeout: float) -> Dict[str, str]:
+        cpu_seconds = self.cpu_seconds if self.cpu_seconds is not None else int(timeout) + 1
+        return {
+            "SANDBOX_MEMORY_MB": str(self.memory_mb or 0),
+            "SANDBOX_CPU_SECONDS": str(cpu_seconds or 0),
+            "SANDBOX_MAX_PROCESSES": str(self.max_processes or 0),
+        }
+
+
+DEFAULT_LIMITS = SandboxLimits()
+
+
+@dataclass
+class SandboxResult:
+    """Ausgabe und Messwerte eines Sandbox-Laufs."""
+    returncode: int
+    stdout: str
+    stderr: str
+    timed_out: bool
+    metrics: ExecutionMetrics
+
+
+def _children_cpu() -> tuple:
+    if resource is None:
+        return 0.0, 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime, usage.ru_stime
+
+
+def _reap_cpu(pid: int) -> Optional[tuple]:
+    """Wartet auf den Worker und liefert (user, system) CPU nur dieses Prozesses."""
+    if not hasattr(os, "wait4"):
+        return None
+    try:
+        _, _, usage = os.wait4(pid, 0)
+    except ChildProcessError:
+        return None
+    return usage.ru_utime, usage.ru_stime
+
+
+# Laufende Sandbox-Laeufe: RUSAGE_CHILDREN ist prozessweit, bei Ueberlappung
+# laesst sich die CPU-Zeit eines hart beendeten Workers nicht zuordnen
+_active_lock = threading.Lock()
+_active_runs = 0
+_overlap_generation = 0   # zaehlt jeden Start
+
+
+def run_sandboxed(
+    script_path: str,
+    timeout: float,
+    label: str = "run",
+    limits: Optional[SandboxLimits] = None,
+    env: Optional[Dict[str, str]] = None,
+    cwd: Optional[str] = None,
+    bytecode_path: Optional[str] = None,
+    then: Sequence[Tuple[str, Optional[str]]] = ()
+) -> SandboxResult:
+    """
+    Fuehrt ein Python-Skript mit Limits im Worker-Prozess aus.
+
+    Args:
+        script_path: Pfad zum auszufuehrenden Skript
+        timeout: Wall-Clock-Timeout in Sekunden
+        label: Bezeichnung fuer die Metriken (z.B. "tests")
+        limits: Ressourcen-Limits (default: DEFAULT_LIMITS)
+        env: Basis-Umgebung (default: os.environ)
+        cwd: Arbeitsverzeichnis
+        bytecode_path: Marshalled Code-Objekt (compile_cache.py) - der Worker
+                       kompiliert dann nicht erneut
+        then: weitere (Skript, Bytecode)-Paare, die danach im selben
+              __main__-Namensraum laufen (z.B. das Test-Modul)
+    """
+    limits = limits or DEFAULT_LIMITS
+    fd, stats_file = tempfile.mkstemp(suffix=".stats.json")
+    os.close(fd)
+
+    run_env = dict(env if env is not None else os.environ)
+    run_env.update(limits.to_env(timeout))
+    run_env["SANDBOX_STATS_FILE"] = stats_file
+
+    global _active_runs, _overlap_generation
+    with _active_lock:
+        others_at_start = _active_runs
+        _active_runs += 1
+        _overlap_generation += 1
+        generation = _overlap_generation
+    cpu_before = _children_cpu()
+    worker_cpu = None
+    wall_start = time.perf_counter()
+    timed_out = False
+    try:
+        command = [PYTHON_EXECUTABLE, str(WORKER_SCRIPT), script_path]
+        if bytecode_path:
+            command.append(bytecode_path)
+        for extra_script, extra_bytecode in then:
+            command.append(extra_script)
+            if extra_bytecode:
+                command.append(extra_bytecode)
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            cwd=cwd,
+            env=run_env
+        )
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+            returncode = process.returncode
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            process.kill()
+            # Selbst ernten: wait4 liefert die CPU-Zeit genau dieses Workers
+            worker_cpu = _reap_cpu(process.pid)
+            stdout, stderr = process.communicate()
+            returncode = -9
+    finally:
+        with _active_lock:
+            _active_runs -= 1
+            # Andere liefen schon, laufen noch oder sind inzwischen gestartet
+            overlapped = bool(others_at_start or _active_runs or generation != _overlap_generation)
+    wall_seconds = time.perf_counter() - wall_start
+
+    stats = {}
+    try:
+        with open(stats_file, "r", encoding="utf-8") as f:
+            stats = json.load(f)
+    except (OSError, ValueError):
+        pass
+    finally:
+        try:
+            os.unlink(stats_file)
+        except OSError:
+            pass
+
+    if not stats:
+        # Worker wurde hart beendet (Timeout, SIGKILL): CPU-Zeit aus Sicht des Parents.
+        # Beim Timeout per wait4 exakt; sonst Differenz von RUSAGE_CHILDREN, die
+        # aber prozessweit ist - lief parallel ein anderer Sandbox-Lauf, bleibt
+        # die CPU-Zeit 0 statt ihm fremde Zeit zuzuschreiben.
+        if worker_cpu is None and not overlapped:
+            cpu_after = _children_cpu()
+            worker_cpu = (cpu_after[0] - cpu_before[0], cpu_after[1] - cpu_before[1])
+        worker_cpu = worker_cpu or (0.0, 0.0)
+        stats = {
+            "user_cpu_seconds": round(worker_cpu[0], 4),
+            "system_cpu_seconds": round(worker_cpu[1], 4),
+            "peak_rss_mb": 0.0,
+            "limits_enforced": resource is not None,
+        }
+
+    limit_exceeded = stats.get("limit_exceeded") or _LIMIT_EXIT_CODES.get(returncode)
+    if timed_out:
+        limit_exceeded = "timeout"
+    elif returncode in (-9, -24) and not limit_exceeded:
+        # SIGKILL nach Hard-Limit bzw. SIGXCPU ohne Handler
+        limit_exceeded = "cpu"
+
+    metrics = ExecutionMetrics(
+        label=label,
+        model="",
+        iteration=0,
+        wall_seconds=round(wall_seconds, 3),
+        user_cpu_seconds=stats.get("user_cpu_seconds", 0.0),
+        system_cpu_seconds=stats.get("system_cpu_seconds", 0.0),
+        peak_rss_mb=stats.get("peak_rss_mb", 0.0),
+        returncode=returncode,
+        timed_out=timed_out,
+        limits_enforced=bool(stats.get("limits_enforced")),
+        limit_exceeded=limit_exceeded
+    )
+    return SandboxResult(returncode, stdout, stderr, timed_out, metrics)
@@ -0,0 +1,1218 @@
+"""
+Headless tkinter Shim fuer die Sandbox
+======================================
+Ersetzt das echte tkinter-Modul, wenn generierter Code in der Sandbox
+ausgefuehrt wird (Ordner `sandbox_shims` steht dann vorne im PYTHONPATH).
+
+- Canvas-Operationen werden aufgezeichnet statt gezeichnet
+- `after()` laeuft auf einer virtuellen Uhr, `mainloop()` spult sie vor
+- Tastendruecke koennen per Skript eingespielt werden
+- Kein X-Server / Display noetig
+
+Steuerung ueber Umgebungsvariablen:
+    HEADLESS_TK_VIRTUAL_SECONDS  Virtuelle Laufzeit von mainloop() (default 60)
+    HEADLESS_TK_MAX_CALLBACKS    Maximale Anzahl Callbacks (default 100000)
+    HEADLESS_TK_KEYS             Tasten-Skript, z.B. "500:Up,1000:Left,1500:space"
+    HEADLESS_TK_ANSWERS          Antworten fuer simpledialog, z.B. "Ash,5"
+    HEADLESS_TK_REPORT           Pfad fuer den JSON-Report nach Programmende
+    HEADLESS_TK_STRICT           "1" = Fehler in Callbacks sofort weiterwerfen
+"""
+
+import os
+import sys
+import json
+import time
+import heapq
+import atexit
+import traceback
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+HEADLESS = True
+
+TkVersion = 8.6
+TclVersion = 8.6
+
+
+# ============================================================
+# KONSTANTEN (wie tkinter.constants)
+# ============================================================
+
+N, S, E, W = "n", "s", "e", "w"
+NW, SW, NE, SE = "nw", "sw", "ne", "se"
+NS, EW, NSEW = "ns", "ew", "nsew"
+CENTER = "center"
+NONE, X, Y, BOTH = "none", "x", "y", "both"
+LEFT, TOP, RIGHT, BOTTOM = "left", "top", "right", "bottom"
+RAISED, SUNKEN, FLAT, RIDGE, GROOVE, SOLID = "raised", "sunken", "flat", "ridge", "groove", "solid"
+HORIZONTAL, VERTICAL = "horizontal", "vertical"
+NUMERIC = "numeric"
+CHAR, WORD = "char", "word"
+BASELINE = "baseline"
+INSIDE, OUTSIDE = "inside", "outside"
+NORMAL, DISABLED, ACTIVE, HIDDEN = "normal", "disabled", "active", "hidden"
+CASCADE, CHECKBUTTON, COMMAND, RADIOBUTTON, SEPARATOR = "cascade", "checkbutton", "command", "radiobutton", "separator"
+SINGLE, BROWSE, MULTIPLE, EXTENDED = "single", "browse", "multiple", "extended"
+ALL = "all"
+END = "end"
+INSERT = "insert"
+CURRENT = "current"
+ANCHOR = "anchor"
+SEL, SEL_FIRST, SEL_LAST = "sel", "sel.first", "sel.last"
+PIESLICE, CHORD, ARC = "pieslice", "chord", "arc"
+FIRST, LAST = "first", "last"
+BUTT, PROJECTING, ROUND, BEVEL, MITER = "butt", "projecting", "round", "bevel", "miter"
+MOVETO, SCROLL, UNITS, PAGES = "moveto", "scroll", "units", "pages"
+TRUE, FALSE, YES, NO, ON, OFF = 1, 0, 1, 0, 1, 0
+
+
+class TclError(Exception):
+    """Entspricht tkinter.TclError."""
+    pass
+
+
+# ============================================================
+# VIRTUELLE UHR & EVENT-SCHEDULER
+# ============================================================
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _parse_key_script(script: str) -> List[Tuple[float, str]]:
+    """Parst "500:Up,1000:Left" zu [(500.0, "Up"), (1000.0, "Left")]."""
+    events = []
+    for part in script.split(","):
+        part = part.strip()
+        if not part or ":" not in part:
+            continue
+        at_ms, keysym = part.split(":", 1)
+        try:
+            events.append((float(at_ms), keysym.strip()))
+        except ValueError:
+            continue
+    return events
+
+
+class _VirtualClock:
+    """Scheduler fuer after()-Callbacks und Tastendruecke auf virtueller Zeit."""
+
+    def __init__(self):
+        self.now_ms = 0.0
+        self.max_ms = _env_float("HEADLESS_TK_VIRTUAL_SECONDS", 60) * 1000
+        self.max_callbacks = int(_env_float("HEADLESS_TK_MAX_CALLBACKS", 100000))
+        self.strict = os.environ.get("HEADLESS_TK_STRICT") == "1"
+
+        self._queue: List[Tuple[float, int, str, Callable, tuple]] = []
+        self._cancelled = set()
+        self._seq = 0
+
+        self.key_events: List[Tuple[float, str]] = sorted(
+            _parse_key_script(os.environ.get("HEADLESS_TK_KEYS", ""))
+        )
+        self.keys_sent = 0
+
+        self.callbacks_run = 0
+        self.frame_costs_ms: List[float] = []
+        self.callback_errors: List[str] = []
+        self.stop_reason = "not_started"
+        self.wall_seconds = 0.0
+
+    def schedule(self, delay_ms: float, func: Callable, args: tuple) -> str:
+        self._seq += 1
+        after_id = f"after#{self._seq}"
+        due = self.now_ms + max(0.0, float(delay_ms))
+        heapq.heappush(self._queue, (due, self._seq, after_id, func, args))
+        return after_id
+
+    def cancel(self, after_id: str):
+        self._cancelled.add(after_id)
+
+    def inject_key(self, keysym: str, at_ms: Optional[float] = None):
+        """Plant einen Tastendruck zur virtuellen Zeit at_ms (default: jetzt)."""
+        at = self.now_ms if at_ms is None else float(at_ms)
+        self.key_events.append((at, keysym))
+        self.key_events.sort()
+
+    def _call(self, func: Callable, args: tuple):
+        start = time.perf_counter()
+        try:
+            func(*args)
+        except SystemExit:
+            raise
+        except Exception:
+            if self.strict:
+                raise
+            tb = traceback.format_exc()
+            self.callback_errors.append(tb)
+            sys.stderr.write("Exception in Tkinter callback\n" + tb)
+        finally:
+            self.frame_costs_ms.append((time.perf_counter() - start) * 1000)
+            self.callbacks_run += 1
+
+    def run_due(self, until_ms: float):
+        """Fuehrt alle Callbacks aus, die bis until_ms faellig sind."""
+        while True:
+            next_key = self.key_events[0][0] if self.key_events else None
+            next_cb = self._queue[0][0] if self._queue else None
+
+            if next_key is not None and next_key <= until_ms and (next_cb is None or next_key <= next_cb):
+                at, keysym = self.key_events.pop(0)
+                self.now_ms = max(self.now_ms, at)
+                self.keys_sent += 1
+                if _default_root is not None:
+                    self._call(_default_root._dispatch_key, (keysym,))
+            elif next_cb is not None and next_cb <= until_ms:
+                due, _, after_id, func, args = heapq.heappop(self._queue)
+                if after_id in self._cancelled:
+                    self._cancelled.discard(after_id)
+                    continue
+                self.now_ms = max(self.now_ms, due)
+                self._call(func, args)
+            else:
+                return
+
+            if self.callbacks_run >= self.max_callbacks:
+                return
+
+    def run(self, root: "Tk"):
+        """Spult die virtuelle Uhr vor, bis nichts mehr zu tun ist."""
+        wall_start = time.perf_counter()
+        self.stop_reason = "idle"
+        try:
+            while not root._destroyed:
+                if self.callbacks_run >= self.max_callbacks:
+                    self.stop_reason = "max_callbacks"
+                    break
+
+                candidates = []
+                if self._queue:
+                    candidates.append(self._queue[0][0])
+                if self.key_events:
+                    candidates.append(self.key_events[0][0])
+                if not candidates:
+                    self.stop_reason = "idle"
+                    break
+
+                next_ms = min(candidates)
+                if next_ms > self.max_ms:
+                    self.now_ms = self.max_ms
+                    self.stop_reason = "virtual_time_limit"
+                    break
+
+                self.run_due(next_ms)
+            else:
+                self.stop_reason = "destroyed"
+        finally:
+            self.wall_seconds += time.perf_counter() - wall_start
+
+    def report(self) -> Dict[str, Any]:
+        costs = sorted(self.frame_costs_ms)
+        frame_stats = {"count": len(costs)}
+        if costs:
+            frame_stats.update({
+                "mean_ms": round(sum(costs) / len(costs), 4),
+                "p95_ms": round(costs[min(len(costs) - 1, int(len(costs) * 0.95))], 4),
+                "max_ms": round(costs[-1], 4),
+                "total_ms": round(sum(costs), 2),
+            })
+        return {
+            "virtual_seconds": round(self.now_ms / 1000, 3),
+            "wall_seconds": round(self.wall_seconds, 4),
+            "speedup": round(self.now_ms / 1000 / self.wall_seconds, 1) if self.wall_seconds else None,
+            "callbacks_run": self.callbacks_run,
+            "keys_sent": self.keys_sent,
+            "stop_reason": self.stop_reason,
+            "frame_cost": frame_stats,
+            "canvas_ops": dict(_canvas_ops),
+            "canvas_items_alive": sum(len(c._items) for c in _canvases),
+            "callback_errors": len(self.callback_errors),
+            "first_errors": self.callback_errors[:3],
+        }
+
+
+_clock = _VirtualClock()
+_default_root: Optional["Tk"] = None
+_canvas_ops: Dict[str, int] = {}
+_canvases: List["Canvas"] = []
+_answers = [a for a in os.environ.get("HEADLESS_TK_ANSWERS", "").split(",") if a]
+
+
+def inject_key(keysym: str, at_ms: Optional[float] = None):
+    """Plant einen Tastendruck (fuer Smoke-Tests aus dem Spielcode heraus)."""
+    _clock.inject_key(keysym, at_ms)
+
+
+def get_report() -> Dict[str, Any]:
+    """Aktueller Report der Headless-Ausfuehrung."""
+    return _clock.report()
+
+
+def _next_answer() -> Optional[str]:
+    return _answers.pop(0) if _answers else None
+
+
+def _write_report():
+    report_path = os.environ.get("HEADLESS_TK_REPORT")
+    if not report_path:
+        return
+    try:
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(_clock.report(), f)
+    except OSError:
+        pass
+
+
+atexit.register(_write_report)
+
+
+# ============================================================
+# EVENTS
+# ============================================================
+
+_SPECIAL_CHARS = {"space": " ", "Return": "\r", "Tab": "\t", "BackSpace": "\b", "Escape": "\x1b"}
+
+
+class Event:
+    """Vereinfachtes tkinter.Event."""
+
+    def __init__(self, widget=None, keysym: str = "", x: int = 0, y: int = 0, type: str = "KeyPress"):
+        self.widget = widget
+        self.keysym = keysym
+        self.char = _SPECIAL_CHARS.get(keysym, keysym if len(keysym) == 1 else "")
+        self.keycode = ord(self.char) if len(self.char) == 1 else 0
+        self.keysym_num = self.keycode
+        self.x = self.x_root = x
+        self.y = self.y_root = y
+        self.num = 1
+        self.delta = 0
+        self.state = 0
+        self.type = type
+        self.width = self.height = 0
+
+
+_NON_KEY_EVENTS = (
+    "Button", "ButtonPress", "ButtonRelease", "Motion", "B1-", "B2-", "B3-", "Configure",
+    "Destroy", "Enter", "Leave", "FocusIn", "FocusOut", "KeyRelease", "Map", "Unmap",
+    "Double", "Triple", "MouseWheel", "Control-", "Shift-", "Alt-", "Visibility", "Expose",
+)
+
+
+def _key_of_sequence(sequence: str) -> Optional[str]:
+    """
+    Normalisiert eine Binding-Sequenz auf den Keysym.
+    "<Up>", "<KeyPress-Up>", "<Key-Up>", "a" -> Keysym; "<Key>", "<KeyPress>" -> "*".
+    None fuer Nicht-Tastatur-Events.
+    """
+    seq = sequence.strip()
+    if not seq.startswith("<"):
+        return seq if len(seq) == 1 else None
+    inner = seq.strip("<>")
+    if inner in ("Key", "KeyPress"):
+        return "*"
+    for prefix in ("KeyPress-", "Key-"):
+        if inner.startswith(prefix):
+            return inner[len(prefix):]
+    if inner.startswith(_NON_KEY_EVENTS):
+        return None
+    return inner
+
+
+# ============================================================
+# VARIABLEN
+# ============================================================
+
+class Variable:
+    _default: Any = ""
+
+    def __init__(self, master=None, value=None, name=None):
+        self._value = self._default if value is None else value
+        self._traces: List[Callable] = []
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+        for callback in list(self._traces):
+            callback("", "", "write")
+
+    def trace_add(self, mode, callback):
+        self._traces.append(callback)
+        return str(len(self._traces))
+
+    def trace(self, mode, callback):
+        return self.trace_add(mode, callback)
+
+    def trace_remove(self, mode, cbname):
+        pass
+
+
+class StringVar(Variable):
+    _default = ""
+
+    def get(self):
+        return str(self._value)
+
+
+class IntVar(Variable):
+    _default = 0
+
+    def get(self):
+        return int(self._value)
+
+
+class DoubleVar(Variable):
+    _default = 0.0
+
+    def get(self):
+        return float(self._value)
+
+
+class BooleanVar(Variable):
+    _default = False
+
+    def get(self):
+        return bool(self._value)
+
+
+# ============================================================
+# WIDGETS
+# ============================================================
+
+class Misc:
+    """Gemeinsame Basis aller Widgets (after, bind, config, Geometrie)."""
+
+    def __init__(self, master=None, cnf=None, **kw):
+        if master is None:
+            master = _default_root or Tk()
+        self.master = master
+        self._options: Dict[str, Any] = dict(cnf or {})
+        self._options.update(kw)
+        self._children: List["Misc"] = []
+        self._bindings: Dict[str, List[Callable]] = {}
+        self._destroyed = False
+        self._mapped = False
+        if isinstance(master, Misc):
+            master._children.append(self)
+
+    # --- Optionen ---
+    def configure(self, cnf=None, **kw):
+        if cnf:
+            kw.update(cnf)
+        self._options.update(kw)
+        textvariable = self._options.get("textvariable")
+        if "text" in kw and isinstance(textvariable, Variable):
+            textvariable.set(kw["text"])
+        return None
+
+    config = configure
+
+    def cget(self, key):
+        if key == "text" and isinstance(self._options.get("textvariable"), Variable):
+            return self._options["textvariable"].get()
+        return self._options.get(key, "")
+
+    def __getitem__(self, key):
+        return self.cget(key)
+
+    def __setitem__(self, key, value):
+        self.configure(**{key: value})
+
+    def keys(self):
+        return list(self._options.keys())
+
+    # --- Scheduling ---
+    def after(self, ms, func=None, *args):
+        if func is None:
+            _clock.now_ms += float(ms)
+            return None
+        return _clock.schedule(ms, func, args)
+
+    def after_idle(self, func, *args):
+        return _clock.schedule(0, func, args)
+
+    def after_cancel(self, after_id):
+        if after_id:
+            _clock.cancel(after_id)
+
+    def update(self):
+        _clock.run_due(_clock.now_ms)
+
+    def update_idletasks(self):
+        pass
+
+    def mainloop(self, n=0):
+        root = self._root()
+        _clock.run(root)
+
+    def quit(self):
+        self._root()._destroyed = True
+
+    def wait_window(self, window=None):
+        pass
+
+    def wait_visibility(self, window=None):
+        pass
+
+    # --- Events ---
+    def bind(self, sequence=None, func=None, add=None):
+        if sequence is None:
+            return list(self._bindings.keys())
+        if func is None:
+            return ""
+        if add:
+            self._bindings.setdefault(sequence, []).append(func)
+        else:
+            self._bindings[sequence] = [func]
+        return f"binding#{id(func)}"
+
+    def unbind(self, sequence, funcid=None):
+        self._bindings.pop(sequence, None)
+
+    def bind_all(self, sequence=None, func=None, add=None):
+        return self._root()._all_bindings.bind(sequence, func, add)
+
+    def unbind_all(self, sequence):
+        self._root()._all_bindings.unbind(sequence)
+
+    def bind_class(self, className, sequence=None, func=None, add=None):
+        return self.bind_all(sequence, func, add)
+
+    def event_generate(self, sequence, **kw):
+        keysym = _key_of_sequence(sequence)
+        if keysym and keysym != "*":
+            self._root()._dispatch_key(keysym)
+
+    def focus_set(self):
+        self._root()._focus = self
+
+    focus = focus_set
+    focus_force = focus_set
+
+    def focus_get(self):
+        return self._root()._focus
+
+    def _handlers_for(self, keysym: str) -> List[Callable]:
+        handlers = []
+        for sequence, funcs in self._bindings.items():
+            key = _key_of_sequence(sequence)
+            if key == keysym or key == "*":
+                handlers.extend(funcs)
+        return handlers
+
+    # --- Geometrie ---
+    def pack(self, cnf=None, **kw):
+        self._mapped = True
+
+    pack_configure = pack
+
+    def grid(self, cnf=None, **kw):
+        self._mapped = True
+
+    grid_configure = grid
+
+    def place(self, cnf=None, **kw):
+        self._mapped = True
+
+    place_configure = place
+
+    def pack_forget(self):
+        self._mapped = False
+
+    grid_forget = grid_remove = place_forget = pack_forget
+
+    def grid_rowconfigure(self, index, cnf=None, **kw):
+        pass
+
+    grid_columnconfigure = rowconfigure = columnconfigure = grid_rowconfigure
+
+    def pack_propagate(self, flag=None):
+        pass
+
+    grid_propagate = pack_propagate
+
+    def lift(self, aboveThis=None):
+        pass
+
+    tkraise = lower = lift
+
+    # --- Hierarchie ---
+    def winfo_children(self):
+        return [c for c in self._children if not c._destroyed]
+
+    def winfo_exists(self):
+        return 0 if self._destroyed else 1
+
+    def winfo_ismapped(self):
+        return 1 if self._mapped else 0
+
+    def winfo_viewable(self):
+        return self.winfo_ismapped()
+
+    def winfo_width(self):
+        return int(self._options.get("width", 1) or 1)
+
+    def winfo_height(self):
+        return int(self._options.get("height", 1) or 1)
+
+    winfo_reqwidth = winfo_width
+    winfo_reqheight = winfo_height
+
+    def winfo_x(self):
+        return 0
+
+    winfo_y = winfo_rootx = winfo_rooty = winfo_pointerx = winfo_pointery = winfo_x
+
+    def winfo_screenwidth(self):
+        return 1920
+
+    def winfo_screenheight(self):
+        return 1080
+
+    def winfo_toplevel(self):
+        return self._root()
+
+    def _root(self) -> "Tk":
+        widget = self
+        while isinstance(widget.master, Misc):
+            widget = widget.master
+        return widget
+
+    def destroy(self):
+        for child in list(self._children):
+            child.destroy()
+        self._destroyed = True
+        self._mapped = False
+        if isinstance(self.master, Misc) and self in self.master._children:
+            self.master._children.remove(self)
+
+    # --- Sonstiges ---
+    def option_add(self, pattern, value, priority=None):
+        pass
+
+    def clipboard_clear(self):
+        pass
+
+    def clipboard_append(self, string, **kw):
+        pass
+
+    def bell(self):
+        pass
+
+    def grab_set(self):
+        pass
+
+    grab_release = grab_set
+
+    def register(self, func, subst=None, needcleanup=1):
+        return func
+
+
+class Widget(Misc):
+    """Basis fuer alle normalen Widgets."""
+
+    def invoke(self):
+        command = self._options.get("command")
+        if callable(command):
+            return command()
+        return None
+
+
+class Wm:
+    """Fenster-Manager-Methoden von Tk und Toplevel."""
+
+    def title(self, string=None):
+        if string is None:
+            return self._options.get("title", "tk")
+        self._options["title"] = string
+
+    wm_title = title
+
+    def geometry(self, newGeometry=None):
+        if newGeometry is None:
+            return self._options.get("geometry", "200x200+0+0")
+        self._options["geometry"] = newGeometry
+        size = newGeometry.split("+")[0]
+        if "x" in size:
+            width, height = size.split("x", 1)
+            self._options.setdefault("width", width)
+            self._options.setdefault("height", height)
+
+    wm_geometry = geometry
+
+    def resizable(self, width=None, height=None):
+        pass
+
+    def protocol(self, name=None, func=None):
+        self._protocols[name] = func
+
+    def attributes(self, *args, **kw):
+        pass
+
+    wm_attributes = attributes
+
+    def minsize(self, width=None, height=None):
+        pass
+
+    maxsize = minsize
+
+    def iconbitmap(self, bitmap=None, default=None):
+        pass
+
+    def iconphoto(self, default=False, *args):
+        pass
+
+    def overrideredirect(self, boolean=None):
+        pass
+
+    def transient(self, master=None):
+        pass
+
+    def withdraw(self):
+        self._mapped = False
+
+    iconify = withdraw
+
+    def deiconify(self):
+        self._mapped = True
+
+
+class Tk(Misc, Wm):
+    """Headless Hauptfenster."""
+
+    def __init__(self, screenName=None, baseName=None, className="Tk", useTk=True, sync=False, use=None):
+        global _default_root
+        self.master = None
+        self._options = {}
+        self._children = []
+        self._bindings = {}
+        self._protocols: Dict[str, Callable] = {}
+        self._destroyed = False
+        self._mapped = True
+        self._focus: Misc = self
+        self._all_bindings = Misc.__new__(Misc)
+        self._all_bindings.master = self
+        self._all_bindings._bindings = {}
+        self.tk = self
+        if _default_root is None:
+            _default_root = self
+
+    def _dispatch_key(self, keysym: str):
+        """Liefert einen Tastendruck aus: Fokus-Widget, Toplevel, dann bind_all."""
+        targets = []
+        focus = self._focus if not self._focus._destroyed else self
+        targets.append(focus)
+        if focus is not self:
+            targets.append(self)
+        targets.append(self._all_bindings)
+
+        for target in targets:
+            for handler in target._handlers_for(keysym):
+                result = handler(Event(widget=focus, keysym=keysym))
+                if result == "break":
+                    return
+
+    def destroy(self):
+        global _default_root
+        super().destroy()
+        if _default_root is self:
+            _default_root = None
+
+    def call(self, *args):
+        return ""
+
+    def eval(self, script):
+        return ""
+
+
+class Toplevel(Widget, Wm):
+    def __init__(self, master=None, cnf=None, **kw):
+        super().__init__(master, cnf, **kw)
+        self._protocols: Dict[str, Callable] = {}
+        self._mapped = True
+
+
+class Frame(Widget):
+    pass
+
+
+class LabelFrame(Widget):
+    pass
+
+
+class Label(Widget):
+    pass
+
+
+class Message(Widget):
+    pass
+
+
+class Button(Widget):
+    def flash(self):
+        pass
+
+
+class Checkbutton(Widget):
+    def select(self):
+        var = self._options.get("variable")
+        if isinstance(var, Variable):
+            var.set(self._options.get("onvalue", 1))
+
+    def deselect(self):
+        var = self._options.get("variable")
+        if isinstance(var, Variable):
+            var.set(self._options.get("offvalue", 0))
+
+    def toggle(self):
+        var = self._options.get("variable")
+        if isinstance(var, Variable):
+            var.set(not var.get())
+
+
+class Radiobutton(Checkbutton):
+    pass
+
+
+class Scale(Widget):
+    def get(self):
+        var = self._options.get("variable")
+        return var.get() if isinstance(var, Variable) else self._options.get("from_", 0)
+
+    def set(self, value):
+        var = self._options.get("variable")
+        if isinstance(var, Variable):
+            var.set(value)
+
+
+class Scrollbar(Widget):
+    def set(self, first, last):
+        pass
+
+
+class Spinbox(Widget):
+    def get(self):
+        return str(self._options.get("from_", ""))
+
+
+class Entry(Widget):
+    def __init__(self, master=None, cnf=None, **kw):
+        super().__init__(master, cnf, **kw)
+        self._text = ""
+
+    def get(self):
+        var = self._options.get("textvariable")
+        return var.get() if isinstance(var, Variable) else self._text
+
+    def insert(self, index, string):
+        pos = len(self._text) if index in (END, "end") else int(index)
+        self._text = self._text[:pos] + str(string) + self._text[pos:]
+
+    def delete(self, first, last=None):
+        start = 0 if first in (0, "0") else int(first) if str(first).isdigit() else len(self._text)
+        end = len(self._text) if last in (None, END, "end") else int(last)
+        if last is None:
+            end = start + 1
+        self._text = self._text[:start] + self._text[end:]
+
+    def icursor(self, index):
+        pass
+
+    def select_range(self, start, end):
+        pass
+
+
+class Text(Widget):
+    def __init__(self, master=None, cnf=None, **kw):
+        super().__init__(master, cnf, **kw)
+        self._text = ""
+
+    def insert(self, index, chars, *args):
+        if index in ("1.0", 1.0) and self._text:
+            self._text = str(chars) + self._text
+        else:
+            self._text += str(chars)
+
+    def delete(self, index1, index2=None):
+        if index1 in ("1.0", 1.0) and index2 in (END, "end"):
+            self._text = ""
+
+    def get(self, index1, index2=None):
+        return self._text + "\n"
+
+    def see(self, index):
+        pass
+
+    def index(self, index):
+        return f"{self._text.count(chr(10)) + 1}.0"
+
+    def tag_configure(self, tagName, cnf=None, **kw):
+        pass
+
+    tag_config = tag_configure
+
+    def tag_add(self, tagName, index1, *args):
+        pass
+
+    tag_remove = tag_add
+
+    def mark_set(self, markName, index):
+        pass
+
+    def yview(self, *args):
+        pass
+
+    xview = yview
+
+
+class Listbox(Widget):
+    def __init__(self, master=None, cnf=None, **kw):
+        super().__init__(master, cnf, **kw)
+        self._items: List[str] = []
+        self._selection: Tuple[int, ...] = ()
+
+    def insert(self, index, *elements):
+        if index in (END, "end"):
+            self._items.extend(elements)
+        else:
+            pos = int(index)
+            self._items[pos:pos] = list(elements)
+
+    def delete(self, first, last=None):
+        start = int(first) if first not in (END, "end") else len(self._items) - 1
+        if last is None:
+            end = start + 1
+        elif last in (END, "end"):
+            end = len(self._items)
+        else:
+            end = int(last) + 1
+        del self._items[start:end]
+
+    def get(self, first, last=None):
+        if last is None:
+            return self._items[int(first)]
+        end = len(self._items) if last in (END, "end") else int(last) + 1
+        return tuple(self._items[int(first):end])
+
+    def size(self):
+        return len(self._items)
+
+    def curselection(self):
+        return self._selection
+
+    def selection_set(self, first, last=None):
+        self._selection = (int(first),)
+
+    select_set = selection_set
+
+    def selection_clear(self, first, last=None):
+        self._selection = ()
+
+    select_clear = selection_clear
+
+    def see(self, index):
+        pass
+
+    def activate(self, index):
+        pass
+
+    def yview(self, *args):
+        pass
+
+
+class Menu(Widget):
+    def add_command(self, cnf=None, **kw):
+        pass
+
+    add_cascade = add_separator = add_checkbutton = add_radiobutton = add_command
+
+    def add(self, itemType, cnf=None, **kw):
+        pass
+
+    def delete(self, index1, index2=None):
+        pass
+
+    def entryconfigure(self, index, cnf=None, **kw):
+        pass
+
+    entryconfig = entryconfigure
+
+    def post(self, x, y):
+        pass
+
+    tk_popup = post
+
+
+class Menubutton(Widget):
+    pass
+
+
+class OptionMenu(Widget):
+    def __init__(self, master, variable, value, *values, **kwargs):
+        super().__init__(master, None, **kwargs)
+        if isinstance(variable, Variable):
+            variable.set(value)
+
+
+class PanedWindow(Widget):
+    def add(self, child, **kw):
+        pass
+
+
+class PhotoImage:
+    def __init__(self, name=None, cnf=None, master=None, **kw):
+        self._options = dict(kw)
+
+    def width(self):
+        return int(self._options.get("width", 0))
+
+    def height(self):
+        return int(self._options.get("height", 0))
+
+    def subsample(self, x, y=""):
+        return self
+
+    zoom = subsample
+
+    def put(self, data, to=None):
+        pass
+
+
+BitmapImage = PhotoImage
+
+
+# ============================================================
+# CANVAS (zeichnet nicht, zeichnet auf)
+# ============================================================
+
+class Canvas(Widget):
+    """Canvas, das alle Operationen zaehlt und Items in einem Dict haelt."""
+
+    def __init__(self, master=None, cnf=None, **kw):
+        super().__init__(master, cnf, **kw)
+        self._items: Dict[int, Dict[str, Any]] = {}
+        self._next_id = 1
+        _canvases.append(self)
+
+    @staticmethod
+    def _record(op: str):
+        _canvas_ops[op] = _canvas_ops.get(op, 0) + 1
+
+    @staticmethod
+    def _flatten(args) -> List[float]:
+        coords = []
+        for arg in args:
+            if isinstance(arg, (list, tuple)):
+                coords.extend(Canvas._flatten(arg))
+            else:
+                coords.append(float(arg))
+        return coords
+
+    def _create(self, item_type: str, args, kw) -> int:
+        self._record(f"create_{item_type}")
+        item_id = self._next_id
+        self._next_id += 1
+        tags = kw.get("tags", kw.get("tag", ()))
+        if isinstance(tags, str):
+            tags = tuple(tags.split())
+        self._items[item_id] = {
+            "type": item_type,
+            "coords": self._flatten(args),
+            "options": kw,
+            "tags": tuple(tags),
+        }
+        return item_id
+
+    def create_rectangle(self, *args, **kw):
+        return self._create("rectangle", args, kw)
+
+    def create_oval(self, *args, **kw):
+        return self._create("oval", args, kw)
+
+    def create_line(self, *args, **kw):
+        return self._create("line", args, kw)
+
+    def create_polygon(self, *args, **kw):
+        return self._create("polygon", args, kw)
+
+    def create_arc(self, *args, **kw):
+        return self._create("arc", args, kw)
+
+    def create_text(self, *args, **kw):
+        return self._create("text", args, kw)
+
+    def create_image(self, *args, **kw):
+        return self._create("image", args, kw)
+
+    def create_window(self, *args, **kw):
+        return self._create("window", args, kw)
+
+    def create_bitmap(self, *args, **kw):
+        return self._create("bitmap", args, kw)
+
+    def _resolve(self, tag_or_id) -> List[int]:
+        if tag_or_id in (ALL, "all"):
+            return list(self._items.keys())
+        if isinstance(tag_or_id, int) or (isinstance(tag_or_id, str) and tag_or_id.isdigit()):
+            item_id = int(tag_or_id)
+            return [item_id] if item_id in self._items else []
+        return [i for i, item in self._items.items() if tag_or_id in item["tags"]]
+
+    def delete(self, *args):
+        self._record("delete")
+        for tag_or_id in args:
+            for item_id in self._resolve(tag_or_id):
+                self._items.pop(item_id, None)
+
+    def coords(self, tag_or_id, *args):
+        self._record("coords")
+        ids = self._resolve(tag_or_id)
+        if not ids:
+            return []
+        if args:
+            self._items[ids[0]]["coords"] = self._flatten(args)
+            return None
+        return list(self._items[ids[0]]["coords"])
+
+    def move(self, tag_or_id, dx, dy):
+        self._record("move")
+        for item_id in self._resolve(tag_or_id):
+            coords = self._items[item_id]["coords"]
+            self._items[item_id]["coords"] = [
+                c + (dx if i % 2 == 0 else dy) for i, c in enumerate(coords)
+            ]
+
+    def moveto(self, tag_or_id, x="", y=""):
+        self._record("moveto")
+
+    def itemconfigure(self, tag_or_id, cnf=None, **kw):
+        self._record("itemconfigure")
+        if cnf:
+            kw.update(cnf)
+        for item_id in self._resolve(tag_or_id):
+            self._items[item_id]["options"].update(kw)
+
+    itemconfig = itemconfigure
+
+    def itemcget(self, tag_or_id, option):
+        ids = self._resolve(tag_or_id)
+        return self._items[ids[0]]["options"].get(option, "") if ids else ""
+
+    def type(self, tag_or_id):
+        ids = self._resolve(tag_or_id)
+        return self._items[ids[0]]["type"] if ids else None
+
+    def gettags(self, tag_or_id):
+        ids = self._resolve(tag_or_id)
+        return self._items[ids[0]]["tags"] if ids else ()
+
+    def addtag_withtag(self, newtag, tag_or_id):
+        for item_id in self._resolve(tag_or_id):
+            self._items[item_id]["tags"] += (newtag,)
+
+    def dtag(self, tag_or_id, tag_to_delete=None):
+        for item_id in self._resolve(tag_or_id):
+            tag = tag_to_delete or tag_or_id
+            self._items[item_id]["tags"] = tuple(t for t in self._items[item_id]["tags"] if t != tag)
+
+    def find_withtag(self, tag_or_id):
+        return tuple(self._resolve(tag_or_id))
+
+    def find_all(self):
+        return tuple(self._items.keys())
+
+    def bbox(self, *args):
+        xs, ys = [], []
+        for tag_or_id in args:
+            for item_id in self._resolve(tag_or_id):
+                coords = self._items[item_id]["coords"]
+                xs.extend(coords[0::2])
+                ys.extend(coords[1::2])
+        if not xs:
+            return None
+        return (int(min(xs)), int(min(ys)), int(max(xs)), int(max(ys)))
+
+    def find_overlapping(self, x1, y1, x2, y2):
+        self._record("find_overlapping")
+        found = []
+        for item_id, item in self._items.items():
+            coords = item["coords"]
+            if len(coords) < 2:
+                continue
+            xs, ys = coords[0::2], coords[1::2]
+            if min(xs) <= x2 and max(xs) >= x1 and min(ys) <= y2 and max(ys) >= y1:
+                found.append(item_id)
+        return tuple(found)
+
+    def find_enclosed(self, x1, y1, x2, y2):
+        found = []
+        for item_id, item in self._items.items():
+            coords = item["coords"]
+            if len(coords) < 2:
+                continue
+            xs, ys = coords[0::2], coords[1::2]
+            if min(xs) >= x1 and max(xs) <= x2 and min(ys) >= y1 and max(ys) <= y2:
+                found.append(item_id)
+        return tuple(found)
+
+    def find_closest(self, x, y, halo=None, start=None):
+        return tuple(list(self._items.keys())[-1:])
+
+    def tag_bind(self, tag_or_id, sequence=None, func=None, add=None):
+        return self.bind(sequence, func, add)
+
+    def tag_unbind(self, tag_or_id, sequence, funcid=None):
+        pass
+
+    def tag_raise(self, *args):
+        self._record("tag_raise")
+
+    tag_lower = tag_raise
+
+    def lift(self, *args):
+        self._record("tag_raise")
+
+    lower = lift
+
+    def scale(self, *args):
+        self._record("scale")
+
+    def postscript(self, cnf=None, **kw):
+        return ""
+
+    def xview(self, *args):
+        pass
+
+    yview = xview_moveto = yview_moveto = xview
+
+
+# ============================================================
+# HILFSFUNKTIONEN WIE IN tkinter
+# ============================================================
+
+def NoDefaultRoot():
+    pass
+
+
+def mainloop(n=0):
+    if _default_root is not None:
+        _default_root.mainloop(n)
+
+
+def image_names():
+    return ()
+
+
+def getint(value):
+    return int(value)
+
+
+def getdouble(value):
+    return float(value)
+
+
+def getboolean(value):
+    return bool(value)
@@ -0,0 +1,5 @@
+"""Headless tkinter.colorchooser."""
+
+
+def askcolor(color=None, **options):
+    return (None, None)
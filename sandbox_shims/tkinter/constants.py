@@ -0,0 +1,12 @@
+"""Headless tkinter.constants."""
+
+from tkinter import (  # noqa: F401
+    N, S, E, W, NW, SW, NE, SE, NS, EW, NSEW, CENTER, NONE, X, Y, BOTH,
+    LEFT, TOP, RIGHT, BOTTOM, RAISED, SUNKEN, FLAT, RIDGE, GROOVE, SOLID,
+    HORIZONTAL, VERTICAL, NUMERIC, CHAR, WORD, BASELINE, INSIDE, OUTSIDE,
+    NORMAL, DISABLED, ACTIVE, HIDDEN, CASCADE, CHECKBUTTON, COMMAND,
+    RADIOBUTTON, SEPARATOR, SINGLE, BROWSE, MULTIPLE, EXTENDED, ALL, END,
+    INSERT, CURRENT, ANCHOR, SEL, SEL_FIRST, SEL_LAST, PIESLICE, CHORD, ARC,
+    FIRST, LAST, BUTT, PROJECTING, ROUND, BEVEL, MITER, MOVETO, SCROLL,
+    UNITS, PAGES, TRUE, FALSE, YES, NO, ON, OFF,
+)
@@ -0,0 +1,25 @@
+"""Headless tkinter.filedialog: es wird nie eine Datei gewaehlt."""
+
+
+def askopenfilename(**options):
+    return ""
+
+
+def asksaveasfilename(**options):
+    return ""
+
+
+def askdirectory(**options):
+    return ""
+
+
+def askopenfilenames(**options):
+    return ()
+
+
+def askopenfile(mode="r", **options):
+    return None
+
+
+def asksaveasfile(mode="w", **options):
+    return None
@@ -0,0 +1,41 @@
+"""Headless tkinter.font."""
+
+NORMAL, ROMAN, BOLD, ITALIC = "normal", "roman", "bold", "italic"
+
+
+class Font:
+    def __init__(self, root=None, font=None, name=None, exists=False, **options):
+        self._options = dict(options)
+
+    def configure(self, **options):
+        self._options.update(options)
+
+    config = configure
+
+    def cget(self, option):
+        return self._options.get(option, "")
+
+    def actual(self, option=None, displayof=None):
+        return self._options if option is None else self._options.get(option, "")
+
+    def measure(self, text, displayof=None):
+        return len(str(text)) * int(self._options.get("size", 10) or 10) // 2
+
+    def metrics(self, *options, **kw):
+        size = int(self._options.get("size", 10) or 10)
+        return {"ascent": size, "descent": size // 4, "linespace": size + size // 4, "fixed": 0}
+
+    def copy(self):
+        return Font(**self._options)
+
+
+def families(root=None, displayof=None):
+    return ("Arial", "Courier", "Helvetica", "Times")
+
+
+def names(root=None):
+    return ()
+
+
+def nametofont(name, root=None):
+    return Font(name=name)
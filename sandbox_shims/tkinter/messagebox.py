@@ -0,0 +1,53 @@
+"""Headless tkinter.messagebox: zeigt nichts an, gibt Standardantworten zurueck."""
+
+import sys
+
+ERROR, INFO, QUESTION, WARNING = "error", "info", "question", "warning"
+ABORTRETRYIGNORE, OK, OKCANCEL, RETRYCANCEL, YESNO, YESNOCANCEL = (
+    "abortretryignore", "ok", "okcancel", "retrycancel", "yesno", "yesnocancel"
+)
+ABORT, RETRY, IGNORE, CANCEL, YES, NO = "abort", "retry", "ignore", "cancel", "yes", "no"
+
+
+def _log(kind: str, title, message):
+    sys.stdout.write(f"[messagebox.{kind}] {title}: {message}\n")
+
+
+def showinfo(title=None, message=None, **options):
+    _log("showinfo", title, message)
+    return OK
+
+
+def showwarning(title=None, message=None, **options):
+    _log("showwarning", title, message)
+    return OK
+
+
+def showerror(title=None, message=None, **options):
+    _log("showerror", title, message)
+    return OK
+
+
+def askquestion(title=None, message=None, **options):
+    _log("askquestion", title, message)
+    return YES
+
+
+def askokcancel(title=None, message=None, **options):
+    _log("askokcancel", title, message)
+    return True
+
+
+def askyesno(title=None, message=None, **options):
+    _log("askyesno", title, message)
+    return True
+
+
+def askyesnocancel(title=None, message=None, **options):
+    _log("askyesnocancel", title, message)
+    return True
+
+
+def askretrycancel(title=None, message=None, **options):
+    _log("askretrycancel", title, message)
+    return False
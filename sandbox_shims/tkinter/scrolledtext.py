@@ -0,0 +1,7 @@
+"""Headless tkinter.scrolledtext."""
+
+from tkinter import Text
+
+
+class ScrolledText(Text):
+    pass
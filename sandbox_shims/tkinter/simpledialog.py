@@ -0,0 +1,29 @@
+"""Headless tkinter.simpledialog: Antworten kommen aus HEADLESS_TK_ANSWERS."""
+
+from tkinter import _next_answer, Toplevel
+
+
+class Dialog(Toplevel):
+    def __init__(self, parent=None, title=None):
+        super().__init__(parent)
+
+
+def askstring(title, prompt, **kw):
+    answer = _next_answer()
+    return answer if answer is not None else kw.get("initialvalue")
+
+
+def askinteger(title, prompt, **kw):
+    answer = _next_answer()
+    try:
+        return int(answer) if answer is not None else kw.get("initialvalue")
+    except ValueError:
+        return kw.get("initialvalue")
+
+
+def askfloat(title, prompt, **kw):
+    answer = _next_answer()
+    try:
+        return float(answer) if answer is not None else kw.get("initialvalue")
+    except ValueError:
+        return kw.get("initialvalue")
@@ -0,0 +1,89 @@
+"""Headless tkinter.ttk: Themed Widgets als Aliase der Headless-Widgets."""
+
+from tkinter import (  # noqa: F401
+    Widget, Frame, Label, Button, Checkbutton, Radiobutton, Entry, Scale,
+    Scrollbar, Menubutton, LabelFrame, PanedWindow, Spinbox, Listbox, Variable,
+)
+
+
+class Combobox(Entry):
+    def current(self, newindex=None):
+        return 0
+
+    def set(self, value):
+        self._text = str(value)
+
+
+class Progressbar(Widget):
+    def start(self, interval=None):
+        pass
+
+    def stop(self):
+        pass
+
+    def step(self, amount=None):
+        pass
+
+
+class Notebook(Widget):
+    def add(self, child, **kw):
+        pass
+
+    def select(self, tab_id=None):
+        return ""
+
+
+class Treeview(Widget):
+    def insert(self, parent, index, iid=None, **kw):
+        return iid or ""
+
+    def delete(self, *items):
+        pass
+
+    def get_children(self, item=None):
+        return ()
+
+    def heading(self, column, option=None, **kw):
+        pass
+
+    def column(self, column, option=None, **kw):
+        pass
+
+
+class Separator(Widget):
+    pass
+
+
+class Sizegrip(Widget):
+    pass
+
+
+class LabeledScale(Frame):
+    pass
+
+
+class OptionMenu(Menubutton):
+    def __init__(self, master, variable, default=None, *values, **kwargs):
+        super().__init__(master, None, **kwargs)
+        if isinstance(variable, Variable) and default is not None:
+            variable.set(default)
+
+
+class Style:
+    def __init__(self, master=None):
+        pass
+
+    def configure(self, style, query_opt=None, **kw):
+        pass
+
+    def map(self, style, query_opt=None, **kw):
+        pass
+
+    def theme_use(self, themename=None):
+        return "default"
+
+    def theme_names(self):
+        return ("default",)
+
+    def lookup(self, style, option, state=None, default=None):
+        return default
@@ -0,0 +1,219 @@
+"""
+Sandbox Worker
+==============
+Kind-Prozess fuer die Ausfuehrung von generiertem Code (siehe sandbox.py).
+
+Aufruf: python sandbox_worker.py <script.py> [<bytecode.bin>] [<script.py> [<bytecode.bin>] ...]
+
+- Setzt Ressourcen-Limits (Adressraum, CPU-Zeit, Prozesse) ueber `resource`
+- Fuehrt die Skripte nacheinander im selben __main__-Namensraum aus (z.B.
+  generierter Code, dann das Test-Modul) - mit <bytecode.bin> (marshalled
+  Code-Objekt aus compile_cache.py) ohne erneutes Kompilieren
+- Schreibt Peak-RSS und CPU-Zeiten als JSON nach SANDBOX_STATS_FILE
+
+Nur Standardbibliothek - der Worker importiert nichts aus dem Projekt.
+"""
+
+import os
+import sys
+import json
+import time
+import types
+import signal
+import marshal
+import traceback
+import importlib.util
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+EXIT_MEMORY = 90
+EXIT_CPU = 91
+EXIT_PROCESSES = 92
+
+_wall_start = time.perf_counter()
+_stats_written = False
+
+
+def _env_int(name: str) -> int:
+    try:
+        return int(os.environ.get(name, "0") or 0)
+    except ValueError:
+        return 0
+
+
+def apply_limits() -> bool:
+    """Setzt die Limits aus der Umgebung. False wenn die Plattform keine Limits kann."""
+    if resource is None:
+        return False
+
+    memory_mb = _env_int("SANDBOX_MEMORY_MB")
+    cpu_seconds = _env_int("SANDBOX_CPU_SECONDS")
+    max_processes = _env_int("SANDBOX_MAX_PROCESSES")
+
+    limits = []
+    if memory_mb > 0:
+        limits.append((resource.RLIMIT_AS, memory_mb * 1024 * 1024))
+    if cpu_seconds > 0:
+        # Soft-Limit -> SIGXCPU (abfangbar), Hard-Limit 1s spaeter -> SIGKILL
+        limits.append((resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1)))
+    if max_processes > 0 and hasattr(resource, "RLIMIT_NPROC"):
+        limits.append((resource.RLIMIT_NPROC, max_processes))
+
+    for which, value in limits:
+        soft, hard = value if isinstance(value, tuple) else (value, value)
+        _, current_hard = resource.getrlimit(which)
+        if current_hard != resource.RLIM_INFINITY:
+            soft, hard = min(soft, current_hard), min(hard, current_hard)
+        try:
+            resource.setrlimit(which, (soft, hard))
+        except (ValueError, OSError):
+            pass
+    return True
+
+
+def _peak_rss_mb() -> float:
+    if resource is not None:
+        self_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        children_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        peak = max(self_rss, children_rss)
+        # Linux: KB, macOS: Bytes
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+    except Exception:
+        return 0.0
+
+
+def write_stats(limit_exceeded: str = None, limits_enforced: bool = False):
+    """Schreibt die Messwerte genau einmal."""
+    global _stats_written
+    stats_file = os.environ.get("SANDBOX_STATS_FILE")
+    if _stats_written or not stats_file:
+        return
+    _stats_written = True
+    times = os.times()
+    stats = {
+        "user_cpu_seconds": round(times.user + times.children_user, 4),
+        "system_cpu_seconds": round(times.system + times.children_system, 4),
+        "peak_rss_mb": round(_peak_rss_mb(), 2),
+        "wall_seconds": round(time.perf_counter() - _wall_start, 4),
+        "limits_enforced": limits_enforced,
+        "limit_exceeded": limit_exceeded,
+    }
+    try:
+        with open(stats_file, "w", encoding="utf-8") as f:
+            json.dump(stats, f)
+    except OSError:
+        pass
+
+
+def load_code(bytecode_path: str):
+    """Laedt das Code-Objekt; None wenn der Bytecode von einer anderen Python-Version stammt."""
+    magic = importlib.util.MAGIC_NUMBER
+    with open(bytecode_path, "rb") as f:
+        data = f.read()
+    if not data.startswith(magic):
+        return None
+    return marshal.loads(data[len(magic):])
+
+
+def parse_units(args):
+    """[(Skript, Bytecode oder None)] aus der Kommandozeile; .bin gehoert zum Skript davor."""
+    units = []
+    for arg in args:
+        if arg.endswith(".bin") and units and units[-1][1] is None:
+            units[-1] = (units[-1][0], arg)
+        else:
+            units.append((os.path.abspath(arg), None))
+    return units
+
+
+def compile_unit(script: str, bytecode_path: str = None):
+    """Code-Objekt aus dem Bytecode, sonst (andere Python-Version) aus der Quelldatei."""
+    code = load_code(bytecode_path) if bytecode_path else None
+    if code is None:
+        with open(script, "rb") as f:
+            code = compile(f.read(), script, "exec", dont_inherit=True)
+    return code
+
+
+def run_units_as_main(units, first_script: str):
+    """Wie runpy.run_path, aber fuer mehrere Einheiten in einem __main__-Namensraum."""
+    module = types.ModuleType("__main__")
+    module.__file__ = first_script
+    module.__cached__ = None
+    module.__builtins__ = __builtins__
+    main_module = sys.modules.get("__main__")
+    sys.modules["__main__"] = module
+    try:
+        for script, bytecode_path in units:
+            exec(compile_unit(script, bytecode_path), module.__dict__)
+    finally:
+        sys.modules["__main__"] = main_module
+
+
+def _print_user_traceback(exc: BaseException, scripts):
+    """Traceback ohne die Frames des Workers."""
+    tb = exc.__traceback__
+    while tb is not None and os.path.abspath(tb.tb_frame.f_code.co_filename) not in scripts:
+        tb = tb.tb_next
+    traceback.print_exception(type(exc), exc, tb or exc.__traceback__)
+
+
+def main(*args: str) -> int:
+    units = parse_units(args)
+    script = units[0][0]
+    scripts = {unit[0] for unit in units}
+    limits_enforced = apply_limits()
+
+    if resource is not None and hasattr(signal, "SIGXCPU"):
+        def on_cpu_limit(signum, frame):
+            sys.stderr.write("CPU-Zeit-Limit der Sandbox ueberschritten\n")
+            write_stats("cpu", limits_enforced)
+            os._exit(EXIT_CPU)
+        signal.signal(signal.SIGXCPU, on_cpu_limit)
+
+    sys.argv = [script]
+    sys.path[0] = os.path.dirname(script)
+
+    exit_code = 0
+    limit_exceeded = None
+
+    try:
+        run_units_as_main(units, script)
+    except SystemExit as e:
+        if e.code is None:
+            exit_code = 0
+        elif isinstance(e.code, int):
+            exit_code = e.code
+        else:
+            sys.stderr.write(f"{e.code}\n")
+            exit_code = 1
+    except MemoryError as e:
+        _print_user_traceback(e, scripts)
+        sys.stderr.write("Speicher-Limit der Sandbox ueberschritten\n")
+        limit_exceeded, exit_code = "memory", EXIT_MEMORY
+    except BlockingIOError as e:
+        _print_user_traceback(e, scripts)
+        sys.stderr.write("Prozess-Limit der Sandbox ueberschritten\n")
+        limit_exceeded, exit_code = "processes", EXIT_PROCESSES
+    except BaseException as e:
+        _print_user_traceback(e, scripts)
+        exit_code = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        write_stats(limit_exceeded, limits_enforced)
+    return exit_code
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.stderr.write("Aufruf: python sandbox_worker.py <script.py> [<bytecode.bin>] ...\n")
+        sys.exit(2)
+    sys.exit(main(*sys.argv[1:]))
@@ -0,0 +1,210 @@
+"""
+Selbst-Profiling des Orchestrators
+==================================
+Opt-in Sampling-Profiler, der zeigt, wie viel Zeit eines Experiments *nicht*
+im Modell oder in Test-Subprozessen steckt (Agent-Aufbau, Prompt-Rendering,
+Regex-Extraktion, Datei-I/O, ...).
+
+- Ein Thread tastet alle `interval` Sekunden den Stack des Runner-Threads ab
+- Jedes Sample wird einer Kategorie zugeordnet:
+    llm_wait    - Stack steckt in HTTP-Client/Socket-Code (Warten auf Ollama)
+    subprocess  - Stack steckt in subprocess (Sandbox, Tests)
+    orchestrator - alles andere
+- und der Phase des Tracers (laufender Task bzw. innerster tracer.span())
+- Ausgabe: `<id>_profile.folded` (Folded Stacks fuer flamegraph.pl/speedscope)
+  und `<id>_profile.md` mit Zeit pro Kategorie/Phase und Top-Hotspots
+
+Aktivieren: EXPERIMENT_PROFILE=1 oder ExperimentTracer(..., profile=True)
+"""
+
+import os
+import sys
+import time
+import threading
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+CATEGORIES = ("orchestrator", "llm_wait", "subprocess")
+
+# Pfad-Bestandteile, an denen das Warten auf das LLM erkannt wird
+_LLM_MARKERS = (
+    f"{os.sep}httpx{os.sep}", f"{os.sep}httpcore{os.sep}", f"{os.sep}urllib3{os.sep}",
+    f"{os.sep}requests{os.sep}", f"{os.sep}aiohttp{os.sep}", f"{os.sep}litellm{os.sep}llms{os.sep}",
+    f"{os.sep}openai{os.sep}_base_client", f"{os.sep}ssl.py", f"{os.sep}socket.py",
+)
+_SUBPROCESS_MARKERS = (f"{os.sep}subprocess.py",)
+
+# Eigene Frames nicht in Hotspots zaehlen
+_OWN_FILE = os.path.abspath(__file__)
+
+
+def _frame_label(code) -> str:
+    module = Path(code.co_filename).stem
+    return f"{module}.{code.co_name}"
+
+
+class SelfProfiler:
+    """Stack-Sampler fuer einen Thread (default: den startenden)."""
+
+    def __init__(
+        self,
+        interval: float = 0.01,
+        phase_fn: Optional[Callable[[], str]] = None,
+        thread_id: Optional[int] = None,
+        max_depth: int = 96
+    ):
+        self.interval = interval
+        self.phase_fn = phase_fn or (lambda: "")
+        self.thread_id = thread_id
+        self.max_depth = max_depth
+
+        self.folded: Counter = Counter()                       # Stack-String -> Sekunden
+        self.category_seconds: Dict[str, float] = defaultdict(float)
+        self.phase_seconds: Dict[Tuple[str, str], float] = defaultdict(float)
+        self.self_seconds: Dict[Tuple[str, str], float] = defaultdict(float)       # (Funktion, Ort)
+        self.inclusive_seconds: Dict[Tuple[str, str], float] = defaultdict(float)
+        self.samples = 0
+        self.wall_seconds = 0.0
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+
+    def start(self) -> "SelfProfiler":
+        if self._thread is not None:
+            return self
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="SelfProfiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.wall_seconds = time.perf_counter() - self._started
+
+    # --------------------------------------------------------
+    # Sampling
+    # --------------------------------------------------------
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self._record(frame, now - last)
+            last = now
+
+    def _record(self, frame, weight: float):
+        codes = []
+        while frame is not None and len(codes) < self.max_depth:
+            codes.append(frame.f_code)
+            frame = frame.f_back
+        codes.reverse()   # Wurzel zuerst
+
+        category = "orchestrator"
+        for code in codes:
+            filename = code.co_filename
+            if any(marker in filename for marker in _LLM_MARKERS):
+                category = "llm_wait"
+                break
+            if any(marker in filename for marker in _SUBPROCESS_MARKERS):
+                category = "subprocess"
+                break
+
+        try:
+            phase = self.phase_fn() or "-"
+        except Exception:
+            phase = "-"
+
+        labels = [_frame_label(code) for code in codes]
+        self.folded[";".join([phase, category] + labels)] += weight
+        self.category_seconds[category] += weight
+        self.phase_seconds[(phase, category)] += weight
+        self.samples += 1
+
+        if category == "orchestrator" and codes:
+            leaf = codes[-1]
+            self.self_seconds[(labels[-1], f"{leaf.co_filename}:{leaf.co_firstlineno}")] += weight
+            seen = set()
+            for code, label in zip(codes, labels):
+                key = (label, f"{code.co_filename}:{code.co_firstlineno}")
+                if key not in seen and code.co_filename != _OWN_FILE:
+                    seen.add(key)
+                    self.inclusive_seconds[key] += weight
+
+    # --------------------------------------------------------
+    # Ausgabe
+    # --------------------------------------------------------
+
+    def hotspots(self, top: int = 15) -> List[Dict[str, object]]:
+        """Orchestrator-Funktionen nach Eigenzeit (Blatt im Stack)."""
+        rows = []
+        for (label, location), seconds in sorted(self.self_seconds.items(), key=lambda kv: -kv[1])[:top]:
+            rows.append({
+                "function": label,
+                "location": location,
+                "self_seconds": round(seconds, 3),
+                "inclusive_seconds": round(self.inclusive_seconds.get((label, location), seconds), 3),
+            })
+        return rows
+
+    def summary(self, top: int = 15) -> Dict[str, object]:
+        sampled = sum(self.category_seconds.values()) or 1e-9
+        return {
+            "interval": self.interval,
+            "samples": self.samples,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "categories": {
+                category: {
+                    "seconds": round(self.category_seconds.get(category, 0.0), 3),
+                    "share": round(self.category_seconds.get(category, 0.0) / sampled, 4),
+                }
+                for category in CATEGORIES
+            },
+            "phases": [
+                {"phase": phase, "category": category, "seconds": round(seconds, 3)}
+                for (phase, category), seconds in sorted(self.phase_seconds.items(), key=lambda kv: -kv[1])
+            ],
+            "hotspots": self.hotspots(top),
+        }
+
+    def write_folded(self, path: Path):
+        """Folded Stacks, Gewicht in Millisekunden (flamegraph.pl, speedscope, inferno)."""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, seconds in sorted(self.folded.items()):
+                weight = int(round(seconds * 1000))
+                if weight > 0:
+                    f.write(f"{stack} {weight}\n")
+
+    def write_summary(self, path: Path, title: str = "", top: int = 15):
+        summary = self.summary(top)
+        lines = [f"# Selbst-Profiling{': ' + title if title else ''}\n"]
+        lines.append(f"Wall-Time: {summary['wall_seconds']} s, {summary['samples']} Samples "
+                     f"alle {int(self.interval * 1000)} ms\n")
+        lines += ["## Zeit pro Kategorie\n", "| Kategorie | Sekunden | Anteil |", "|-----------|----------|--------|"]
+        for category, values in summary["categories"].items():
+            lines.append(f"| {category} | {values['seconds']} | {values['share'] * 100:.1f}% |")
+
+        lines += ["\n## Zeit pro Phase\n", "| Phase | Kategorie | Sekunden |", "|-------|-----------|----------|"]
+        for row in summary["phases"]:
+            lines.append(f"| {row['phase']} | {row['category']} | {row['seconds']} |")
+
+        lines += [
+            "\n## Top-Hotspots im Orchestrator (ohne LLM-Wartezeit und Subprozesse)\n",
+            "| Funktion | Eigenzeit (s) | Inklusiv (s) | Ort |",
+            "|----------|---------------|--------------|-----|",
+        ]
+        for row in summary["hotspots"]:
+            lines.append(f"| {row['function']} | {row['self_seconds']} | {row['inclusive_seconds']} | {row['location']} |")
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
@@ -0,0 +1,629 @@
+"""
+Statischer Pre-Gate fuer generierten Code und Tests
+====================================================
+Prueft Code + Tests per AST, BEVOR ein Test-Subprozess gestartet wird:
+- Syntaxfehler in Code oder Tests
+- Undefinierte Namen
+- Tests, die Methoden aufrufen, die es in der Klasse nicht gibt
+- Falsche Argument-Anzahl bei Konstruktoren, Methoden und Funktionen
+
+Diagnosen mit severity="error" bedeuten: der Testlauf schlaegt sicher fehl,
+der Subprozess kann uebersprungen werden - nur fuer Aufrufe, die sicher ausgefuehrt
+werden (Modulebene bzw. Test-Methode ausserhalb von if/try/with/Schleifen) und deren
+Ziel eindeutig ist. Alles andere ist eine Warnung. Die Diagnosen gehen direkt in den Fix-Prompt.
+"""
+
+import ast
+import time
+import builtins
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+
+# ============================================================
+# DATENSTRUKTUREN
+# ============================================================
+
+@dataclass
+class Diagnostic:
+    """Ein Befund der statischen Analyse."""
+    severity: str   # "error" (Lauf schlaegt sicher fehl) oder "warning"
+    kind: str       # syntax, undefined_name, unknown_method, constructor_arity, call_arity
+    source: str     # "code" oder "tests"
+    line: int
+    message: str
+
+    def format(self) -> str:
+        where = "Code" if self.source == "code" else "Tests"
+        return f"[{self.kind}] {where} Zeile {self.line}: {self.message}"
+
+
+@dataclass
+class Signature:
+    """Aufrufsignatur ohne self/cls."""
+    name: str
+    min_args: int
+    max_args: Optional[int]          # None = *args
+    keywords: Set[str] = field(default_factory=set)
+    accepts_any_keyword: bool = False
+
+    def check(self, n_positional: int, keywords: List[str]) -> Optional[str]:
+        """Gibt eine Fehlermeldung zurueck, wenn der Aufruf nicht passen kann."""
+        if self.max_args is not None and n_positional > self.max_args:
+            return f"{self.name}() nimmt maximal {self.max_args} Argumente, bekommt {n_positional}"
+        for kw in keywords:
+            if kw not in self.keywords and not self.accepts_any_keyword:
+                return f"{self.name}() hat keinen Parameter '{kw}'"
+        supplied = n_positional + sum(1 for kw in keywords if kw in self.keywords)
+        if supplied < self.min_args:
+            return f"{self.name}() braucht mindestens {self.min_args} Argumente, bekommt {supplied}"
+        return None
+
+
+@dataclass
+class ClassInfo:
+    """Was ueber eine Klasse im generierten Code bekannt ist."""
+    name: str
+    bases: List[str]
+    methods: Dict[str, Signature]
+    attributes: Set[str]
+    fully_known: bool = True         # False bei externen Basisklassen/Dekoratoren
+    fields: Optional[List[Tuple[str, bool, bool]]] = None   # Dataclass-Felder (Name, hat Default, kw_only), sonst None
+    dataclass_init: bool = False     # @dataclass erzeugt __init__ (nicht bei init=False)
+
+
+_BUILTIN_NAMES = set(dir(builtins)) | {"__name__", "__file__", "__doc__", "__builtins__", "__spec__"}
+
+
+# ============================================================
+# SIGNATUREN & KLASSEN SAMMELN
+# ============================================================
+
+def _signature_from_args(name: str, args: ast.arguments, skip_first: bool) -> Signature:
+    positional = list(args.posonlyargs) + list(args.args)
+    if skip_first and positional:
+        positional = positional[1:]
+    n_defaults = len(args.defaults)
+    required = len(positional) - n_defaults
+    kwonly_required = sum(1 for d in args.kw_defaults if d is None)
+    keywords = {a.arg for a in args.args if not skip_first or a is not args.args[0]}
+    keywords |= {a.arg for a in args.kwonlyargs}
+    return Signature(
+        name=name,
+        min_args=max(0, required) + kwonly_required,
+        max_args=None if args.vararg else len(positional),
+        keywords=keywords,
+        accepts_any_keyword=args.kwarg is not None
+    )
+
+
+def _decorator_names(node) -> List[str]:
+    names = []
+    for dec in node.decorator_list:
+        target = dec.func if isinstance(dec, ast.Call) else dec
+        if isinstance(target, ast.Name):
+            names.append(target.id)
+        elif isinstance(target, ast.Attribute):
+            names.append(target.attr)
+        else:
+            names.append("?")
+    return names
+
+
+def _annotation_name(annotation: ast.AST) -> str:
+    """"ClassVar" fuer ClassVar[int], typing.ClassVar, "ClassVar[int]" usw."""
+    if isinstance(annotation, ast.Subscript):
+        annotation = annotation.value
+    if isinstance(annotation, ast.Name):
+        return annotation.id
+    if isinstance(annotation, ast.Attribute):
+        return annotation.attr
+    if isinstance(annotation, ast.Constant) and isinstance(annotation.value, str):
+        return annotation.value.split("[")[0].split(".")[-1].strip()
+    return ""
+
+
+def _keyword_value(call: ast.Call, name: str):
+    """Konstanter Wert eines Keyword-Arguments (sonst None)."""
+    for kw in call.keywords:
+        if kw.arg == name and isinstance(kw.value, ast.Constant):
+            return kw.value.value
+    return None
+
+
+def _dataclass_options(node: ast.ClassDef) -> Optional[Dict[str, bool]]:
+    """Optionen von @dataclass bzw. @dataclass(...); None ohne Dekorator."""
+    for dec in node.decorator_list:
+        target = dec.func if isinstance(dec, ast.Call) else dec
+        name = target.id if isinstance(target, ast.Name) else getattr(target, "attr", "")
+        if name != "dataclass":
+            continue
+        if not isinstance(dec, ast.Call):
+            return {"init": True, "kw_only": False}
+        return {
+            "init": _keyword_value(dec, "init") is not False,
+            "kw_only": _keyword_value(dec, "kw_only") is True,
+        }
+    return None
+
+
+def _dataclass_field(item: ast.AnnAssign, kw_only: bool) -> Optional[Tuple[str, bool, bool]]:
+    """(Name, hat Default, kw_only) fuer __init__, None fuer ClassVar und field(init=False)."""
+    if _annotation_name(item.annotation) == "ClassVar":
+        return None
+    value = item.value
+    if isinstance(value, ast.Call):
+        func = value.func
+        func_name = func.id if isinstance(func, ast.Name) else getattr(func, "attr", "")
+        if func_name == "field":
+            if _keyword_value(value, "init") is False:
+                return None
+            has_default = any(kw.arg in ("default", "default_factory") for kw in value.keywords)
+            field_kw_only = _keyword_value(value, "kw_only")
+            return item.target.id, has_default, kw_only if field_kw_only is None else bool(field_kw_only)
+    return item.target.id, value is not None, kw_only
+
+
+def _collect_class(node: ast.ClassDef) -> ClassInfo:
+    methods: Dict[str, Signature] = {}
+    attributes: Set[str] = set()
+    dataclass_fields: List[Tuple[str, bool, bool]] = []
+    decorators = _decorator_names(node)
+    options = _dataclass_options(node)
+    kw_only = bool(options and options["kw_only"])
+
+    for item in node.body:
+        if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            item_decorators = _decorator_names(item)
+            if "property" in item_decorators or any(d.endswith("setter") for d in item_decorators):
+                attributes.add(item.name)
+                continue
+            is_static = "staticmethod" in item_decorators
+            if any(d not in ("staticmethod", "classmethod") for d in item_decorators):
+                # Fremder Dekorator (z.B. functools.wraps-Wrapper): Signatur unbekannt
+                methods[item.name] = Signature(item.name, 0, None, accepts_any_keyword=True)
+            else:
+                methods[item.name] = _signature_from_args(item.name, item.args, skip_first=not is_static)
+            # Instanz-Attribute: self.x = ... in beliebigen Methoden
+            for sub in ast.walk(item):
+                targets = []
+                if isinstance(sub, ast.Assign):
+                    targets = sub.targets
+                elif isinstance(sub, (ast.AugAssign, ast.AnnAssign)):
+                    targets = [sub.target]
+                for target in targets:
+                    for t in ast.walk(target):
+                        if isinstance(t, ast.Attribute) and isinstance(t.value, ast.Name) and t.value.id == "self":
+                            attributes.add(t.attr)
+        elif isinstance(item, ast.Assign):
+            for target in item.targets:
+                for t in ast.walk(target):
+                    if isinstance(t, ast.Name):
+                        attributes.add(t.id)
+        elif isinstance(item, ast.AnnAssign) and isinstance(item.target, ast.Name):
+            if _annotation_name(item.annotation) == "KW_ONLY":
+                kw_only = True          # _: KW_ONLY - alle folgenden Felder nur per Keyword
+                continue
+            attributes.add(item.target.id)
+            entry = _dataclass_field(item, kw_only)
+            if entry is not None:
+                dataclass_fields.append(entry)
+        elif isinstance(item, ast.ClassDef):
+            attributes.add(item.name)
+
+    bases = []
+    fully_known = all(d in ("dataclass",) for d in decorators)
+    for base in node.bases:
+        if isinstance(base, ast.Name):
+            bases.append(base.id)
+        else:
+            fully_known = False
+    if node.keywords:
+        fully_known = False
+
+    fields = dataclass_fields if options is not None else None
+    return ClassInfo(node.name, bases, methods, attributes, fully_known, fields,
+                     dataclass_init=bool(options and options["init"]))
+
+
+def _dataclass_init(fields: List[Tuple[str, bool, bool]]) -> Signature:
+    """Das von @dataclass erzeugte __init__ fuer die (geerbten + eigenen) Felder."""
+    return Signature(
+        name="__init__",
+        min_args=sum(1 for _, has_default, _ in fields if not has_default),
+        max_args=sum(1 for _, _, kw_only in fields if not kw_only),
+        keywords={name for name, _, _ in fields}
+    )
+
+
+def _resolve_class(name: str, classes: Dict[str, ClassInfo]) -> Optional[ClassInfo]:
+    """
+    Fuehrt Vererbung innerhalb des generierten Codes zusammen. Dataclass-Felder
+    werden wie bei @dataclass ueber die Basisklassen gesammelt (Basis zuerst,
+    ueberschriebene Felder behalten ihre Position).
+    """
+    info = classes.get(name)
+    if info is None:
+        return None
+    methods: Dict[str, Signature] = {}
+    attributes: Set[str] = set()
+    fields: Dict[str, Tuple[bool, bool]] = {}
+    fully_known = info.fully_known
+    seen = set()
+
+    def visit(cls: ClassInfo):
+        nonlocal fully_known
+        if cls.name in seen:
+            return
+        seen.add(cls.name)
+        for base in cls.bases:
+            if base == "object":
+                continue
+            base_info = classes.get(base)
+            if base_info is None:
+                fully_known = False     # z.B. tk.Frame, Exception, Enum
+            else:
+                visit(base_info)
+        fully_known = fully_known and cls.fully_known
+        methods.update(cls.methods)
+        attributes.update(cls.attributes)
+        if cls.fields is not None:
+            fields.update((name, (has_default, kw_only)) for name, has_default, kw_only in cls.fields)
+            if cls.dataclass_init and "__init__" not in cls.methods:
+                methods["__init__"] = _dataclass_init([(name, *flags) for name, flags in fields.items()])
+
+    visit(info)
+    return ClassInfo(info.name, info.bases, methods, attributes, fully_known, info.fields, info.dataclass_init)
+
+
+def _object_method_names() -> Set[str]:
+    return set(dir(object))
+
+
+# ============================================================
+# NAMENSAUFLOESUNG
+# ============================================================
+
+def _bound_names(tree: ast.AST) -> Tuple[Set[str], bool]:
+    """
+    Alle irgendwo gebundenen Namen (grob, ohne Scope-Trennung) - dadurch
+    keine Fehlalarme bei lokalen Variablen. Zweiter Wert: True bei `import *`.
+    """
+    names: Set[str] = set()
+    star_import = False
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, (ast.Store, ast.Del)):
+            names.add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.arg):
+            names.add(node.arg)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                if alias.name == "*":
+                    star_import = True
+                else:
+                    names.add((alias.asname or alias.name).split(".")[0])
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            names.add(node.name)
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            names.update(node.names)
+        elif isinstance(node, ast.MatchAs) and node.name:
+            names.add(node.name)
+        elif isinstance(node, ast.MatchStar) and node.name:
+            names.add(node.name)
+        elif isinstance(node, ast.MatchMapping) and node.rest:
+            names.add(node.rest)
+    return names, star_import
+
+
+class _ScopeTracker(ast.NodeVisitor):
+    """Merkt sich beim Besuch, ob ein Knoten auf Modulebene / in einer Test-Methode liegt."""
+
+    def __init__(self):
+        self.depth = 0
+        self.branches = 0               # if/try/with/Schleifen: Ausfuehrung nicht sicher
+        self.in_test_class = False
+        self.in_test_method = False
+
+    def visit_ClassDef(self, node):
+        previous = self.in_test_class
+        self.in_test_class = any(
+            (isinstance(b, ast.Attribute) and b.attr == "TestCase") or
+            (isinstance(b, ast.Name) and b.id == "TestCase")
+            for b in node.bases
+        )
+        self.generic_visit(node)
+        self.in_test_class = previous
+
+    def _visit_function(self, node):
+        previous = self.in_test_method
+        self.in_test_method = self.in_test_class and (node.name.startswith("test") or node.name == "setUp")
+        self.depth += 1
+        self.generic_visit(node)
+        self.depth -= 1
+        self.in_test_method = previous
+
+    visit_FunctionDef = _visit_function
+    visit_AsyncFunctionDef = _visit_function
+
+    def _visit_deferred(self, node):
+        # Lambda-Koerper laufen evtl. nie (assertRaises(TypeError, lambda: P())),
+        # Comprehension-Koerper evtl. null Mal
+        previous = self.in_test_method
+        self.in_test_method = False
+        self.depth += 1
+        self.generic_visit(node)
+        self.depth -= 1
+        self.in_test_method = previous
+
+    visit_Lambda = _visit_deferred
+    visit_ListComp = visit_SetComp = visit_DictComp = visit_GeneratorExp = _visit_deferred
+
+    def _visit_branch(self, node):
+        # Auch `with self.assertRaises(...)` und try/except: ein Fehler dort laesst den Test nicht sicher scheitern
+        self.branches += 1
+        self.generic_visit(node)
+        self.branches -= 1
+
+    visit_If = visit_IfExp = visit_BoolOp = visit_Match = _visit_branch
+    visit_For = visit_AsyncFor = visit_While = _visit_branch
+    visit_Try = visit_TryStar = visit_With = visit_AsyncWith = _visit_branch
+
+    @property
+    def executed_for_sure(self) -> bool:
+        """Modulebene laeuft beim Import, Test-Methoden laufen beim Testlauf - jeweils ohne Verzweigung."""
+        return (self.depth == 0 or self.in_test_method) and self.branches == 0
+
+
+class _UndefinedNameChecker(_ScopeTracker):
+    def __init__(self, known: Set[str], source: str):
+        super().__init__()
+        self.known = known
+        self.source = source
+        self.diagnostics: List[Diagnostic] = []
+        self.reported: Set[str] = set()
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Load) and node.id not in self.known and node.id not in self.reported:
+            self.reported.add(node.id)
+            self.diagnostics.append(Diagnostic(
+                severity="error" if self.executed_for_sure else "warning",
+                kind="undefined_name",
+                source=self.source,
+                line=node.lineno,
+                message=f"Name '{node.id}' ist nirgends definiert oder importiert"
+            ))
+
+
+# ============================================================
+# AUFRUF-PRUEFUNG IN DEN TESTS
+# ============================================================
+
+def _call_shape(call: ast.Call) -> Optional[Tuple[int, List[str]]]:
+    """(Anzahl Positionsargumente, Keyword-Namen) oder None bei *args/**kwargs."""
+    if any(isinstance(a, ast.Starred) for a in call.args):
+        return None
+    if any(kw.arg is None for kw in call.keywords):
+        return None
+    return len(call.args), [kw.arg for kw in call.keywords]
+
+
+def _instance_key(node: ast.AST) -> Optional[str]:
+    """`p` oder `self.p` als Schluessel fuer bekannte Instanzen."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == "self":
+        return f"self.{node.attr}"
+    return None
+
+
+class _CallChecker(_ScopeTracker):
+    """
+    Prueft Konstruktor-, Methoden- und Funktionsaufrufe gegen den Code.
+
+    Instanz-Bindungen (`p = Pokemon()`, `self.p = Pokemon()`) gelten nur
+    innerhalb einer Funktion; Bindungen aus setUp werden in die Test-Methoden
+    derselben Klasse uebernommen. Jede andere Zuweisung an den Namen (Tupel,
+    `with ... as`, for, :=, ...) loescht die Bindung. Bindungen innerhalb
+    einer Verzweigung sind unsicher und liefern hoechstens Warnungen.
+    """
+
+    def __init__(self, classes: Dict[str, ClassInfo], functions: Dict[str, Signature], source: str):
+        super().__init__()
+        self.classes = classes
+        self.functions = functions
+        self.source = source
+        self.instances: Dict[str, Tuple[str, bool]] = {}   # Variable -> (Klassenname, sicher gebunden)
+        self.patched: Set[Tuple[str, str]] = set()          # (Variable, Attribut), z.B. Mocks
+        self.setup_instances: Dict[str, Tuple[str, bool]] = {}
+        self.setup_patched: Set[Tuple[str, str]] = set()
+        self.diagnostics: List[Diagnostic] = []
+        self._object_methods = _object_method_names()
+
+    def _add(self, kind: str, line: int, message: str, certain: bool = True):
+        self.diagnostics.append(Diagnostic(
+            severity="error" if self.executed_for_sure and certain else "warning",
+            kind=kind, source=self.source, line=line, message=message
+        ))
+
+    def visit_ClassDef(self, node):
+        previous = (self.setup_instances, self.setup_patched)
+        self.setup_instances, self.setup_patched = {}, set()
+        # setUp zuerst, damit seine Bindungen in allen Test-Methoden bekannt sind
+        setup = [item for item in node.body if isinstance(item, ast.FunctionDef) and item.name == "setUp"]
+        node.body = setup + [item for item in node.body if item not in setup]
+        super().visit_ClassDef(node)
+        self.setup_instances, self.setup_patched = previous
+
+    def _visit_function(self, node):
+        previous = (self.instances, self.patched)
+        if self.in_test_class and node.name != "setUp":
+            self.instances, self.patched = dict(self.setup_instances), set(self.setup_patched)
+        else:
+            self.instances, self.patched = {}, set()
+        super()._visit_function(node)
+        if self.in_test_class and node.name == "setUp":
+            self.setup_instances = {k: v for k, v in self.instances.items() if k.startswith("self.")}
+            self.setup_patched = {p for p in self.patched if p[0].startswith("self.")}
+        self.instances, self.patched = previous
+
+    visit_FunctionDef = _visit_function
+    visit_AsyncFunctionDef = _visit_function
+
+    def _unbind(self, node):
+        key = _instance_key(node)
+        if key and isinstance(node.ctx, (ast.Store, ast.Del)):
+            self.instances.pop(key, None)
+
+    def visit_Name(self, node):
+        self._unbind(node)
+
+    def visit_Attribute(self, node):
+        self._unbind(node)
+        self.generic_visit(node)
+
+    def visit_Assign(self, node):
+        # Besuch der Ziele loescht alte Bindungen (visit_Name/visit_Attribute)
+        self.generic_visit(node)
+        for target in node.targets:
+            if isinstance(target, ast.Attribute):
+                key = _instance_key(target.value)
+                if key in self.instances:
+                    self.patched.add((key, target.attr))
+        value = node.value
+        if isinstance(value, ast.Call) and isinstance(value.func, ast.Name) and value.func.id in self.classes:
+            for target in node.targets:
+                key = _instance_key(target)
+                if key:
+                    self.instances[key] = (value.func.id, self.branches == 0)
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+        shape = _call_shape(node)
+        func = node.func
+
+        # Konstruktor oder Funktion: Name(...)
+        if isinstance(func, ast.Name):
+            if func.id in self.classes:
+                info = _resolve_class(func.id, self.classes)
+                if info and info.fully_known and shape:
+                    # Ohne __init__ bestimmt __new__ die Argumente
+                    init = (info.methods.get("__init__") or info.methods.get("__new__")
+                            or Signature("__init__", 0, 0))
+                    error = init.check(*shape)
+                    if error:
+                        self._add("constructor_arity", node.lineno,
+                                  f"{func.id}(...): {error.replace('__init__()', 'Konstruktor')}")
+            elif func.id in self.functions and shape:
+                error = self.functions[func.id].check(*shape)
+                if error:
+                    self._add("call_arity", node.lineno, error)
+            return
+
+        # Methode: instanz.methode(...)
+        if isinstance(func, ast.Attribute):
+            key = _instance_key(func.value)
+            class_name, certain = self.instances.get(key, (None, False)) if key else (None, False)
+            if class_name is None:
+                return
+            info = _resolve_class(class_name, self.classes)
+            if info is None or not info.fully_known or "__getattr__" in info.methods:
+                return
+            method = info.methods.get(func.attr)
+            if method is None:
+                if (func.attr in info.attributes or func.attr in self._object_methods
+                        or (key, func.attr) in self.patched):
+                    return
+                available = ", ".join(sorted(m for m in info.methods if not m.startswith("__"))) or "-"
+                self._add("unknown_method", node.lineno,
+                          f"{class_name} hat keine Methode '{func.attr}' (vorhanden: {available})", certain)
+            elif shape:
+                error = method.check(*shape)
+                if error:
+                    self._add("call_arity", node.lineno, f"{class_name}.{error}", certain)
+
+
+# ============================================================
+# OEFFENTLICHE API
+# ============================================================
+
+def _parse(source_text: str, source: str) -> Tuple[Optional[ast.Module], List[Diagnostic]]:
+    try:
+        return ast.parse(source_text), []
+    except SyntaxError as e:
+        return None, [Diagnostic(
+            severity="error", kind="syntax", source=source,
+            line=e.lineno or 0, message=f"Syntaxfehler: {e.msg}"
+        )]
+
+
+def analyze_code_and_tests(code: str, test_code: str) -> List[Diagnostic]:
+    """
+    Statische Analyse von Code + Tests (so wie run_tests sie kombiniert).
+    Laeuft in Millisekunden, startet keinen Prozess.
+    """
+    code_tree, diagnostics = _parse(code, "code")
+    test_tree, test_syntax = _parse(test_code, "tests")
+    diagnostics.extend(test_syntax)
+    if code_tree is None or test_tree is None:
+        return diagnostics
+
+    classes: Dict[str, ClassInfo] = {}
+    functions: Dict[str, Signature] = {}
+    for node in code_tree.body:
+        if isinstance(node, ast.ClassDef):
+            classes[node.name] = _collect_class(node)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and not _decorator_names(node):
+            functions[node.name] = _signature_from_args(node.name, node.args, skip_first=False)
+
+    # Namen: Code und Tests teilen sich ein Modul (plus `import unittest` aus run_tests)
+    code_names, code_star = _bound_names(code_tree)
+    test_names, test_star = _bound_names(test_tree)
+    known = code_names | test_names | _BUILTIN_NAMES | {"unittest"}
+
+    if not (code_star or test_star):
+        for tree, source in ((code_tree, "code"), (test_tree, "tests")):
+            checker = _UndefinedNameChecker(known, source)
+            checker.visit(tree)
+            diagnostics.extend(checker.diagnostics)
+
+    # Klassen/Funktionen, die die Tests selbst (um)definieren, nicht pruefen
+    for name in test_names:
+        classes.pop(name, None)
+        functions.pop(name, None)
+
+    call_checker = _CallChecker(classes, functions, "tests")
+    call_checker.visit(test_tree)
+    diagnostics.extend(call_checker.diagnostics)
+
+    diagnostics.sort(key=lambda d: (d.severity != "error", d.source, d.line))
+    return diagnostics
+
+
+def is_certain_failure(diagnostics: List[Diagnostic]) -> bool:
+    """True wenn mindestens eine Diagnose den Testlauf sicher scheitern laesst."""
+    return any(d.severity == "error" for d in diagnostics)
+
+
+def format_diagnostics(diagnostics: List[Diagnostic], limit: int = 15) -> str:
+    """Kompakte Liste fuer Konsole und Fix-Prompt."""
+    if not diagnostics:
+        return "Keine statischen Befunde."
+    lines = [f"- {d.severity.upper()} {d.format()}" for d in diagnostics[:limit]]
+    if len(diagnostics) > limit:
+        lines.append(f"- ... und {len(diagnostics) - limit} weitere")
+    return "\n".join(lines)
+
+
+def run_static_gate(code: str, test_code: str) -> Tuple[bool, List[Diagnostic], float]:
+    """
+    Fuehrt die Analyse aus und misst die Dauer.
+
+    Returns:
+        (subprozess_noetig, diagnosen, dauer_ms)
+    """
+    start = time.perf_counter()
+    diagnostics = analyze_code_and_tests(code, test_code)
+    duration_ms = (time.perf_counter() - start) * 1000
+    return not is_certain_failure(diagnostics), diagnostics, round(duration_ms, 2)
@@ -0,0 +1,178 @@
+"""
+Durchsatz, normiert auf die Hardware
+====================================
+Rohe Laufzeiten von verschiedenen Rechnern sind nicht vergleichbar. Aus den
+Experimenten werden daher abgeleitet:
+
+- Output-Tokens/s  (geschaetzte Output-Tokens / Task-Zeit)
+- Prompt-Tokens/s  (geschaetzte Input-Tokens / Task-Zeit)
+- Sekunden pro generierter Codezeile (Gesamtdauer / LOC)
+
+gruppiert nach Modell und Hardware-Fingerprint (CPU, Kerne, RAM aus
+system_info). Optional werden die Werte normiert: pro Hardware wird ein
+Geschwindigkeitsfaktor geschaetzt (Median-Polish im Log-Raum ueber die
+Matrix Modell x Hardware, robust gegen Ausreisser und fehlende Zellen)
+und auf die Referenz-Hardware (die mit den meisten Laeufen) umgerechnet.
+"""
+
+import os
+import re
+import warnings
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from experiment_table import ExperimentTable, grouped_stats
+
+
+METRICS = ("output_tokens_per_s", "prompt_tokens_per_s", "seconds_per_loc")
+
+# Hoeher ist besser (Tokens/s) bzw. niedriger ist besser (s/LOC)
+HIGHER_IS_BETTER = {"output_tokens_per_s": True, "prompt_tokens_per_s": True, "seconds_per_loc": False}
+
+UNKNOWN_HARDWARE = "unbekannt"
+
+
+def hardware_fingerprint(system_info: Optional[Dict[str, Any]]) -> str:
+    """Lesbarer Fingerprint, z.B. "Intel64 Family 6 Model 183 / 32 Kerne / 32 GB"."""
+    if not system_info:
+        return UNKNOWN_HARDWARE
+    processor = (system_info.get("processor") or system_info.get("platform") or "?").strip()
+    # "Stepping", Hersteller-Suffix und Mehrfach-Leerzeichen sind fuer die Leistung egal
+    processor = re.sub(r",?\s*(Stepping \d+|GenuineIntel|AuthenticAMD)", "", processor)
+    processor = re.sub(r"\s+", " ", processor).strip(" ,") or "?"
+    cores = system_info.get("cpu_count") or "?"
+    ram = system_info.get("ram_total_gb")
+    ram_text = f"{round(ram):.0f} GB" if isinstance(ram, (int, float)) else "? GB"
+    return f"{processor} / {cores} Kerne / {ram_text}"
+
+
+def count_generated_loc(experiment_dir: Path) -> int:
+    """
+    Generierte Codezeilen: verschiedene, nicht-leere Nicht-Kommentarzeilen
+    ueber alle .py-Dateien im Experiment-Ordner. Zusammengesetzte bzw.
+    korrigierte Fassungen (z.B. pokemon_adventure.py aus task_*.py) zaehlen
+    so nicht doppelt.
+    """
+    lines = set()
+    try:
+        entries = list(os.scandir(experiment_dir))
+    except OSError:
+        return 0
+    for entry in entries:
+        if not entry.name.endswith(".py") or not entry.is_file():
+            continue
+        try:
+            with open(entry.path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    stripped = line.strip()
+                    if stripped and not stripped.startswith("#"):
+                        lines.add(stripped)
+        except OSError:
+            continue
+    return len(lines)
+
+
+def derived_metrics(table: ExperimentTable) -> Dict[str, np.ndarray]:
+    """Pro Experiment: Tokens/s und s/LOC (NaN, wo nicht definiert)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        task_seconds = np.where(table.task_seconds > 0, table.task_seconds, np.nan)
+        loc = np.where(table.loc > 0, table.loc, np.nan)
+        return {
+            "output_tokens_per_s": table.tokens / task_seconds,
+            "prompt_tokens_per_s": table.input_tokens / task_seconds,
+            "seconds_per_loc": table.duration / loc,
+        }
+
+
+def hardware_factors(table: ExperimentTable, metric: np.ndarray, iterations: int = 10) -> Tuple[Dict[str, float], str]:
+    """
+    Geschwindigkeitsfaktor pro Hardware relativ zur Referenz (meiste Laeufe).
+
+    Median-Polish auf log(Metrik): Zeilen = Modelle, Spalten = Hardware.
+    Faktor > 1 heisst: diese Hardware ist bei gleichem Modell schneller.
+    """
+    hardware = table.columns["hardware"]
+    model = table.columns["model"]
+    valid = np.isfinite(metric) & (metric > 0)
+    if not valid.any():
+        return {name: 1.0 for name in hardware.categories}, hardware.categories[0] if hardware.categories else ""
+
+    # Zellen-Mediane Modell x Hardware
+    cells = np.full((len(model.categories), len(hardware.categories)), np.nan)
+    for (m, h), stats in grouped_stats(table.where(valid), ["model", "hardware"], np.log(metric[valid]), digits=6).items():
+        cells[model.categories.index(m), hardware.categories.index(h)] = stats["median"]
+
+    residual = cells.copy()
+    column_effect = np.zeros(residual.shape[1])
+    # Modelle ohne Werte (leere Zeilen) sind erlaubt
+    with np.errstate(all="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for _ in range(iterations):
+            row_median = np.nanmedian(residual, axis=1)
+            residual -= np.nan_to_num(row_median)[:, None]
+            col_median = np.nanmedian(residual, axis=0)
+            col_median = np.nan_to_num(col_median)
+            residual -= col_median[None, :]
+            column_effect += col_median
+
+    runs = np.bincount(hardware.codes[valid], minlength=len(hardware.categories))
+    reference = int(np.argmax(runs))
+    factors = np.exp(column_effect - column_effect[reference])
+    return {name: float(factors[i]) for i, name in enumerate(hardware.categories)}, hardware.categories[reference]
+
+
+def throughput_by_model_and_hardware(
+    experiments: Sequence[Any],
+    normalize: bool = False,
+    successful_only: bool = True
+) -> Dict[str, Any]:
+    """
+    Durchsatz-Kennzahlen pro (Modell, Hardware).
+
+    Args:
+        normalize: Werte mit dem Hardware-Faktor (aus Output-Tokens/s) auf die
+                   Referenz-Hardware umrechnen
+
+    Returns:
+        {"groups": {(Modell, Hardware): {metric: stats}}, "factors": {...},
+         "reference": Hardware, "normalized": bool}
+    """
+    table = ExperimentTable(experiments)
+    if successful_only:
+        table = table.where(table.success)
+    if not len(table):
+        return {"groups": {}, "factors": {}, "reference": "", "normalized": normalize}
+
+    metrics = derived_metrics(table)
+    factors, reference = hardware_factors(table, metrics["output_tokens_per_s"])
+    if normalize:
+        factor = np.asarray([factors[h] for h in table.columns["hardware"].labels()], dtype=np.float64)
+        metrics = {
+            name: values / factor if HIGHER_IS_BETTER[name] else values * factor
+            for name, values in metrics.items()
+        }
+
+    groups: Dict[Tuple[str, str], Dict[str, Dict[str, float]]] = {}
+    for name, values in metrics.items():
+        valid = np.isfinite(values)
+        for key, stats in grouped_stats(table.where(valid), ["model", "hardware"], values[valid]).items():
+            groups.setdefault(key, {})[name] = stats
+    return {"groups": dict(sorted(groups.items())), "factors": factors, "reference": reference, "normalized": normalize}
+
+
+def format_throughput_table(result: Dict[str, Any]) -> List[str]:
+    """Markdown-Zeilen: Median (p90) pro Modell und Hardware."""
+    lines = [
+        "| Modell | Hardware | n | Output-Tokens/s | Prompt-Tokens/s | s/LOC |",
+        "|--------|----------|---|-----------------|-----------------|-------|",
+    ]
+    for (model, hardware), stats in result["groups"].items():
+        def cell(metric: str) -> str:
+            values = stats.get(metric)
+            return f"{values['median']} ({values['p90']})" if values else "-"
+        n = max(values["count"] for values in stats.values())
+        lines.append(f"| {model} | {hardware} | {n} | {cell('output_tokens_per_s')} "
+                     f"| {cell('prompt_tokens_per_s')} | {cell('seconds_per_loc')} |")
+    return lines
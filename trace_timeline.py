@@ -0,0 +1,327 @@
+"""
+Zeitachsen aus dem Trace-Log
+============================
+Liest `<id>_trace.jsonl` Zeile fuer Zeile (Events werden nicht gesammelt,
+nur die fertigen Intervalle) und rekonstruiert:
+
+- Task-Intervalle pro Agent (task_started -> task_completed), d.h. LLM-Zeit
+  inklusive CrewAI-Overhead im Task
+- LLM-Aufrufe (span_completed "llm_call", Start = Ende - Dauer) - beim
+  sequentiellen Runner laeuft die ganze Crew in einem kickoff(), die Tasks
+  werden erst danach gestempelt
+- Sandbox-Intervalle (code_executed: Ende = Event, Start = Ende - wall_seconds)
+- Luecken: Zeit, die weder in einem Task noch in einem Test steckt
+  (Agent-Aufbau, Code-Extraktion, Datei-I/O, Warten zwischen Tasks)
+- kritischer Pfad: die Kette von Intervallen, die die Gesamtdauer bestimmt,
+  mit den Luecken dazwischen
+- Gantt-Diagramm (matplotlib, optional)
+
+    python trace_timeline.py projekte/EXPERIMENT_ID          # ein Experiment
+    python trace_timeline.py projekte --gantt                 # alle, mit Diagrammen
+"""
+
+import sys
+import bisect
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from experiment_store import loads
+from experiment_catalog import infer_runner_type
+
+
+KINDS = ("task", "llm", "test")
+
+KIND_COLORS = {"task": "#3498db", "llm": "#9b59b6", "test": "#e67e22", "gap": "#bdc3c7"}
+
+# Luecken darunter sind Messrauschen (Logging, Snapshots)
+MIN_GAP_SECONDS = 0.05
+
+
+@dataclass(slots=True)
+class Interval:
+    """Ein Abschnitt auf der Zeitachse (Sekunden seit experiment_started)."""
+    kind: str           # "task", "llm" oder "test"
+    lane: str           # Agent, "LLM" bzw. "Sandbox"
+    label: str
+    start: float
+    end: float
+    success: bool = True
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class Timeline:
+    """Rekonstruierte Zeitachse eines Experiments."""
+    experiment_id: str
+    intervals: List[Interval] = field(default_factory=list)
+    wall_seconds: float = 0.0
+    roles: List[str] = field(default_factory=list)
+    events: int = 0
+
+    @property
+    def runner_type(self) -> str:
+        return infer_runner_type({"agent_metrics": [{"agent_role": role} for role in self.roles]})
+
+
+# ============================================================
+# LESEN
+# ============================================================
+
+def iter_trace(path: Path) -> Iterator[Dict[str, Any]]:
+    """Events einer Trace-Datei, Zeile fuer Zeile. Kaputte Zeilen (Abbruch) werden uebersprungen."""
+    with open(path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield loads(line)
+            except ValueError:
+                continue
+
+
+def build_timeline(path: Path) -> Timeline:
+    """Rekonstruiert die Zeitachse; bei mehreren Laeufen in einer Datei zaehlt der letzte."""
+    path = Path(path)
+    timeline = Timeline(experiment_id=path.name.replace("_trace.jsonl", ""))
+    open_tasks: Dict[str, Interval] = {}
+
+    for entry in iter_trace(path):
+        timeline.events += 1
+        event = entry.get("event")
+        data = entry.get("data") or {}
+        elapsed = float(entry.get("elapsed_seconds") or 0.0)
+
+        if event == "experiment_started":
+            # Neuer Lauf in derselben Datei: von vorn
+            timeline.intervals.clear()
+            timeline.roles.clear()
+            open_tasks.clear()
+            timeline.wall_seconds = 0.0
+        elif event == "task_started":
+            agent = data.get("agent", "?")
+            label = data.get("task", "")
+            if data.get("iteration") is not None:
+                label = f"{label} (#{data['iteration']})"
+            open_tasks[agent] = Interval("task", agent, label, elapsed, elapsed)
+            if agent not in timeline.roles:
+                timeline.roles.append(agent)
+        elif event == "task_completed":
+            interval = open_tasks.pop(data.get("agent", "?"), None)
+            if interval is not None:
+                interval.end = elapsed
+                interval.success = bool(data.get("success", True))
+                timeline.intervals.append(interval)
+        elif event == "code_executed":
+            wall = float(data.get("wall_seconds") or 0.0)
+            label = data.get("label", "run")
+            if data.get("iteration") is not None:
+                label = f"{label} (#{data['iteration']})"
+            timeline.intervals.append(Interval(
+                "test", "Sandbox", label, max(0.0, elapsed - wall), elapsed,
+                success=data.get("returncode") == 0 and not data.get("timed_out")
+            ))
+        elif event == "span_completed" and data.get("name") == "llm_call":
+            attributes = data.get("attributes") or {}
+            duration = float(data.get("duration_seconds") or 0.0)
+            timeline.intervals.append(Interval(
+                "llm", "LLM", attributes.get("agent") or "kickoff", max(0.0, elapsed - duration), elapsed
+            ))
+        elif event == "experiment_ended":
+            timeline.wall_seconds = float(data.get("total_duration") or elapsed)
+
+        timeline.wall_seconds = max(timeline.wall_seconds, elapsed)
+
+    # Abgebrochene Tasks bis zum letzten Event
+    for interval in open_tasks.values():
+        interval.end = timeline.wall_seconds
+        interval.success = False
+        timeline.intervals.append(interval)
+
+    timeline.intervals.sort(key=lambda i: (i.start, i.end))
+    return timeline
+
+
+# ============================================================
+# AUSWERTUNG
+# ============================================================
+
+def _covered_seconds(intervals: List[Interval]) -> float:
+    """Laenge der Vereinigung der Intervalle."""
+    total, current_start, current_end = 0.0, None, None
+    for interval in sorted(intervals, key=lambda i: i.start):
+        if current_end is None or interval.start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = interval.start, interval.end
+        else:
+            current_end = max(current_end, interval.end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def idle_gaps(timeline: Timeline, min_gap: float = MIN_GAP_SECONDS) -> List[Dict[str, Any]]:
+    """Zeitraeume ohne Task und ohne Test, mit den Nachbar-Intervallen."""
+    gaps = []
+    cursor, previous = 0.0, "Start"
+    for interval in sorted(timeline.intervals, key=lambda i: i.start):
+        if interval.start - cursor >= min_gap:
+            gaps.append({"start": cursor, "end": interval.start, "seconds": interval.start - cursor,
+                         "after": previous, "before": f"{interval.lane}: {interval.label}"})
+        if interval.end >= cursor:
+            cursor, previous = interval.end, f"{interval.lane}: {interval.label}"
+    if timeline.wall_seconds - cursor >= min_gap:
+        gaps.append({"start": cursor, "end": timeline.wall_seconds, "seconds": timeline.wall_seconds - cursor,
+                     "after": previous, "before": "Ende"})
+    return gaps
+
+
+def critical_path(timeline: Timeline) -> List[Interval]:
+    """
+    Rueckwaerts vom zuletzt endenden Intervall: jeweils der Vorgaenger, der
+    als letzter vor dem Start endet. O(n log n).
+    """
+    if not timeline.intervals:
+        return []
+    by_end = sorted(timeline.intervals, key=lambda i: i.end)
+    ends = [i.end for i in by_end]
+    path = [by_end[-1]]
+    while True:
+        # Vorgaenger: Ende <= Start des aktuellen (kleine Toleranz fuer gerundete Zeiten)
+        index = bisect.bisect_right(ends, path[-1].start + 1e-6) - 1
+        if index < 0 or by_end[index] is path[-1]:
+            break
+        path.append(by_end[index])
+    path.reverse()
+    return path
+
+
+def summarize(timeline: Timeline) -> Dict[str, Any]:
+    """Wohin die Wall-Time geht: Tasks, Tests, Luecken, kritischer Pfad."""
+    wall = timeline.wall_seconds or 1e-9
+    task_seconds = _covered_seconds([i for i in timeline.intervals if i.kind in ("task", "llm")])
+    test_seconds = _covered_seconds([i for i in timeline.intervals if i.kind == "test"])
+    busy_seconds = _covered_seconds(timeline.intervals)
+    gaps = idle_gaps(timeline)
+    path = critical_path(timeline)
+    return {
+        "experiment_id": timeline.experiment_id,
+        "runner_type": timeline.runner_type,
+        "events": timeline.events,
+        "wall_seconds": round(timeline.wall_seconds, 2),
+        "task_seconds": round(task_seconds, 2),
+        "test_seconds": round(test_seconds, 2),
+        "idle_seconds": round(max(0.0, timeline.wall_seconds - busy_seconds), 2),
+        "idle_share": round(max(0.0, timeline.wall_seconds - busy_seconds) / wall, 4),
+        "gaps": [{key: round(v, 2) if isinstance(v, float) else v for key, v in gap.items()} for gap in gaps],
+        "critical_path": [
+            {"kind": i.kind, "lane": i.lane, "label": i.label, "start": round(i.start, 2), "seconds": round(i.duration, 2)}
+            for i in path
+        ],
+    }
+
+
+def render_gantt(timeline: Timeline, output_file: str) -> bool:
+    """Gantt-Diagramm (Lanes = Agents + Sandbox, Luecken grau). False ohne matplotlib."""
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("⚠️ matplotlib nicht installiert. Installieren mit: pip install matplotlib")
+        return False
+
+    lanes = list(timeline.roles)
+    for kind, lane in (("llm", "LLM"), ("test", "Sandbox")):
+        if any(i.kind == kind for i in timeline.intervals):
+            lanes.append(lane)
+    on_path = {id(i) for i in critical_path(timeline)}
+    fig, ax = plt.subplots(figsize=(12, 1.2 + 0.5 * len(lanes)))
+    for interval in timeline.intervals:
+        y = lanes.index(interval.lane)
+        ax.barh(y, interval.duration, left=interval.start, height=0.6,
+                color=KIND_COLORS[interval.kind], edgecolor="black" if id(interval) in on_path else "none",
+                alpha=1.0 if interval.success else 0.5)
+    for gap in idle_gaps(timeline):
+        ax.axvspan(gap["start"], gap["end"], color=KIND_COLORS["gap"], alpha=0.3, lw=0)
+    ax.set_yticks(range(len(lanes)))
+    ax.set_yticklabels(lanes)
+    ax.invert_yaxis()
+    ax.set_xlabel("Sekunden seit Start")
+    ax.set_title(f"{timeline.experiment_id} (grau: weder Task noch Test, schwarz umrandet: kritischer Pfad)")
+    fig.tight_layout()
+    fig.savefig(output_file, dpi=150)
+    plt.close(fig)
+    return True
+
+
+def find_traces(path: Path) -> List[Path]:
+    """Trace-Dateien einer Datei, eines Experiment-Ordners oder eines Basis-Ordners."""
+    path = Path(path)
+    if path.is_file():
+        return [path]
+    direct = sorted(path.glob("*_trace.jsonl"))
+    return direct or sorted(path.glob("*/*_trace.jsonl"))
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    wall = summary["wall_seconds"] or 1e-9
+    lines = [
+        f"## {summary['experiment_id']} ({summary['runner_type']})\n",
+        "| Anteil | Sekunden | % |",
+        "|--------|----------|---|",
+        f"| Wall-Time | {summary['wall_seconds']} | 100 |",
+        f"| Tasks (LLM) | {summary['task_seconds']} | {summary['task_seconds'] / wall * 100:.1f} |",
+        f"| Tests (Sandbox) | {summary['test_seconds']} | {summary['test_seconds'] / wall * 100:.1f} |",
+        f"| weder noch | {summary['idle_seconds']} | {summary['idle_share'] * 100:.1f} |",
+        "",
+        "Kritischer Pfad: " + " -> ".join(f"{step['lane']}:{step['label']} ({step['seconds']}s)"
+                                           for step in summary["critical_path"]),
+    ]
+    largest = sorted(summary["gaps"], key=lambda g: -g["seconds"])[:5]
+    if largest:
+        lines += ["", "| Luecke (s) | nach | vor |", "|------------|------|-----|"]
+        lines += [f"| {gap['seconds']} | {gap['after']} | {gap['before']} |" for gap in largest]
+    return "\n".join(lines) + "\n"
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    gantt = "--gantt" in sys.argv
+    target = Path(args[0] if args else "projekte")
+
+    traces = find_traces(target)
+    if not traces:
+        print(f"Keine Trace-Dateien unter {target} gefunden.")
+        sys.exit(1)
+
+    by_runner: Dict[str, List[Dict[str, Any]]] = {}
+    for trace_path in traces:
+        timeline = build_timeline(trace_path)
+        summary = summarize(timeline)
+        by_runner.setdefault(summary["runner_type"], []).append(summary)
+        print(format_summary(summary))
+        if gantt:
+            chart = trace_path.with_name(f"{timeline.experiment_id}_gantt.png")
+            if render_gantt(timeline, str(chart)):
+                print(f"📈 Gantt-Diagramm: {chart}\n")
+
+    if len(traces) > 1:
+        print("## Wall-Time pro Runner-Typ\n")
+        print("| Runner | Experimente | Tasks % | Tests % | weder noch % |")
+        print("|--------|-------------|---------|---------|--------------|")
+        for runner, summaries in sorted(by_runner.items()):
+            wall = sum(s["wall_seconds"] for s in summaries) or 1e-9
+            print(f"| {runner} | {len(summaries)} "
+                  f"| {sum(s['task_seconds'] for s in summaries) / wall * 100:.1f} "
+                  f"| {sum(s['test_seconds'] for s in summaries) / wall * 100:.1f} "
+                  f"| {sum(s['idle_seconds'] for s in summaries) / wall * 100:.1f} |")
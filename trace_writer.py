@@ -0,0 +1,190 @@
+"""
+Gepufferter Trace-Writer
+========================
+Schreibt Trace-Events (`*_trace.jsonl`) aus einem Hintergrund-Thread:
+
+- `write()` legt das Event nur in eine Queue (kein open/close pro Event)
+- Der Writer-Thread sammelt Events, bis `flush_interval` seit dem ersten
+  Event des Batches vergangen ist oder `batch_size` erreicht ist, und
+  schreibt sie dann am Stueck (ein write + flush pro Batch). `flush()` und
+  `close()` schreiben sofort.
+- Serialisierung mit orjson (Fallback: json)
+- Flush-Intervall und fsync-Policy sind konfigurierbar
+- `close()` leert die Queue vollstaendig, es gehen keine Events verloren
+
+fsync-Policies:
+    "never"  - nur write(), das OS entscheidet ueber das Zurueckschreiben
+    "batch"  - fsync nach jedem Batch (sicher bei Stromausfall, langsamer)
+    "close"  - fsync einmal beim Schliessen (default)
+"""
+
+import os
+import json
+import time
+import queue
+import atexit
+import threading
+import weakref
+from typing import Any, Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+FSYNC_POLICIES = ("never", "batch", "close")
+
+# Alle offenen Writer, damit sie beim Interpreter-Ende geleert werden
+_open_writers: "weakref.WeakSet[TraceWriter]" = weakref.WeakSet()
+
+
+def dumps_line(entry: Dict[str, Any]) -> bytes:
+    """Serialisiert ein Event als JSON-Zeile (UTF-8, mit Newline)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # z.B. unbekannte Typen - json mit default=str kann mehr
+    return (json.dumps(entry, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+
+class _FlushMarker:
+    """Wird in die Queue gelegt; der Writer meldet, wenn alles davor geschrieben ist."""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class TraceWriter:
+    """Queue-gespeister JSONL-Writer mit Hintergrund-Thread."""
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = 0.5,
+        fsync: str = "close",
+        batch_size: int = 512
+    ):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unbekannte fsync-Policy '{fsync}', erlaubt: {', '.join(FSYNC_POLICIES)}")
+        self.path = str(path)
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.batch_size = batch_size
+
+        self.events_written = 0
+        self.batches_written = 0
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self._file = open(self.path, "ab")
+        self._thread = threading.Thread(target=self._run, name="TraceWriter", daemon=True)
+        self._thread.start()
+        _open_writers.add(self)
+
+    # --------------------------------------------------------
+    # API
+    # --------------------------------------------------------
+
+    def write(self, entry: Dict[str, Any]):
+        """Event einreihen (nicht blockierend)."""
+        if self._closed:
+            raise RuntimeError("TraceWriter ist bereits geschlossen")
+        self._queue.put(entry)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Blockiert, bis alle bisher eingereihten Events geschrieben sind."""
+        if self._closed:
+            return True
+        marker = _FlushMarker()
+        self._queue.put(marker)
+        return marker.done.wait(timeout)
+
+    def close(self):
+        """Queue leeren, Datei schliessen, Thread beenden. Mehrfach aufrufbar."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        _open_writers.discard(self)
+        if self._error is not None:
+            raise RuntimeError(f"Trace konnte nicht vollstaendig geschrieben werden: {self._error}")
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    # --------------------------------------------------------
+    # Writer-Thread
+    # --------------------------------------------------------
+
+    def _run(self):
+        stop = False
+        while not stop:
+            batch: List[bytes] = []
+            markers: List[_FlushMarker] = []
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            # Sammeln bis flush_interval nach dem ersten Event, batch_size,
+            # flush() oder close()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, _FlushMarker):
+                    markers.append(item)
+                else:
+                    batch.append(dumps_line(item))
+                if stop or markers or len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            self._write_batch(batch)
+            for marker in markers:
+                marker.done.set()
+
+        self._finish()
+
+    def _write_batch(self, batch: List[bytes]):
+        if not batch or self._error is not None:
+            return
+        try:
+            self._file.write(b"".join(batch))
+            self._file.flush()
+            if self.fsync == "batch":
+                os.fsync(self._file.fileno())
+            self.events_written += len(batch)
+            self.batches_written += 1
+        except OSError as e:
+            self._error = e
+
+    def _finish(self):
+        try:
+            self._file.flush()
+            if self.fsync in ("batch", "close"):
+                os.fsync(self._file.fileno())
+        except OSError as e:
+            self._error = self._error or e
+        finally:
+            self._file.close()
+
+
+@atexit.register
+def _close_open_writers():
+    for writer in list(_open_writers):
+        try:
+            writer.close()
+        except Exception:
+            pass